@@ -0,0 +1,390 @@
+import os
+import json
+import threading
+from typing import Optional, Dict, List, Iterable, Tuple
+
+from jobs import Job, JobManager
+
+# Remote debugging ports reserved per account: the standalone driver plus room for a driver pool
+PORT_STRIDE = 16
+DEFAULT_BASE_PORT = 9222
+
+
+def check_pool_size(driver_pool_size: int, label: str):
+    """
+    Reject a driver pool too large for its port block
+
+    Raises:
+        ValueError: If the pool would spill into the next block's ports
+    """
+    if driver_pool_size >= PORT_STRIDE:
+        raise ValueError(f"Driver pool size {driver_pool_size} for {label} must be below {PORT_STRIDE}; "
+                         f"larger pools would use another account's debugging ports")
+
+
+class Account:
+    """A LinkedIn login and the company pages it may post for"""
+
+    def __init__(self, key: str, username: str, password: str, company_ids: Optional[List[str]] = None,
+                 posts_per_hour: Optional[float] = 30, burst: float = 5, debugging_port: Optional[int] = None,
+                 driver_pool_size: int = 0, backend: Optional[str] = None, access_token: Optional[str] = None):
+        self.key = key
+        self.username = username
+        self.password = password
+        self.company_ids = [str(company_id) for company_id in (company_ids or [])]
+        self.posts_per_hour = posts_per_hour
+        self.debugging_port = debugging_port
+        self.driver_pool_size = driver_pool_size
+        self.backend = backend
+        self.access_token = access_token
+        self.burst = burst
+
+    def to_dict(self) -> Dict:
+        """Public description; never includes the password or access token"""
+        return {
+            "key": self.key,
+            "username": self.username,
+            "company_ids": list(self.company_ids),
+            "posts_per_hour": self.posts_per_hour,
+            "debugging_port": self.debugging_port,
+            "driver_pool_size": self.driver_pool_size,
+            "backend": self.backend or "auto",
+            "api_access": bool(self.access_token)
+        }
+
+
+class AccountRegistry:
+    def __init__(self, base_port: int = DEFAULT_BASE_PORT):
+        """
+        Known LinkedIn accounts, looked up by key or by the company pages they manage
+
+        Each account owns PORT_STRIDE debugging ports starting at its
+        debugging_port. Blocks are handed out from base_port upwards, skipping
+        any block reserved for automations created outside the registry.
+
+        Args:
+            base_port: Debugging port of the first account block; later blocks step by PORT_STRIDE
+        """
+        self.base_port = base_port
+        self._accounts: Dict[str, Account] = {}
+        self._by_company: Dict[str, str] = {}
+        # (first port, port count, username or None) of blocks claimed through reserve()
+        self._reserved: List[Tuple[int, int, Optional[str]]] = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, reserved: Iterable[Tuple] = ()) -> 'AccountRegistry':
+        """
+        Load ACCOUNTS_FILE if set, otherwise a single "default" account from LINKEDIN_USERNAME/PASSWORD
+
+        ACCOUNTS_FILE is a JSON list of objects with key, username, password
+        (or password_env naming the variable holding it), and optional
+        company_ids, posts_per_hour, burst, debugging_port, driver_pool_size,
+        backend ("auto", "rest" or "selenium") and access_token (or access_token_env).
+
+        Args:
+            reserved: reserve() arguments, as tuples, for ports claimed before any account is registered
+        """
+        registry = cls()
+        for args in reserved:
+            registry.reserve(*args)
+        path = os.getenv('ACCOUNTS_FILE')
+        if path:
+            registry.load(path)
+        elif os.getenv('LINKEDIN_USERNAME'):
+            company_id = os.getenv('COMPANY_ID')
+            registry.register(Account(
+                key='default',
+                username=os.getenv('LINKEDIN_USERNAME'),
+                password=os.getenv('LINKEDIN_PASSWORD'),
+                company_ids=[company_id] if company_id else [],
+                access_token=os.getenv('LINKEDIN_ACCESS_TOKEN')
+            ))
+        return registry
+
+    def load(self, path: str):
+        """Register every account in a JSON accounts file"""
+        with open(path, encoding='utf-8') as f:
+            entries = json.load(f)
+        for entry in entries:
+            password = entry.get('password')
+            if password is None and entry.get('password_env'):
+                password = os.getenv(entry['password_env'])
+            if not password:
+                raise ValueError(f"No password configured for account {entry.get('key')}")
+            access_token = entry.get('access_token')
+            if access_token is None and entry.get('access_token_env'):
+                access_token = os.getenv(entry['access_token_env'])
+            self.register(Account(
+                key=entry['key'],
+                username=entry['username'],
+                password=password,
+                company_ids=entry.get('company_ids'),
+                posts_per_hour=entry.get('posts_per_hour', 30),
+                burst=entry.get('burst', 5),
+                debugging_port=entry.get('debugging_port'),
+                driver_pool_size=entry.get('driver_pool_size', 0),
+                backend=entry.get('backend'),
+                access_token=access_token
+            ))
+
+    def reserve(self, port: int, username: Optional[str] = None, size: int = PORT_STRIDE):
+        """
+        Keep accounts off ports used by an automation the registry didn't create
+
+        Args:
+            port: First reserved debugging port
+            username: LinkedIn login of that automation; accounts with the same
+                login are served by it, so they take this block instead of their own
+            size: Number of ports reserved
+
+        Raises:
+            ValueError: If the block overlaps a registered account's ports
+        """
+        with self._lock:
+            for owner, _, start, count in self._blocks():
+                if port < start + count and start < port + size:
+                    raise ValueError(f"Debugging ports {port}-{port + size - 1} overlap those of {owner}")
+            self._reserved.append((port, size, username))
+
+    def register(self, account: Account) -> Account:
+        """
+        Add an account, assigning it a block of debugging ports if it has none
+
+        Raises:
+            ValueError: For a duplicate key or company, a driver pool larger than
+                the port block, or an explicit debugging_port inside another block
+        """
+        check_pool_size(account.driver_pool_size, f"account {account.key}")
+        with self._lock:
+            if account.key in self._accounts:
+                raise ValueError(f"Account {account.key} is already registered")
+            for company_id in account.company_ids:
+                owner = self._by_company.get(company_id)
+                if owner:
+                    raise ValueError(f"Company {company_id} is already managed by account {owner}")
+            # The router serves a reserved login with the automation that reserved it, so it shares that block
+            shared = [start for start, _, username in self._reserved if username and username == account.username]
+            if shared:
+                if account.debugging_port not in (None, shared[0]):
+                    raise ValueError(f"Account {account.key} is served by the automation on debugging port "
+                                     f"{shared[0]}, not {account.debugging_port}")
+                account.debugging_port = shared[0]
+            blocks = [(owner, start, count) for owner, username, start, count in self._blocks()
+                      if not (shared and username == account.username)]
+            if account.debugging_port is None:
+                account.debugging_port = self._free_block(blocks)
+            for owner, start, count in blocks:
+                if account.debugging_port < start + count and start < account.debugging_port + PORT_STRIDE:
+                    raise ValueError(f"Debugging port {account.debugging_port} of account {account.key} "
+                                     f"overlaps the ports of {owner}")
+            self._accounts[account.key] = account
+            for company_id in account.company_ids:
+                self._by_company[company_id] = account.key
+        return account
+
+    def _blocks(self) -> List[Tuple[str, Optional[str], int, int]]:
+        """(owner, username, first port, port count) of every claimed block; call with the lock held"""
+        blocks = [(f"the automation reserved for {username or 'another process'}", username, start, count)
+                  for start, count, username in self._reserved]
+        blocks += [(f"account {account.key}", account.username, account.debugging_port, PORT_STRIDE)
+                   for account in self._accounts.values()]
+        return blocks
+
+    def _free_block(self, blocks: List[Tuple[str, int, int]]) -> int:
+        """First stride-aligned port from base_port whose block overlaps none of blocks"""
+        port = self.base_port
+        while any(port < start + count and start < port + PORT_STRIDE for _, start, count in blocks):
+            port += PORT_STRIDE
+        return port
+
+    def get(self, key: str) -> Optional[Account]:
+        with self._lock:
+            return self._accounts.get(key)
+
+    def for_company(self, company_id: str) -> Optional[Account]:
+        """Account that manages a company page"""
+        with self._lock:
+            key = self._by_company.get(str(company_id))
+            return self._accounts.get(key) if key else None
+
+    def list(self) -> List[Account]:
+        with self._lock:
+            return list(self._accounts.values())
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._accounts)
+
+
+class AccountRouter:
+    def __init__(self, registry: AccountRegistry, jobs: JobManager, template):
+        """
+        Routes posts to per-account workers
+
+        Each account gets its own LinkedInAutomation (driver, saved session
+        and optional driver pool) and its own adaptive limits in the template's
+        RateController, configured from posts_per_hour and burst. Work is queued on
+        the JobManager keyed by account, so one account's posts run strictly
+        in order while different accounts post in parallel.
+
+        Args:
+            registry: Accounts to route between
+            jobs: JobManager running the posting work
+            template: LinkedInAutomation whose Groq client, caches, media pipeline and
+                session store are shared by every account; it serves its own username directly
+        """
+        self.registry = registry
+        self.jobs = jobs
+        self.template = template
+        self._automations: Dict[str, object] = {}
+        self._lock = threading.Lock()
+        for account in registry.list():
+            template.rate_controller.configure(account.username, "post", account.posts_per_hour, account.burst)
+
+    def resolve(self, account: Optional[str] = None, company_id: Optional[str] = None) -> Account:
+        """
+        Pick the account for a post: explicit key, else the company's owner, else the only/first account
+
+        Raises:
+            KeyError: If no account matches
+            ValueError: If the account doesn't manage the company
+        """
+        if account:
+            resolved = self.registry.get(account)
+            if resolved is None:
+                raise KeyError(f"Unknown account: {account}")
+        elif company_id:
+            resolved = self.registry.for_company(company_id)
+            if resolved is None:
+                raise KeyError(f"No account manages company {company_id}")
+        else:
+            accounts = self.registry.list()
+            if not accounts:
+                raise KeyError("No LinkedIn accounts are configured")
+            resolved = accounts[0]
+
+        if company_id and resolved.company_ids and str(company_id) not in resolved.company_ids:
+            raise ValueError(f"Account {resolved.key} does not manage company {company_id}")
+        return resolved
+
+    def automation(self, key: str, enable_pool: bool = True):
+        """
+        The account's LinkedInAutomation, created on first use
+
+        Args:
+            key: Account key
+            enable_pool: Start the account's driver pool if it has one configured; pass False
+                for API-only work such as analytics, which never needs a browser
+        """
+        with self._lock:
+            automation = self._automations.get(key)
+            if automation is not None:
+                return automation
+
+            account = self.registry.get(key)
+            if account is None:
+                raise KeyError(f"Unknown account: {key}")
+            if account.username == self.template.username:
+                automation = self.template
+            else:
+                from linkedin_manager import LinkedInAutomation
+                from linkedin_api import LinkedInAPIClient
+                automation = LinkedInAutomation(
+                    linkedin_username=account.username,
+                    linkedin_password=account.password,
+                    debugging_port=account.debugging_port,
+                    session_store=self.template.session_store,
+                    step_budgets=self.template.step_budgets,
+                    llm_client=self.template.llm_client,
+                    generation_cache=self.template.generation_cache,
+                    media_fetcher=self.template.media_fetcher,
+                    media_processor=self.template.media_processor,
+                    activity_log=self.template.activity_log,
+                    browser_profile=self.template.browser_profile,
+                    publish_ledger=self.template.publish_ledger,
+                    rate_controller=self.template.rate_controller,
+                    groq_breaker=self.template.generator.breaker,
+                    selector_registry=self.template.selectors,
+                    # Each account posts through its own token, never the template's
+                    api_client=LinkedInAPIClient.from_env(account.access_token) if account.access_token else False,
+                    posting_backend=account.backend
+                )
+                if account.company_ids:
+                    automation.set_company_id(account.company_ids[0])
+            self._automations[key] = automation
+
+        if enable_pool and account.driver_pool_size > 0 and automation.driver_pool is None:
+            automation.enable_driver_pool(size=account.driver_pool_size, base_port=account.debugging_port + 1,
+                                          wait=False)
+        return automation
+
+    def submit_post(self, text: str, media_urls: Optional[List[str]] = None, account: Optional[str] = None,
+                    company_id: Optional[str] = None) -> Job:
+        """
+        Queue a post on its account's worker
+
+        Args:
+            text: Post content
+            media_urls: Optional media URLs
+            account: Account key; inferred from company_id when omitted
+            company_id: Company page to post as; defaults to the account's first page
+
+        Returns:
+            The queued Job
+        """
+        resolved = self.resolve(account, company_id)
+        return self.jobs.submit(
+            'create_post',
+            resolved.key,
+            self._post,
+            resolved.key,
+            text,
+            media_urls or None,
+            company_id
+        )
+
+    def stats(self) -> List[Dict]:
+        """Per-account configuration, queue depth and current rate limit budgets"""
+        queued = self.jobs.stats()["queued_by_account"]
+        controller = self.template.rate_controller
+        with self._lock:
+            started = set(self._automations)
+        stats = []
+        for account in self.registry.list():
+            budgets = controller.budgets(account.username).get(account.username, {})
+            stats.append({
+                **account.to_dict(),
+                "queued": queued.get(account.key, 0),
+                "started": account.key in started,
+                "tokens_available": budgets.get("post", {}).get("tokens"),
+                "rate_limits": budgets
+            })
+        return stats
+
+    def close(self):
+        """
+        Close every automation the router created; the template is left to its owner
+
+        Per-account automations share the template's activity log, Groq client,
+        media fetcher and processor, so only their own browsers and API client
+        are closed here; the shared ones close once, with the template.
+        """
+        with self._lock:
+            automations = [automation for automation in self._automations.values() if automation is not self.template]
+            self._automations.clear()
+        for automation in automations:
+            try:
+                automation.close_sessions()
+                if automation.api:
+                    automation.api.close()
+            except Exception as e:
+                print(f"Error closing account {automation.username}: {str(e)}")
+
+    def _post(self, key: str, text: str, media_urls: Optional[List[str]], company_id: Optional[str],
+              progress=None) -> Dict:
+        automation = self.automation(key)
+        # create_post waits for the slot itself; just tell the caller why it's waiting
+        if progress and automation.rate_controller.wait_time(automation.username, "post") > 0:
+            progress("rate_limited", account=key)
+        return automation.create_post(text, media_urls, progress=progress, company_id=company_id)
@@ -0,0 +1,215 @@
+import os
+import json
+import time
+import queue
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Optional, Dict, List, Iterator
+
+DEFAULT_DB_PATH = os.path.join(os.getcwd(), 'activity.db')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS activity (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    time REAL NOT NULL,
+    kind TEXT NOT NULL,
+    account TEXT,
+    status TEXT NOT NULL,
+    title TEXT NOT NULL,
+    description TEXT,
+    data TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_activity_account ON activity (account, id);
+CREATE INDEX IF NOT EXISTS idx_activity_kind ON activity (kind, id);
+"""
+
+
+class ActivityLog:
+    def __init__(self, db_path: Optional[str] = DEFAULT_DB_PATH, batch_size: int = 100, flush_interval: float = 0.5):
+        """
+        Append-only SQLite log of posting, generation, login and scheduling events
+
+        record() only enqueues; a writer thread inserts events in batches of
+        up to batch_size in one transaction, so callers never wait on disk.
+        Reads page backwards by id (newest first) using the primary key or the
+        (account, id) / (kind, id) indexes, so fetching the latest page costs
+        the same no matter how long the history is.
+
+        Args:
+            db_path: SQLite database file, or None to disable logging
+            batch_size: Maximum events written per transaction
+            flush_interval: Seconds the writer waits to fill a batch
+        """
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._local = threading.local()
+        self._queue: 'queue.Queue[Optional[tuple]]' = queue.Queue()
+        self._writer = None
+        self.stats = {"recorded": 0, "written": 0, "write_errors": 0}
+
+        if db_path:
+            self._conn().executescript(SCHEMA)
+            self._writer = threading.Thread(target=self._write_loop, name='activity-log', daemon=True)
+            self._writer.start()
+
+    @classmethod
+    def from_env(cls) -> 'ActivityLog':
+        """Build a log at ACTIVITY_LOG_PATH; an empty value disables it"""
+        return cls(os.getenv('ACTIVITY_LOG_PATH', DEFAULT_DB_PATH) or None)
+
+    def record(self, kind: str, title: str, description: str = '', account: Optional[str] = None,
+               status: str = 'ok', **data):
+        """
+        Queue an event for writing
+
+        Args:
+            kind: Event type, e.g. post, login, generation, schedule
+            title: Short headline shown in the activity feed
+            description: One-line detail
+            account: LinkedIn account the event belongs to
+            status: ok, failed or another outcome
+            **data: Extra JSON-serializable fields kept with the event
+        """
+        if not self._writer:
+            return
+        self._queue.put((time.time(), kind, account, status, title, description,
+                         json.dumps(data, default=str) if data else None))
+        self.stats["recorded"] += 1
+
+    def recent(self, limit: int = 20, account: Optional[str] = None, kind: Optional[str] = None,
+               before: Optional[int] = None) -> List[Dict]:
+        """
+        A page of events, newest first
+
+        Args:
+            limit: Maximum events
+            account: Only this account's events
+            kind: Only events of this kind
+            before: Only events with an id below this cursor (the last id of the previous page)
+
+        Returns:
+            List of events
+        """
+        return list(self.iter_events(account=account, kind=kind, before=before, limit=limit))
+
+    def iter_events(self, account: Optional[str] = None, kind: Optional[str] = None, before: Optional[int] = None,
+                    limit: Optional[int] = None, batch_size: int = 200) -> Iterator[Dict]:
+        """Events newest first, fetched from SQLite batch_size rows at a time"""
+        if not self.db_path:
+            return
+        clauses, params = [], []
+        if account:
+            clauses.append("account = ?")
+            params.append(account)
+        if kind:
+            clauses.append("kind = ?")
+            params.append(kind)
+        if before:
+            clauses.append("id < ?")
+            params.append(before)
+        query = "SELECT * FROM activity"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY id DESC"
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
+
+        cursor = self._conn().execute(query, params)
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            for row in rows:
+                yield self._to_dict(row)
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """
+        Wait until every queued event is written
+
+        Returns:
+            False if the timeout passed first
+        """
+        if not self._writer:
+            return True
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self):
+        """Write queued events and stop the writer"""
+        if self._writer:
+            self._queue.put(None)
+            self._writer.join(timeout=10)
+            self._writer = None
+
+    def _write_loop(self):
+        while True:
+            item = self._queue.get()
+            batch, waiters, stopping = [], [], False
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                if item is None:
+                    stopping = True
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    batch.append(item)
+                if stopping or waiters or len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+
+            if batch:
+                self._write(batch)
+            for waiter in waiters:
+                waiter.set()
+            if stopping:
+                # Anything queued after close() began still gets written
+                remaining = []
+                while not self._queue.empty():
+                    item = self._queue.get_nowait()
+                    if isinstance(item, tuple):
+                        remaining.append(item)
+                    elif isinstance(item, threading.Event):
+                        item.set()
+                if remaining:
+                    self._write(remaining)
+                return
+
+    def _write(self, batch: List[tuple]):
+        conn = self._conn()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(
+                "INSERT INTO activity (time, kind, account, status, title, description, data) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                batch
+            )
+            conn.execute("COMMIT")
+            self.stats["written"] += len(batch)
+        except sqlite3.Error as e:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            self.stats["write_errors"] += len(batch)
+            print(f"Could not write {len(batch)} activity events: {str(e)}")
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _to_dict(self, row: sqlite3.Row) -> Dict:
+        event = dict(row)
+        event["time"] = datetime.fromtimestamp(event["time"]).isoformat()
+        event["data"] = json.loads(event["data"]) if event["data"] else {}
+        return event
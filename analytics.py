@@ -0,0 +1,587 @@
+import os
+import time
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Optional, Dict, List, Callable, Iterator
+
+import metrics
+import rollups
+
+DEFAULT_DB_PATH = os.path.join(os.getcwd(), 'analytics.db')
+
+# (maximum post age, seconds its metrics stay fresh): engagement on young posts moves fastest
+POST_REFRESH_TIERS = ((24 * 3600, 15 * 60), (7 * 24 * 3600, 3600), (30 * 24 * 3600, 6 * 3600))
+OLD_POST_REFRESH = 24 * 3600
+
+METRIC_FIELDS = ('impressions', 'unique_impressions', 'likes', 'comments', 'shares', 'clicks', 'engagement')
+
+# Ranges (days) and bucket sizes the dashboard offers; their rollups are precomputed after each refresh
+ROLLUP_RANGES = (7, 30, 90)
+DEFAULT_GRANULARITY = {7: 'day', 30: 'day', 90: 'week'}
+
+# Columns of the per-post and per-snapshot exports
+EXPORT_FIELDS = ('post_urn', 'published_at', 'text', 'url') + METRIC_FIELDS + ('refreshed_at',)
+HISTORY_EXPORT_FIELDS = ('post_urn', 'captured_at') + METRIC_FIELDS
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS analytics_posts (
+    post_urn TEXT PRIMARY KEY,
+    company_id TEXT NOT NULL,
+    text TEXT,
+    url TEXT,
+    published_at REAL NOT NULL,
+    impressions INTEGER NOT NULL DEFAULT 0,
+    unique_impressions INTEGER NOT NULL DEFAULT 0,
+    likes INTEGER NOT NULL DEFAULT 0,
+    comments INTEGER NOT NULL DEFAULT 0,
+    shares INTEGER NOT NULL DEFAULT 0,
+    clicks INTEGER NOT NULL DEFAULT 0,
+    engagement REAL NOT NULL DEFAULT 0,
+    refreshed_at REAL,
+    next_refresh REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_analytics_posts_due ON analytics_posts (company_id, next_refresh);
+CREATE INDEX IF NOT EXISTS idx_analytics_posts_published ON analytics_posts (company_id, published_at);
+CREATE TABLE IF NOT EXISTS post_metrics (
+    post_urn TEXT NOT NULL,
+    captured_at REAL NOT NULL,
+    impressions INTEGER NOT NULL,
+    unique_impressions INTEGER NOT NULL,
+    likes INTEGER NOT NULL,
+    comments INTEGER NOT NULL,
+    shares INTEGER NOT NULL,
+    clicks INTEGER NOT NULL,
+    engagement REAL NOT NULL,
+    PRIMARY KEY (post_urn, captured_at)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS follower_counts (
+    company_id TEXT NOT NULL,
+    captured_at REAL NOT NULL,
+    total INTEGER NOT NULL,
+    PRIMARY KEY (company_id, captured_at)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS refresh_state (
+    key TEXT PRIMARY KEY,
+    refreshed_at REAL NOT NULL
+);
+"""
+
+
+def refresh_interval(age: float) -> float:
+    """Seconds a post's metrics stay fresh, given its age in seconds"""
+    for max_age, interval in POST_REFRESH_TIERS:
+        if age < max_age:
+            return interval
+    return OLD_POST_REFRESH
+
+
+def growth(current: float, previous: float) -> float:
+    """Percent change, or 0 without a previous value to compare against"""
+    if not previous:
+        return 0.0
+    return round((current - previous) / previous * 100, 1)
+
+
+class AnalyticsStore:
+    def __init__(self, db_path: str = DEFAULT_DB_PATH):
+        """
+        Local SQLite time series of company post metrics and follower counts
+
+        analytics_posts keeps each post's latest counts next to the time its
+        data goes stale, so dashboard reads and finding stale posts are both
+        index scans. post_metrics and follower_counts only get a row when a
+        value actually changes.
+
+        Args:
+            db_path: SQLite database file
+        """
+        self.db_path = db_path
+        self._local = threading.local()
+        self._conn().executescript(SCHEMA)
+        # Rollups are cached per (company, range, granularity, day) and dropped whenever data changes
+        self._rollups: Dict[tuple, List[Dict]] = {}
+        self._version = 0
+        self._rollup_lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> 'AnalyticsStore':
+        """Build a store at ANALYTICS_DB_PATH"""
+        return cls(os.getenv('ANALYTICS_DB_PATH', DEFAULT_DB_PATH))
+
+    def upsert_posts(self, company_id: str, updates: List[Dict]) -> int:
+        """
+        Add or update company posts; new posts are due for a metrics refresh immediately
+
+        Args:
+            company_id: Company page that published them
+            updates: Dicts with id and optionally text, date (ISO) and url, as from get_company_updates
+
+        Returns:
+            Number of posts not seen before
+        """
+        now = time.time()
+        added = 0
+        with self._transaction() as conn:
+            for update in updates:
+                published_at = datetime.fromisoformat(update["date"]).timestamp() if update.get("date") else None
+                cursor = conn.execute(
+                    "INSERT INTO analytics_posts (post_urn, company_id, text, url, published_at, next_refresh) "
+                    "VALUES (?, ?, ?, ?, ?, 0) ON CONFLICT (post_urn) DO NOTHING",
+                    (update["id"], str(company_id), update.get("text"), update.get("url"), published_at or now)
+                )
+                if cursor.rowcount:
+                    added += 1
+                else:
+                    # Posts tracked by id alone get their text and real publish time once listed
+                    conn.execute(
+                        "UPDATE analytics_posts SET text = COALESCE(?, text), url = COALESCE(?, url), "
+                        "published_at = COALESCE(?, published_at) WHERE post_urn = ?",
+                        (update.get("text"), update.get("url"), published_at, update["id"])
+                    )
+        self._invalidate_rollups()
+        return added
+
+    def due_posts(self, company_id: str, limit: int = 20, now: Optional[float] = None) -> List[str]:
+        """URNs of a company's posts whose metrics are stale, stalest first"""
+        rows = self._conn().execute(
+            "SELECT post_urn FROM analytics_posts WHERE company_id = ? AND next_refresh <= ? "
+            "ORDER BY next_refresh LIMIT ?",
+            (str(company_id), now or time.time(), limit)
+        ).fetchall()
+        return [row["post_urn"] for row in rows]
+
+    def record_metrics(self, analytics: Dict[str, Dict], now: Optional[float] = None) -> int:
+        """
+        Store fresh counts for posts, appending to the time series where they changed
+
+        Args:
+            analytics: Statistics per post URN, as from get_posts_analytics
+            now: Capture time; defaults to the current time
+
+        Returns:
+            Number of posts whose counts changed
+        """
+        now = now or time.time()
+        changed = 0
+        with self._transaction() as conn:
+            for post_urn, counts in analytics.items():
+                row = conn.execute(
+                    f"SELECT published_at, refreshed_at, {', '.join(METRIC_FIELDS)} "
+                    "FROM analytics_posts WHERE post_urn = ?", (post_urn,)
+                ).fetchone()
+                if row is None:
+                    continue
+                values = tuple(counts.get(field, 0) for field in METRIC_FIELDS)
+                if row["refreshed_at"] is None or values != tuple(row[field] for field in METRIC_FIELDS):
+                    conn.execute(
+                        f"INSERT OR REPLACE INTO post_metrics (post_urn, captured_at, {', '.join(METRIC_FIELDS)}) "
+                        f"VALUES (?, ?, {', '.join('?' for _ in METRIC_FIELDS)})",
+                        (post_urn, now) + values
+                    )
+                    changed += 1
+                conn.execute(
+                    f"UPDATE analytics_posts SET {', '.join(f'{field} = ?' for field in METRIC_FIELDS)}, "
+                    "refreshed_at = ?, next_refresh = ? WHERE post_urn = ?",
+                    values + (now, now + refresh_interval(now - row["published_at"]), post_urn)
+                )
+        if changed:
+            self._invalidate_rollups()
+        return changed
+
+    def record_followers(self, company_id: str, total: int, now: Optional[float] = None):
+        """Store a follower count if it differs from the last one"""
+        with self._transaction() as conn:
+            last = conn.execute(
+                "SELECT total FROM follower_counts WHERE company_id = ? ORDER BY captured_at DESC LIMIT 1",
+                (str(company_id),)
+            ).fetchone()
+            if last is None or last["total"] != total:
+                conn.execute(
+                    "INSERT OR REPLACE INTO follower_counts (company_id, captured_at, total) VALUES (?, ?, ?)",
+                    (str(company_id), now or time.time(), total)
+                )
+
+    def mark_refreshed(self, key: str, now: Optional[float] = None):
+        self._conn().execute(
+            "INSERT OR REPLACE INTO refresh_state (key, refreshed_at) VALUES (?, ?)", (key, now or time.time())
+        )
+
+    def refreshed_at(self, key: str) -> Optional[float]:
+        row = self._conn().execute("SELECT refreshed_at FROM refresh_state WHERE key = ?", (key,)).fetchone()
+        return row["refreshed_at"] if row else None
+
+    def post(self, post_urn: str) -> Optional[Dict]:
+        """Latest stored counts for a post, or None if it isn't tracked"""
+        row = self._conn().execute("SELECT * FROM analytics_posts WHERE post_urn = ?", (post_urn,)).fetchone()
+        return self._to_dict(row) if row else None
+
+    def history(self, post_urn: str) -> List[Dict]:
+        """Every stored change in a post's counts, oldest first"""
+        rows = self._conn().execute(
+            "SELECT * FROM post_metrics WHERE post_urn = ? ORDER BY captured_at", (post_urn,)
+        ).fetchall()
+        return [{**dict(row), "captured_at": datetime.fromtimestamp(row["captured_at"]).isoformat()} for row in rows]
+
+    def recent_posts(self, company_id: str, limit: int = 10, since: Optional[float] = None) -> List[Dict]:
+        """A company's posts, newest first"""
+        rows = self._conn().execute(
+            "SELECT * FROM analytics_posts WHERE company_id = ? AND published_at >= ? "
+            "ORDER BY published_at DESC LIMIT ?",
+            (str(company_id), since or 0, limit)
+        ).fetchall()
+        return [self._to_dict(row) for row in rows]
+
+    def summary(self, company_id: str, days: int = 30, recent: int = 10, now: Optional[float] = None) -> Dict:
+        """
+        Dashboard figures for the last `days` days, with growth against the `days` before
+
+        Returns:
+            Dict of followers, engagement, posts (with the most recent) and reach
+        """
+        now = now or time.time()
+        start = now - days * 86400
+        current = self._window(company_id, start, now)
+        previous = self._window(company_id, start - days * 86400, start)
+
+        followers = self._followers_at(company_id, now)
+        followers_before = self._followers_at(company_id, start) or self._first_followers(company_id)
+        refreshed_at = self.refreshed_at(f"updates:{company_id}")
+
+        return {
+            "company_id": str(company_id),
+            "range": days,
+            "followers": {"total": followers or 0, "growth": growth(followers or 0, followers_before or 0)},
+            "engagement": {"rate": current["engagement_rate"],
+                           "growth": growth(current["engagement_rate"], previous["engagement_rate"])},
+            "posts": {
+                "total": current["posts"],
+                "growth": growth(current["posts"], previous["posts"]),
+                "recent": [
+                    {
+                        "id": post["post_id"],
+                        "text": post["text"] or '',
+                        "date": post["date"],
+                        "url": post["url"],
+                        "likes": post["likes"],
+                        "comments": post["comments"],
+                        "shares": post["shares"],
+                        "reach": post["impressions"]
+                    }
+                    for post in self.recent_posts(company_id, recent, since=start)
+                ]
+            },
+            "reach": {"average": current["average_reach"],
+                      "growth": growth(current["average_reach"], previous["average_reach"])},
+            "refreshed_at": datetime.fromtimestamp(refreshed_at).isoformat() if refreshed_at else None
+        }
+
+    def columns(self, company_id: str, since: float = 0, until: Optional[float] = None) -> Dict[str, List]:
+        """A company's posts published in [since, until) as columns of published_at and METRIC_FIELDS"""
+        fields = ('published_at',) + METRIC_FIELDS
+        rows = self._conn().execute(
+            f"SELECT {', '.join(fields)} FROM analytics_posts "
+            "WHERE company_id = ? AND published_at >= ? AND published_at < ?",
+            (str(company_id), since, until or time.time() + 1)
+        ).fetchall()
+        values = list(zip(*rows)) if rows else [() for _ in fields]
+        return dict(zip(fields, values))
+
+    def rollup(self, company_id: str, days: int = 30, granularity: Optional[str] = None,
+               now: Optional[float] = None) -> List[Dict]:
+        """
+        Per-bucket totals for the last `days` days, served from cache until the data or the day changes
+
+        Args:
+            company_id: Company page
+            days: Range length; the first bucket is the one containing its start
+            granularity: day, week or month; defaults per range from DEFAULT_GRANULARITY
+            now: End of the range; defaults to the current time
+
+        Returns:
+            Buckets as from rollups.rollup
+        """
+        granularity = granularity or DEFAULT_GRANULARITY.get(days, 'week' if days > 31 else 'day')
+        now = now or time.time()
+        start = rollups.bucket_start(now - days * 86400, granularity)
+        key = (str(company_id), days, granularity, int(now // 86400))
+        with self._rollup_lock:
+            cached = self._rollups.get(key)
+            version = self._version
+        if cached is not None:
+            return cached
+
+        series = rollups.rollup(self.columns(company_id, since=start, until=now + 1), granularity, start, now)
+        with self._rollup_lock:
+            # Skip caching a result that raced a write
+            if version == self._version:
+                self._rollups[key] = series
+        return series
+
+    def precompute(self, company_id: str):
+        """Warm the rollup cache for every dashboard range"""
+        for days in ROLLUP_RANGES:
+            self.rollup(company_id, days)
+
+    def export_batches(self, company_id: str, since: float = 0, history: bool = False,
+                       batch_size: int = 1000) -> Iterator[List[tuple]]:
+        """
+        Rows for export, read from SQLite batch_size at a time so memory stays flat
+
+        Args:
+            company_id: Company page
+            since: Only posts published (or, with history, snapshots captured) at or after this epoch time
+            history: Export every stored snapshot instead of each post's latest counts
+            batch_size: Rows per batch
+
+        Yields:
+            Lists of row tuples in EXPORT_FIELDS (or HISTORY_EXPORT_FIELDS) order
+        """
+        if history:
+            cursor = self._conn().execute(
+                f"SELECT m.post_urn, m.captured_at, {', '.join(f'm.{field}' for field in METRIC_FIELDS)} "
+                "FROM post_metrics m JOIN analytics_posts p ON p.post_urn = m.post_urn "
+                "WHERE p.company_id = ? AND m.captured_at >= ? ORDER BY m.post_urn, m.captured_at",
+                (str(company_id), since)
+            )
+            time_columns = (1,)
+        else:
+            cursor = self._conn().execute(
+                f"SELECT {', '.join(EXPORT_FIELDS)} FROM analytics_posts "
+                "WHERE company_id = ? AND published_at >= ? ORDER BY published_at",
+                (str(company_id), since)
+            )
+            time_columns = (1, len(EXPORT_FIELDS) - 1)
+
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            batch = []
+            for row in rows:
+                row = list(row)
+                for i in time_columns:
+                    row[i] = datetime.fromtimestamp(row[i]).isoformat() if row[i] else None
+                batch.append(tuple(row))
+            yield batch
+
+    def stats(self) -> Dict:
+        conn = self._conn()
+        return {
+            "posts": conn.execute("SELECT COUNT(*) FROM analytics_posts").fetchone()[0],
+            "snapshots": conn.execute("SELECT COUNT(*) FROM post_metrics").fetchone()[0],
+            "due": conn.execute(
+                "SELECT COUNT(*) FROM analytics_posts WHERE next_refresh <= ?", (time.time(),)
+            ).fetchone()[0],
+            "cached_rollups": len(self._rollups)
+        }
+
+    def _invalidate_rollups(self):
+        with self._rollup_lock:
+            self._version += 1
+            self._rollups.clear()
+
+    def _window(self, company_id: str, start: float, end: float) -> Dict:
+        row = self._conn().execute(
+            "SELECT COUNT(*) AS posts, COALESCE(SUM(impressions), 0) AS impressions, "
+            "COALESCE(SUM(likes + comments + shares + clicks), 0) AS interactions "
+            "FROM analytics_posts WHERE company_id = ? AND published_at >= ? AND published_at < ?",
+            (str(company_id), start, end)
+        ).fetchone()
+        impressions = row["impressions"]
+        return {
+            "posts": row["posts"],
+            # LinkedIn's definition: clicks, reactions, comments and shares per impression
+            "engagement_rate": round(row["interactions"] / impressions * 100, 2) if impressions else 0.0,
+            "average_reach": round(impressions / row["posts"]) if row["posts"] else 0
+        }
+
+    def _followers_at(self, company_id: str, when: float) -> Optional[int]:
+        row = self._conn().execute(
+            "SELECT total FROM follower_counts WHERE company_id = ? AND captured_at <= ? "
+            "ORDER BY captured_at DESC LIMIT 1",
+            (str(company_id), when)
+        ).fetchone()
+        return row["total"] if row else None
+
+    def _first_followers(self, company_id: str) -> Optional[int]:
+        row = self._conn().execute(
+            "SELECT total FROM follower_counts WHERE company_id = ? ORDER BY captured_at LIMIT 1", (str(company_id),)
+        ).fetchone()
+        return row["total"] if row else None
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _transaction(self):
+        return _Transaction(self._conn())
+
+    def _to_dict(self, row: sqlite3.Row) -> Dict:
+        post = dict(row)
+        post["post_id"] = post.pop("post_urn")
+        post["date"] = datetime.fromtimestamp(post.pop("published_at")).isoformat()
+        post["refreshed_at"] = datetime.fromtimestamp(post["refreshed_at"]).isoformat() if post["refreshed_at"] else None
+        post["stale"] = post.pop("next_refresh") <= time.time()
+        return post
+
+
+class _Transaction:
+    """BEGIN IMMEDIATE ... COMMIT block"""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+    def __enter__(self) -> sqlite3.Connection:
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        return False
+
+
+class AnalyticsRefresher:
+    def __init__(self, store: AnalyticsStore, source: Callable[[str], object], company_ids: List[str],
+                 interval: float = 300.0, updates_ttl: float = 600.0, followers_ttl: float = 3600.0,
+                 batch_size: int = 20, max_posts: int = 50):
+        """
+        Keeps the analytics store fresh from a background thread
+
+        Each pass lists new company posts and reads the follower count only
+        when those are older than their TTL, then fetches statistics for the
+        posts whose data has gone stale, batch_size posts per request, and
+        precomputes the dashboard rollups. Readers
+        never wait on LinkedIn: they serve what the store has and call
+        revalidate(), which queues a refresh when the data is stale.
+
+        Args:
+            store: AnalyticsStore to fill
+            source: Returns the LinkedInAutomation to query for a company id
+            company_ids: Companies refreshed on every pass
+            interval: Seconds between passes
+            updates_ttl: Seconds before the list of company posts is fetched again
+            followers_ttl: Seconds before the follower count is fetched again
+            batch_size: Posts per statistics request
+            max_posts: Recent posts listed per company on each updates fetch
+        """
+        self.store = store
+        self.source = source
+        self.company_ids = [str(company_id) for company_id in company_ids]
+        self.interval = interval
+        self.updates_ttl = updates_ttl
+        self.followers_ttl = followers_ttl
+        self.batch_size = batch_size
+        self.max_posts = max_posts
+        self._requested = set()
+        self._retry_at: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self) -> 'AnalyticsRefresher':
+        self._thread = threading.Thread(target=self._run, name='analytics-refresh', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def is_stale(self, company_id: str) -> bool:
+        now = time.time()
+        return self._older_than(f"updates:{company_id}", self.updates_ttl, now) \
+            or self._older_than(f"followers:{company_id}", self.followers_ttl, now) \
+            or bool(self.store.due_posts(company_id, limit=1, now=now))
+
+    def request_refresh(self, company_id: str):
+        """Queue a background refresh of one company; repeated requests coalesce"""
+        with self._lock:
+            self._requested.add(str(company_id))
+        self._wake.set()
+
+    def revalidate(self, company_id: str) -> bool:
+        """
+        Queue a refresh if a company's data is stale, without waiting for it
+
+        Returns:
+            True if the data being served is stale
+        """
+        stale = self.is_stale(company_id)
+        if stale:
+            self.request_refresh(company_id)
+        return stale
+
+    def refresh(self, company_id: str) -> Dict:
+        """
+        Bring one company's stale data up to date
+
+        Returns:
+            Counts of new posts and refreshed posts, and whether followers were read
+        """
+        company_id = str(company_id)
+        linkedin = self.source(company_id)
+        now = time.time()
+        result = {"new_posts": 0, "refreshed_posts": 0, "followers": False}
+
+        with metrics.timer("analytics_refresh_seconds"):
+            if self._older_than(f"updates:{company_id}", self.updates_ttl, now):
+                updates = linkedin.get_company_updates(limit=self.max_posts, company_id=company_id)
+                result["new_posts"] = self.store.upsert_posts(company_id, updates)
+                self.store.mark_refreshed(f"updates:{company_id}", now)
+
+            if self._older_than(f"followers:{company_id}", self.followers_ttl, now):
+                self.store.record_followers(company_id, linkedin.get_follower_count(company_id), now)
+                self.store.mark_refreshed(f"followers:{company_id}", now)
+                result["followers"] = True
+
+            # Refreshed posts move their next_refresh into the future, so this drains
+            while not self._stop.is_set():
+                due = self.store.due_posts(company_id, limit=self.batch_size, now=now)
+                if not due:
+                    break
+                self.store.record_metrics(linkedin.get_posts_analytics(due, company_id))
+                result["refreshed_posts"] += len(due)
+
+            self.store.precompute(company_id)
+
+        metrics.increment("analytics_posts_refreshed_total", result["refreshed_posts"])
+        return result
+
+    def _older_than(self, key: str, ttl: float, now: float) -> bool:
+        refreshed_at = self.store.refreshed_at(key)
+        return refreshed_at is None or now - refreshed_at > ttl
+
+    def _run(self):
+        next_pass = 0.0
+        while not self._stop.is_set():
+            self._wake.wait(max(0.0, next_pass - time.time()))
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+
+            with self._lock:
+                company_ids, self._requested = self._requested, set()
+            # Requests for a company that just failed wait for the next pass instead of hammering LinkedIn
+            company_ids = {company_id for company_id in company_ids
+                           if self._retry_at.get(company_id, 0) <= time.time()}
+            if time.time() >= next_pass:
+                company_ids |= set(self.company_ids)
+                next_pass = time.time() + self.interval
+
+            for company_id in sorted(company_ids):
+                try:
+                    result = self.refresh(company_id)
+                    self._retry_at.pop(company_id, None)
+                    if result["new_posts"] or result["refreshed_posts"]:
+                        print(f"Refreshed analytics for company {company_id}: {result}")
+                except Exception as e:
+                    self._retry_at[company_id] = time.time() + self.interval
+                    print(f"Error refreshing analytics for company {company_id}: {str(e)}")
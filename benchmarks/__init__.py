@@ -0,0 +1 @@
+"""Benchmark harness: local LinkedIn and Groq stand-ins plus scripted scenarios (python -m benchmarks.run)"""
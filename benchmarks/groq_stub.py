@@ -0,0 +1,122 @@
+import json
+import time
+import random
+import threading
+
+from benchmarks.stub_server import QuietHandler, StubServer
+
+WORDS = (
+    "leadership growth teams product customers insight strategy data culture learning "
+    "results innovation hiring feedback roadmap launch quality focus impact community"
+).split()
+
+
+class GroqStubHandler(QuietHandler):
+    def do_POST(self):
+        stub = self.stub
+        try:
+            payload = json.loads(self.read_body() or b'{}')
+        except ValueError:
+            self.send_body(400, b'{"error": {"message": "invalid JSON"}}', 'application/json')
+            return
+
+        status = stub.next_status(self.client_address)
+        if status != 200:
+            body = json.dumps({"error": {"message": "injected failure", "type": "rate_limit_exceeded"}}).encode()
+            self.send_body(status, body, 'application/json', {"Retry-After": str(stub.retry_after)})
+            return
+
+        tokens = stub.completion(payload)
+        time.sleep(stub.first_token_latency)
+        if payload.get("stream"):
+            self._stream(tokens, payload.get("model", "stub"))
+        else:
+            time.sleep(len(tokens) / stub.tokens_per_second)
+            body = json.dumps({
+                "id": "chatcmpl-stub",
+                "object": "chat.completion",
+                "model": payload.get("model", "stub"),
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": ''.join(tokens)},
+                             "finish_reason": "stop"}],
+                "usage": {"completion_tokens": len(tokens)}
+            }).encode()
+            self.send_body(200, body, 'application/json')
+
+    def _stream(self, tokens, model: str):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        delay = 1.0 / self.stub.tokens_per_second
+        for token in tokens:
+            chunk = {"id": "chatcmpl-stub", "object": "chat.completion.chunk", "model": model,
+                     "choices": [{"index": 0, "delta": {"content": token}, "finish_reason": None}]}
+            self._write_chunk(f"data: {json.dumps(chunk)}\n\n".encode())
+            time.sleep(delay)
+        self._write_chunk(b"data: [DONE]\n\n")
+        self._write_chunk(b"")
+
+    def _write_chunk(self, data: bytes):
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+
+class GroqStub(StubServer):
+    handler_class = GroqStubHandler
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, first_token_latency: float = 0.2,
+                 tokens_per_second: float = 400.0, completion_tokens: int = 150, error_rate: float = 0.0,
+                 retry_after: float = 0.1, seed: int = 0):
+        """
+        Groq-compatible chat completions endpoint with configurable latency and failures
+
+        Serves POST /openai/v1/chat/completions (any path works), with and
+        without "stream": true.
+
+        Args:
+            host: Interface to bind
+            port: Port to bind; 0 picks a free one
+            first_token_latency: Seconds before the first token (or the whole response) is sent
+            tokens_per_second: Generation speed; sets the delay between streamed tokens
+            completion_tokens: Tokens per completion, capped by the request's max_tokens
+            error_rate: Fraction of requests answered with 429 to exercise retries; see also fail_next
+            retry_after: Retry-After seconds sent with injected failures
+            seed: Seed for failure injection and generated text
+        """
+        super().__init__(host, port)
+        self.first_token_latency = first_token_latency
+        self.tokens_per_second = tokens_per_second
+        self.completion_tokens = completion_tokens
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._scripted = []
+        self.requests = 0
+        # Client (host, port) pairs seen, i.e. the connections the client opened
+        self.connections = set()
+
+    @property
+    def api_url(self) -> str:
+        return f"{self.url}/openai/v1/chat/completions"
+
+    def fail_next(self, *statuses: int):
+        """Answer the next requests with these statuses, in order, before error_rate applies again"""
+        with self._lock:
+            self._scripted.extend(statuses)
+
+    def next_status(self, client_address=None) -> int:
+        with self._lock:
+            self.requests += 1
+            if client_address:
+                self.connections.add(client_address)
+            if self._scripted:
+                return self._scripted.pop(0)
+            return 429 if self._random.random() < self.error_rate else 200
+
+    def completion(self, payload: dict) -> list:
+        """Token list for one response; every response differs so caches don't hide latency"""
+        count = min(self.completion_tokens, int(payload.get("max_tokens") or self.completion_tokens))
+        with self._lock:
+            words = [self._random.choice(WORDS) for _ in range(count)]
+        return [word + ' ' for word in words]
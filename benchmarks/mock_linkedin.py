@@ -0,0 +1,252 @@
+import json
+import zlib
+import time
+import random
+import struct
+import threading
+from typing import Dict, List
+from urllib.parse import urlparse
+
+from benchmarks.stub_server import QuietHandler, StubServer
+
+SESSION_COOKIE = 'li_at'
+
+LOGIN_PAGE = """<!DOCTYPE html>
+<html><head><title>LinkedIn Login</title></head>
+<body>
+<form method="post" action="/login">
+  <input id="username" name="session_key" type="text">
+  <input id="password" name="session_password" type="password">
+  <button type="submit">Sign in</button>
+</form>
+</body></html>
+"""
+
+# Matches the primary selectors in selector_registry.py: share box trigger, editor, actor toggle,
+# media button, drop zone / file input, previews, Post button and confirmation toast.
+FEED_PAGE = """<!DOCTYPE html>
+<html><head><title>Feed | LinkedIn</title>
+<style>
+  .share-box-modal { position: fixed; top: 40px; left: 40px; width: 600px; padding: 16px; background: #fff; border: 1px solid #ccc; }
+  [contenteditable] { min-height: 80px; border: 1px solid #ddd; }
+  .file-upload-input { width: 400px; height: 80px; border: 1px dashed #999; }
+  .share-mixed-media-image { width: 40px; height: 40px; }
+</style>
+</head>
+<body>
+<nav id="global-nav">LinkedIn</nav>
+<main>
+  <div class="share-box-feed-entry">
+    <button class="share-box-feed-entry__trigger artdeco-button">Start a post</button>
+  </div>
+</main>
+<script>
+var CONFIG = __CONFIG__;
+var actor = CONFIG.actor;
+
+function el(tag, attrs, text) {
+  var node = document.createElement(tag);
+  for (var name in attrs || {}) { node.setAttribute(name, attrs[name]); }
+  if (text) { node.textContent = text; }
+  return node;
+}
+
+function request(path, body) {
+  return fetch(path, {method: 'POST', headers: {'Content-Type': 'application/json'}, body: JSON.stringify(body)});
+}
+
+function openComposer() {
+  if (document.querySelector('.share-box-modal')) { return; }
+  var modal = el('div', {'class': 'share-box-modal', role: 'dialog'});
+
+  var toggle = el('button', {'class': 'share-actor-toggle artdeco-button'}, 'Posting as ' + actor);
+  toggle.onclick = function() {
+    if (modal.querySelector('.share-actor-list')) { return; }
+    var list = el('div', {'class': 'share-actor-list'});
+    CONFIG.companies.forEach(function(companyId) {
+      var option = el('div', {'data-company-id': companyId, role: 'option'}, 'Company ' + companyId);
+      option.onclick = function() { actor = companyId; toggle.textContent = 'Posting as ' + actor; list.remove(); };
+      list.appendChild(option);
+    });
+    modal.appendChild(list);
+  };
+
+  var editor = el('div', {contenteditable: 'true', role: 'textbox', 'data-placeholder': 'What do you want to talk about?'});
+  var previews = el('div', {'class': 'share-media-previews'});
+  var mediaButton = el('button', {'aria-label': 'Add media', 'class': 'artdeco-button'}, 'Media');
+  var postButton = el('button', {'class': 'share-actions__primary-action artdeco-button', disabled: 'disabled'}, 'Post');
+
+  editor.addEventListener('input', function() { postButton.disabled = editor.innerText.trim() === ''; });
+  mediaButton.onclick = function() { openMediaDialog(modal, previews); };
+  postButton.onclick = function() {
+    postButton.disabled = true;
+    request('/api/posts', {text: editor.innerText, actor: actor, media: previews.children.length}).then(function(response) {
+      return response.json();
+    }).then(function(post) {
+      modal.remove();
+      var toast = el('div', {'class': 'artdeco-toast-item'}, 'Post successful. ');
+      toast.appendChild(el('a', {href: '/feed/update/' + post.id + '/'}, 'View post'));
+      document.body.appendChild(toast);
+      setTimeout(function() { toast.remove(); }, 3000);
+    });
+  };
+
+  [toggle, editor, mediaButton, previews, postButton].forEach(function(node) { modal.appendChild(node); });
+  document.body.appendChild(modal);
+}
+
+function openMediaDialog(modal, previews) {
+  if (modal.querySelector('.file-upload-input')) { return; }
+  var dropZone = el('div', {'class': 'file-upload-input'}, 'Drop files here');
+  var input = el('input', {type: 'file', multiple: 'multiple'});
+  var upload = function(count) {
+    request('/api/media', {count: count}).then(function() {
+      for (var i = 0; i < count; i++) {
+        previews.appendChild(el('img', {'class': 'share-mixed-media-image', alt: 'preview'}));
+      }
+    });
+  };
+  dropZone.addEventListener('drop', function(e) {
+    e.preventDefault();
+    upload(e.dataTransfer && e.dataTransfer.files.length ? e.dataTransfer.files.length : 1);
+  });
+  input.addEventListener('change', function() { upload(input.files.length); });
+  modal.appendChild(dropZone);
+  modal.appendChild(input);
+}
+
+document.querySelector('.share-box-feed-entry__trigger').addEventListener('click', function() {
+  setTimeout(openComposer, CONFIG.composerDelayMs);
+});
+</script>
+</body></html>
+"""
+
+
+def make_png(width: int, height: int, seed: int = 0) -> bytes:
+    """Encode a noisy RGB PNG; noise keeps it large and gives each seed a distinct perceptual hash"""
+    noise = random.Random(seed)
+    raw = b''.join(b'\x00' + noise.randbytes(width * 3) for _ in range(height))
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+
+    header = struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)
+    return b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', header) + chunk(b'IDAT', zlib.compress(raw, 1)) + chunk(b'IEND', b'')
+
+
+class MockLinkedInHandler(QuietHandler):
+    def do_GET(self):
+        stub = self.stub
+        path = urlparse(self.path).path
+        if path == '/robots.txt':
+            self.send_body(200, b'User-agent: *\nDisallow:\n', 'text/plain')
+            return
+        if path.startswith('/media/'):
+            self.send_body(200, stub.media(path), 'image/png')
+            return
+        if path == '/login':
+            self._page(LOGIN_PAGE)
+            return
+
+        if path == '/feed/' or (path.startswith('/company/') and path.endswith('/admin/')):
+            if not self._logged_in():
+                self._redirect('/login?session_redirect=' + path)
+                return
+            company_id = path.split('/')[2] if path.startswith('/company/') else None
+            self._page(stub.feed_page(company_id))
+            return
+
+        self.send_body(404, b'Not found', 'text/plain')
+
+    def do_POST(self):
+        stub = self.stub
+        path = urlparse(self.path).path
+        body = self.read_body()
+        if path == '/login':
+            time.sleep(stub.page_latency)
+            self._redirect('/feed/', {"Set-Cookie": f"{SESSION_COOKIE}=benchmark; Path=/; HttpOnly"})
+            return
+        if not self._logged_in():
+            self.send_body(401, b'{}', 'application/json')
+            return
+
+        data = json.loads(body or b'{}')
+        if path == '/api/media':
+            time.sleep(stub.upload_latency * max(1, int(data.get("count", 1))))
+            self.send_body(200, b'{}', 'application/json')
+        elif path == '/api/posts':
+            time.sleep(stub.publish_latency)
+            post_urn = stub.record_post(data)
+            self.send_body(201, json.dumps({"id": post_urn}).encode(), 'application/json')
+        else:
+            self.send_body(404, b'{}', 'application/json')
+
+    def _logged_in(self) -> bool:
+        return f"{SESSION_COOKIE}=" in (self.headers.get('Cookie') or '')
+
+    def _page(self, html: str):
+        time.sleep(self.stub.page_latency)
+        self.send_body(200, html.encode('utf-8'), 'text/html; charset=utf-8')
+
+    def _redirect(self, location: str, headers: Dict = None):
+        self.send_body(303, b'', 'text/plain', {"Location": location, **(headers or {})})
+
+
+class MockLinkedIn(StubServer):
+    handler_class = MockLinkedInHandler
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, page_latency: float = 0.05,
+                 composer_delay: float = 0.1, upload_latency: float = 0.2, publish_latency: float = 0.3,
+                 companies: List[str] = ('1000',), media_dimension: int = 1600):
+        """
+        Local LinkedIn stand-in serving the pages and selectors the Selenium flow uses
+
+        Serves /login, /feed/, /company/<id>/admin/, /robots.txt and
+        /media/<name> (a distinct generated PNG per name). Page
+        scripts call /api/media and /api/posts with fetch so the network
+        tracker sees uploads and publishing in flight.
+
+        Args:
+            host: Interface to bind
+            port: Port to bind; 0 picks a free one
+            page_latency: Seconds before each page is served
+            composer_delay: Seconds between clicking "Start a post" and the editor appearing
+            upload_latency: Seconds per uploaded media file
+            publish_latency: Seconds the publish request takes
+            companies: Company ids offered in the actor switcher
+            media_dimension: Width and height in pixels of images served under /media/
+        """
+        super().__init__(host, port)
+        self.page_latency = page_latency
+        self.composer_delay = composer_delay
+        self.upload_latency = upload_latency
+        self.publish_latency = publish_latency
+        self.companies = list(companies)
+        self.media_dimension = media_dimension
+        self._media: Dict[str, bytes] = {}
+        self.posts: List[Dict] = []
+        self._lock = threading.Lock()
+
+    def feed_page(self, company_id=None) -> str:
+        config = {
+            "actor": company_id or "member",
+            "companies": self.companies,
+            "composerDelayMs": int(self.composer_delay * 1000)
+        }
+        return FEED_PAGE.replace('__CONFIG__', json.dumps(config))
+
+    def media_urls(self, count: int, prefix: str = 'bench') -> List[str]:
+        return [f"{self.url}/media/{prefix}-{i}.png" for i in range(count)]
+
+    def media(self, path: str) -> bytes:
+        with self._lock:
+            if path not in self._media:
+                self._media[path] = make_png(self.media_dimension, self.media_dimension, seed=zlib.crc32(path.encode()))
+            return self._media[path]
+
+    def record_post(self, post: Dict) -> str:
+        with self._lock:
+            post_urn = f"urn:li:activity:{7000000000000000000 + len(self.posts)}"
+            self.posts.append({**post, "id": post_urn, "time": time.time()})
+            return post_urn
@@ -0,0 +1,166 @@
+import json
+import time
+import threading
+from typing import Dict, List
+from urllib.parse import urlparse, parse_qs, unquote
+
+from benchmarks.stub_server import QuietHandler, StubServer
+
+
+class MockLinkedInAPIHandler(QuietHandler):
+    def do_GET(self):
+        stub = self.stub
+        if not self._authorized():
+            return
+        url = urlparse(self.path)
+        if url.path == '/v2/userinfo':
+            self._json(200, {"sub": stub.member_id, "name": "Benchmark Member"})
+        elif url.path == '/rest/posts':
+            query = parse_qs(url.query)
+            author = query.get('author', [''])[0]
+            count = int(query.get('count', ['10'])[0])
+            self._json(200, {"elements": stub.posts_by(author)[:count]})
+        elif url.path.startswith('/rest/networkSizes/'):
+            self._json(200, {"firstDegreeSize": stub.followers})
+        elif url.path == '/rest/organizationalEntityShareStatistics':
+            self._json(200, {"elements": stub.share_statistics(url.query)})
+        else:
+            self._json(404, {"message": "Not found"})
+
+    def do_POST(self):
+        stub = self.stub
+        body = self.read_body()
+        if not self._authorized():
+            return
+        url = urlparse(self.path)
+        if url.path == '/rest/images' and 'action=initializeUpload' in url.query:
+            owner = json.loads(body)["initializeUploadRequest"]["owner"]
+            self._json(200, {"value": stub.initialize_upload(owner)})
+        elif url.path == '/rest/posts':
+            time.sleep(stub.publish_latency)
+            failure = stub.next_publish_failure()
+            if failure == 'drop':
+                # The request arrived but the connection dies before any response, as on a network cut
+                self.close_connection = True
+                return
+            if failure:
+                self._json(failure, {"message": "injected failure", "status": failure})
+                return
+            post_urn = stub.record_post(json.loads(body))
+            self.send_body(201, b'', 'application/json', {"x-restli-id": post_urn})
+        else:
+            self._json(404, {"message": "Not found"})
+
+    def do_PUT(self):
+        stub = self.stub
+        size = len(self.read_body())
+        path = urlparse(self.path).path
+        if not path.startswith('/upload/'):
+            self._json(404, {"message": "Not found"})
+            return
+        time.sleep(stub.upload_latency)
+        stub.record_upload(path[len('/upload/'):], size)
+        self.send_body(201, b'', 'application/octet-stream')
+
+    def _authorized(self) -> bool:
+        if self.headers.get('Authorization') != f"Bearer {self.stub.access_token}":
+            self._json(401, {"message": "Invalid access token", "status": 401})
+            return False
+        return True
+
+    def _json(self, status: int, payload: Dict):
+        self.send_body(status, json.dumps(payload).encode('utf-8'), 'application/json')
+
+
+class MockLinkedInAPI(StubServer):
+    handler_class = MockLinkedInAPIHandler
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, access_token: str = 'benchmark',
+                 upload_latency: float = 0.05, publish_latency: float = 0.1, member_id: str = 'benchmark',
+                 followers: int = 1200):
+        """
+        Local stand-in for the LinkedIn REST endpoints linkedin_api.py calls
+
+        Serves /v2/userinfo, /rest/images?action=initializeUpload with PUT
+        upload URLs under /upload/, /rest/posts (create and list by author)
+        /rest/networkSizes and /rest/organizationalEntityShareStatistics
+        with generated counts. fail_publish injects publish failures.
+
+        Args:
+            host: Interface to bind
+            port: Port to bind; 0 picks a free one
+            access_token: Bearer token every request must carry
+            upload_latency: Seconds per image upload
+            publish_latency: Seconds the create post request takes
+            member_id: Subject returned by /v2/userinfo
+            followers: Follower count reported for every organization
+        """
+        super().__init__(host, port)
+        self.access_token = access_token
+        self.upload_latency = upload_latency
+        self.publish_latency = publish_latency
+        self.member_id = member_id
+        self.followers = followers
+        self.posts: List[Dict] = []
+        self.uploads: Dict[str, int] = {}
+        self._next_id = 7000000000000000000
+        self._publish_failures: List = []
+        self._lock = threading.Lock()
+
+    def fail_publish(self, *failures):
+        """Answer the next create post requests with these statuses, or drop the connection for 'drop'"""
+        with self._lock:
+            self._publish_failures.extend(failures)
+
+    def next_publish_failure(self):
+        with self._lock:
+            return self._publish_failures.pop(0) if self._publish_failures else None
+
+    def initialize_upload(self, owner: str) -> Dict:
+        with self._lock:
+            self._next_id += 1
+            image_id = f"D4E{self._next_id}"
+        return {
+            "uploadUrl": f"{self.url}/upload/{image_id}",
+            "image": f"urn:li:image:{image_id}",
+            "uploadUrlExpiresAt": int((time.time() + 3600) * 1000)
+        }
+
+    def record_upload(self, image_id: str, size: int):
+        with self._lock:
+            self.uploads[f"urn:li:image:{image_id}"] = size
+
+    def record_post(self, post: Dict) -> str:
+        with self._lock:
+            self._next_id += 1
+            post_urn = f"urn:li:share:{self._next_id}"
+            now = int(time.time() * 1000)
+            self.posts.append({**post, "id": post_urn, "createdAt": now, "publishedAt": now})
+        return post_urn
+
+    def posts_by(self, author: str) -> List[Dict]:
+        with self._lock:
+            return [post for post in reversed(self.posts) if post["author"] == author]
+
+    def share_statistics(self, query: str) -> List[Dict]:
+        """Deterministic counts for every share in a List(...) query"""
+        elements = []
+        for part in query.split('&'):
+            name, _, value = part.partition('=')
+            if name not in ('shares', 'ugcPosts') or not value.startswith('List('):
+                continue
+            for urn in (unquote(item) for item in value[len('List('):-1].split(',')):
+                seed = sum(ord(c) for c in urn)
+                elements.append({
+                    "share" if name == 'shares' else "ugcPost": urn,
+                    "totalShareStatistics": {
+                        "impressionCount": 500 + seed % 1000,
+                        "uniqueImpressionsCount": (500 + seed % 1000) * 4 // 5,
+                        "likeCount": seed % 50,
+                        "commentCount": seed % 10,
+                        "shareCount": seed % 5,
+                        "clickCount": seed % 30,
+                        "engagement": round((seed % 50 + seed % 10 + seed % 5 + seed % 30) / (500 + seed % 1000), 4)
+                    }
+                })
+        return elements
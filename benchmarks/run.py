@@ -0,0 +1,364 @@
+"""
+Scripted latency and throughput scenarios against local LinkedIn and Groq stand-ins
+
+    python -m benchmarks.run --scenarios generate,stream,batch --iterations 20 -o results.json
+    python -m benchmarks.run --scenarios post-single,post-concurrent --media 2 --compare baseline.json
+    python -m benchmarks.run --scenarios post-single,post-api --media 2
+
+Browser posting scenarios need Chrome and chromedriver; generation scenarios and
+post-api (the REST backend against a local API mock) only need the stand-ins.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from benchmarks.groq_stub import GroqStub
+from benchmarks.mock_linkedin import MockLinkedIn
+from benchmarks.mock_linkedin_api import MockLinkedInAPI
+
+GENERATION_SCENARIOS = ('generate', 'stream', 'batch')
+POSTING_SCENARIOS = ('post-single', 'post-batch', 'post-concurrent')
+API_SCENARIOS = ('post-api',)
+
+# Entry points whose cold import time is reported; generation must not pull in Selenium
+IMPORT_MODULES = ('generation', 'linkedin_manager')
+
+
+def percentile(samples: List[float], fraction: float) -> Optional[float]:
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))], 4)
+
+
+def summarize(latencies: List[float], wall: float, errors: int = 0, **extra) -> Dict:
+    """Latency percentiles plus completed operations per minute of wall time"""
+    return {
+        "count": len(latencies),
+        "errors": errors,
+        "p50": percentile(latencies, 0.50),
+        "p95": percentile(latencies, 0.95),
+        "p99": percentile(latencies, 0.99),
+        "mean": round(sum(latencies) / len(latencies), 4) if latencies else None,
+        "wall": round(wall, 3),
+        "per_minute": round(len(latencies) / wall * 60, 2) if wall > 0 else None,
+        **extra
+    }
+
+
+def step_percentiles(results: List[Dict]) -> Dict:
+    """p50 of each create_post step across successful posts"""
+    steps: Dict[str, List[float]] = {}
+    for result in results:
+        for step, seconds in (result.get("timings") or {}).items():
+            steps.setdefault(step, []).append(seconds)
+    return {step: percentile(samples, 0.50) for step, samples in sorted(steps.items())}
+
+
+def configure_environment(groq: GroqStub, site: MockLinkedIn, workdir: str):
+    """Point the automation at the stand-ins; must run before linkedin_manager is imported"""
+    os.environ.setdefault('GROQ_API_KEY', 'benchmark')
+    os.environ.update({
+        'GROQ_API_URL': groq.api_url,
+        'GROQ_REQUESTS_PER_MINUTE': '1000000',
+        'LINKEDIN_BASE_URL': site.url,
+        'SESSION_STORE_DISABLED': '1',
+        'GENERATION_CACHE_PATH': '',
+        'MEDIA_CACHE_DIR': os.path.join(workdir, 'media_cache'),
+        'ACTIVITY_LOG_PATH': os.path.join(workdir, 'activity.db'),
+        'PUBLISH_LEDGER_PATH': os.path.join(workdir, 'publish_ledger.db'),
+        # Measure the posting flow, not the account safety limits
+        'RATE_LIMIT_LOGIN_PER_HOUR': '1000000',
+        'RATE_LIMIT_POST_PER_HOUR': '1000000',
+        'RATE_LIMIT_MEDIA_UPLOAD_PER_HOUR': '1000000',
+        'RATE_LIMIT_POST_BURST': '1000',
+        'RATE_LIMIT_MEDIA_UPLOAD_BURST': '1000',
+        # Browser scenarios measure Selenium; post-api builds its own REST-only automation
+        'POSTING_BACKEND': 'selenium',
+    })
+    os.environ.pop('LINKEDIN_ACCESS_TOKEN', None)
+
+
+def run_generate(linkedin, args) -> Dict:
+    latencies, errors = [], 0
+    start = time.perf_counter()
+    for i in range(args.iterations):
+        began = time.perf_counter()
+        if linkedin.generate_content_with_ai(f"Benchmark prompt {i}", fresh=True):
+            latencies.append(time.perf_counter() - began)
+        else:
+            errors += 1
+    return summarize(latencies, time.perf_counter() - start, errors)
+
+
+def run_stream(linkedin, args) -> Dict:
+    latencies, first_tokens, errors = [], [], 0
+    start = time.perf_counter()
+    for i in range(args.iterations):
+        began = time.perf_counter()
+        first = None
+        try:
+            for _ in linkedin.stream_content_with_ai(f"Benchmark prompt {i}", fresh=True):
+                if first is None:
+                    first = time.perf_counter() - began
+        except Exception as e:
+            print(f"Stream failed: {str(e)}", file=sys.stderr)
+            errors += 1
+            continue
+        latencies.append(time.perf_counter() - began)
+        first_tokens.append(first or 0.0)
+    return summarize(
+        latencies, time.perf_counter() - start, errors,
+        first_token_p50=percentile(first_tokens, 0.50),
+        first_token_p95=percentile(first_tokens, 0.95)
+    )
+
+
+def run_batch(linkedin, args) -> Dict:
+    topics = [f"Benchmark topic {i}" for i in range(args.iterations)]
+    start = time.perf_counter()
+    results = linkedin.generate_batch(topics, concurrency=args.concurrency, fresh=True)
+    wall = time.perf_counter() - start
+    latencies = [result["elapsed"] for result in results if result["success"]]
+    return summarize(latencies, wall, len(results) - len(latencies), concurrency=args.concurrency)
+
+
+def run_post_single(linkedin, site: MockLinkedIn, args) -> Dict:
+    return _post_sequentially(linkedin, site, args, [f"Benchmark post {i}" for i in range(args.iterations)])
+
+
+def run_post_batch(linkedin, site: MockLinkedIn, args) -> Dict:
+    """Generate a batch of drafts, then publish each: the generate-and-post pipeline"""
+    start = time.perf_counter()
+    drafts = linkedin.generate_batch(
+        [f"Benchmark topic {i}" for i in range(args.iterations)], concurrency=args.concurrency, fresh=True
+    )
+    generation = time.perf_counter() - start
+    texts = [draft["content"] for draft in drafts if draft["success"]]
+    summary = _post_sequentially(linkedin, site, args, texts)
+    summary["generation_wall"] = round(generation, 3)
+    summary["wall"] = round(time.perf_counter() - start, 3)
+    summary["per_minute"] = round(summary["count"] / summary["wall"] * 60, 2) if summary["wall"] else None
+    summary["errors"] += len(drafts) - len(texts)
+    return summary
+
+
+def run_post_concurrent(linkedin, site: MockLinkedIn, args) -> Dict:
+    linkedin.enable_driver_pool(size=args.concurrency, wait=True)
+    try:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+            results = list(executor.map(
+                lambda i: _timed_post(linkedin, site, args, f"Concurrent benchmark post {i}"),
+                range(args.iterations)
+            ))
+        wall = time.perf_counter() - start
+    finally:
+        linkedin.driver_pool.close()
+        linkedin.driver_pool = None
+    return _post_summary(results, wall, concurrency=args.concurrency)
+
+
+def run_post_api(linkedin, site: MockLinkedIn, api: MockLinkedInAPI, args) -> Dict:
+    """Sequential posts through the REST backend only, sharing the media pipeline"""
+    from linkedin_manager import LinkedInAutomation
+    from linkedin_api import LinkedInAPIClient
+    
+    rest = LinkedInAutomation(
+        'benchmark@example.com', 'benchmark',
+        llm_client=linkedin.llm_client,
+        generation_cache=linkedin.generation_cache,
+        media_fetcher=linkedin.media_fetcher,
+        media_processor=linkedin.media_processor,
+        activity_log=linkedin.activity_log,
+        publish_ledger=linkedin.publish_ledger,
+        api_client=LinkedInAPIClient(api.access_token, api_url=api.url),
+        posting_backend='rest'
+    )
+    rest.set_company_id(args.company_id or '1000')
+    try:
+        summary = _post_sequentially(rest, site, args, [f"API benchmark post {i}" for i in range(args.iterations)])
+    finally:
+        rest.api.close()
+    summary["posts_received"] = len(api.posts)
+    return summary
+
+
+def _post_sequentially(linkedin, site: MockLinkedIn, args, texts: List[str]) -> Dict:
+    start = time.perf_counter()
+    results = [_timed_post(linkedin, site, args, text) for text in texts]
+    return _post_summary(results, time.perf_counter() - start)
+
+
+def _timed_post(linkedin, site: MockLinkedIn, args, text: str) -> Dict:
+    began = time.perf_counter()
+    result = linkedin.create_post(text, media_urls=site.media_urls(args.media), drag_and_drop=args.drag_and_drop)
+    result["latency"] = time.perf_counter() - began
+    return result
+
+
+def _post_summary(results: List[Dict], wall: float, **extra) -> Dict:
+    succeeded = [result for result in results if result["success"]]
+    return summarize(
+        [result["latency"] for result in succeeded], wall, len(results) - len(succeeded),
+        confirmed=sum(1 for result in succeeded if result.get("confirmed")),
+        steps_p50=step_percentiles(succeeded),
+        **extra
+    )
+
+
+def compare(current: Dict, baseline: Dict):
+    """Print relative change against a previous results file"""
+    print("\nChange vs baseline (negative latency / positive throughput is better):", file=sys.stderr)
+    for name, stats in current["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if not previous or "skipped" in stats or "skipped" in previous:
+            continue
+        changes = []
+        for key in ("p50", "p95", "p99", "per_minute"):
+            if stats.get(key) and previous.get(key):
+                changes.append(f"{key} {(stats[key] - previous[key]) / previous[key] * 100:+.1f}%")
+        print(f"  {name}: {', '.join(changes)}", file=sys.stderr)
+
+
+def cold_imports(modules=IMPORT_MODULES) -> Dict:
+    """Import time of each module in a fresh interpreter, and whether it loaded Selenium"""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    code = (
+        "import sys, time, json; start = time.perf_counter(); import {module}; "
+        "print(json.dumps({{'seconds': round(time.perf_counter() - start, 4), "
+        "'selenium_loaded': 'selenium' in sys.modules}}))"
+    )
+    results = {}
+    for module in modules:
+        try:
+            completed = subprocess.run(
+                [sys.executable, '-c', code.format(module=module)],
+                capture_output=True, text=True, check=True, cwd=root, env=os.environ.copy()
+            )
+            results[module] = json.loads(completed.stdout.strip().splitlines()[-1])
+        except Exception as e:
+            results[module] = {"error": str(e)}
+    return results
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark posting and generation against local stand-ins")
+    parser.add_argument('--scenarios', default=','.join(GENERATION_SCENARIOS),
+                        help="Comma-separated: " + ', '.join(GENERATION_SCENARIOS + POSTING_SCENARIOS + API_SCENARIOS))
+    parser.add_argument('-n', '--iterations', type=int, default=20, help="Operations per scenario")
+    parser.add_argument('-c', '--concurrency', type=int, default=4, help="Parallelism for batch and concurrent scenarios")
+    parser.add_argument('--media', type=int, default=0, help="Media files attached to each post")
+    parser.add_argument('--drag-and-drop', action='store_true', help="Upload media by drag and drop instead of the file input")
+    parser.add_argument('--first-token-latency', type=float, default=0.2, help="Groq stub seconds before the first token")
+    parser.add_argument('--tokens-per-second', type=float, default=400.0, help="Groq stub generation speed")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of Groq stub requests answered with 429")
+    parser.add_argument('--page-latency', type=float, default=0.05, help="Mock LinkedIn seconds per page load")
+    parser.add_argument('--publish-latency', type=float, default=0.3, help="Mock LinkedIn seconds to publish")
+    parser.add_argument('--company-id', help="Post as this company (exercises the actor switch)")
+    parser.add_argument('--browser-profile', choices=('standard', 'lean'), default='standard',
+                        help="Chrome resource profile for posting sessions")
+    parser.add_argument('-o', '--output', help="Write results JSON here")
+    parser.add_argument('--compare', help="Previous results JSON to compare against")
+    args = parser.parse_args(argv)
+
+    scenarios = [name.strip() for name in args.scenarios.split(',') if name.strip()]
+    unknown = set(scenarios) - set(GENERATION_SCENARIOS + POSTING_SCENARIOS + API_SCENARIOS)
+    if unknown:
+        parser.error(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+
+    workdir = tempfile.mkdtemp(prefix='linkedin-bench-')
+    groq = GroqStub(first_token_latency=args.first_token_latency, tokens_per_second=args.tokens_per_second,
+                    error_rate=args.error_rate).start()
+    site = MockLinkedIn(page_latency=args.page_latency, publish_latency=args.publish_latency,
+                        companies=[args.company_id] if args.company_id else ['1000']).start()
+    api = MockLinkedInAPI(publish_latency=args.publish_latency).start()
+    configure_environment(groq, site, workdir)
+    os.environ['BROWSER_PROFILE'] = args.browser_profile
+
+    import_start = time.perf_counter()
+    from linkedin_manager import LinkedInAutomation
+    import metrics
+    import_time = time.perf_counter() - import_start
+
+    linkedin = LinkedInAutomation('benchmark@example.com', 'benchmark')
+    if args.company_id:
+        linkedin.set_company_id(args.company_id)
+
+    results = {}
+    try:
+        for name in scenarios:
+            print(f"Running {name}...", file=sys.stderr)
+            if name in POSTING_SCENARIOS and not linkedin.driver and not linkedin.login():
+                results[name] = {"skipped": "Could not start or log in a browser session (is Chrome installed?)"}
+                continue
+            if name == 'generate':
+                results[name] = run_generate(linkedin, args)
+            elif name == 'stream':
+                results[name] = run_stream(linkedin, args)
+            elif name == 'batch':
+                results[name] = run_batch(linkedin, args)
+            elif name == 'post-single':
+                results[name] = run_post_single(linkedin, site, args)
+            elif name == 'post-batch':
+                results[name] = run_post_batch(linkedin, site, args)
+            elif name == 'post-concurrent':
+                results[name] = run_post_concurrent(linkedin, site, args)
+            elif name == 'post-api':
+                results[name] = run_post_api(linkedin, site, api, args)
+            print(f"  {json.dumps(results[name])}", file=sys.stderr)
+        browser = linkedin.session_stats()
+    finally:
+        linkedin.close()
+        site.stop()
+        api.stop()
+        groq.stop()
+
+    report = {
+        "meta": {
+            "time": time.strftime('%Y-%m-%dT%H:%M:%S'),
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "import_seconds": round(import_time, 4),
+            "cold_imports": cold_imports(),
+            "args": vars(args),
+            "groq_stub_requests": groq.requests,
+            "posts_received": len(site.posts),
+            "browser": browser,
+            "composer": linkedin.composer_tracker.summary()
+        },
+        "scenarios": results,
+        "metrics": metrics.REGISTRY.summary()
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+    else:
+        print(output)
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            compare(report, json.load(f))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,189 @@
+import os
+import time
+from typing import Optional, Dict, List, Iterable
+
+try:
+    import psutil
+except ImportError:  # pragma: no cover - optional dependency
+    psutil = None
+
+PROFILES = ('standard', 'lean')
+
+# URL patterns standing in for each blockable resource type
+RESOURCE_TYPE_PATTERNS = {
+    'image': ('*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg', '*.ico'),
+    'font': ('*.woff', '*.woff2', '*.ttf', '*.otf'),
+    'media': ('*.mp4', '*.webm', '*.m3u8', '*.mp3', '*.m4a'),
+}
+
+# Ads, analytics and media CDNs the posting flow never needs
+LEAN_BLOCKED_HOSTS = (
+    'px.ads.linkedin.com',
+    'dc.ads.linkedin.com',
+    'snap.licdn.com',
+    'media.licdn.com',
+    'dms.licdn.com',
+    'www.google-analytics.com',
+    'www.googletagmanager.com',
+    'doubleclick.net',
+)
+
+LEAN_RENDERER_PROCESS_LIMIT = 2
+
+
+class BrowserProfile:
+    def __init__(self, name: str = 'standard', blocked_resource_types: Iterable[str] = (),
+                 blocked_hosts: Iterable[str] = (), images: bool = True,
+                 renderer_process_limit: Optional[int] = None):
+        """
+        Chrome resource settings applied to every WebDriver session
+
+        The standard profile changes nothing. The lean profile blocks images,
+        fonts, media and ad/analytics hosts through CDP, turns off image
+        decoding and caps renderer processes, which cuts per-session memory on
+        the LinkedIn feed; posting only needs the DOM.
+
+        Args:
+            name: Profile name reported with session stats
+            blocked_resource_types: Any of image, font, media
+            blocked_hosts: Hosts whose requests are blocked, subdomains included
+            images: Whether pages decode and render images
+            renderer_process_limit: Maximum renderer processes, or None for Chrome's default
+        """
+        unknown = set(blocked_resource_types) - set(RESOURCE_TYPE_PATTERNS)
+        if unknown:
+            raise ValueError(f"Unknown resource types: {', '.join(sorted(unknown))}")
+
+        self.name = name
+        self.blocked_resource_types = tuple(blocked_resource_types)
+        self.blocked_hosts = tuple(blocked_hosts)
+        self.images = images
+        self.renderer_process_limit = renderer_process_limit
+
+    @classmethod
+    def named(cls, name: str) -> 'BrowserProfile':
+        """One of the built-in PROFILES"""
+        if name == 'standard':
+            return cls()
+        if name == 'lean':
+            return cls(
+                'lean',
+                blocked_resource_types=tuple(RESOURCE_TYPE_PATTERNS),
+                blocked_hosts=LEAN_BLOCKED_HOSTS,
+                images=False,
+                renderer_process_limit=LEAN_RENDERER_PROCESS_LIMIT
+            )
+        raise ValueError(f"Unknown browser profile: {name}")
+
+    @classmethod
+    def from_env(cls) -> 'BrowserProfile':
+        """Build the profile named by BROWSER_PROFILE, with BROWSER_* overrides"""
+        profile = cls.named(os.getenv('BROWSER_PROFILE', 'standard'))
+        extra_hosts = [host.strip() for host in os.getenv('BROWSER_BLOCKED_HOSTS', '').split(',') if host.strip()]
+        profile.blocked_hosts += tuple(extra_hosts)
+        if os.getenv('BROWSER_RENDERER_PROCESS_LIMIT'):
+            profile.renderer_process_limit = int(os.getenv('BROWSER_RENDERER_PROCESS_LIMIT'))
+        return profile
+
+    def blocked_urls(self) -> List[str]:
+        """URL patterns passed to Network.setBlockedURLs"""
+        patterns = [pattern for kind in self.blocked_resource_types for pattern in RESOURCE_TYPE_PATTERNS[kind]]
+        patterns += [f'*://{host}/*' for host in self.blocked_hosts]
+        patterns += [f'*://*.{host}/*' for host in self.blocked_hosts]
+        return patterns
+
+    def apply(self, options):
+        """Add the profile's Chrome switches and preferences to ChromeOptions"""
+        if not self.images:
+            options.add_argument('--blink-settings=imagesEnabled=false')
+            options.add_experimental_option('prefs', {'profile.managed_default_content_settings.images': 2})
+        if 'font' in self.blocked_resource_types:
+            options.add_argument('--disable-remote-fonts')
+        if self.renderer_process_limit:
+            options.add_argument(f'--renderer-process-limit={self.renderer_process_limit}')
+            # Site isolation would otherwise start a renderer per site regardless of the limit
+            options.add_argument('--disable-site-isolation-trials')
+
+    def install(self, driver):
+        """Start blocking the profile's URLs on a running driver"""
+        patterns = self.blocked_urls()
+        if not patterns:
+            return
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': patterns})
+
+    def describe(self) -> Dict:
+        return {
+            "name": self.name,
+            "blocked_resource_types": list(self.blocked_resource_types),
+            "blocked_hosts": len(self.blocked_hosts),
+            "images": self.images,
+            "renderer_process_limit": self.renderer_process_limit
+        }
+
+
+def measure_session(driver) -> Dict:
+    """
+    Memory and page-load footprint of a browser session
+
+    RSS covers chromedriver's Chrome process tree and needs psutil; the JS
+    heap and DOM node counts come from CDP and the page load time from the
+    current document's navigation timing. Values that can't be read are None.
+
+    Args:
+        driver: WebDriver to measure
+
+    Returns:
+        Dict with rss_bytes, processes, js_heap_bytes, dom_nodes, page_load_seconds, document and
+        measured_at; document identifies the loaded page (its navigation start) so callers can tell
+        a new page load from a page already measured
+    """
+    footprint = {
+        "rss_bytes": None,
+        "processes": None,
+        "js_heap_bytes": None,
+        "dom_nodes": None,
+        "page_load_seconds": None,
+        "document": None,
+        "measured_at": time.time()
+    }
+
+    process = getattr(getattr(driver, 'service', None), 'process', None)
+    if psutil is not None and process is not None:
+        try:
+            children = psutil.Process(process.pid).children(recursive=True)
+            rss = 0
+            for child in children:
+                try:
+                    rss += child.memory_info().rss
+                except psutil.Error:
+                    pass
+            footprint["rss_bytes"] = rss
+            footprint["processes"] = len(children)
+        except psutil.Error:
+            pass
+
+    try:
+        driver.execute_cdp_cmd('Performance.enable', {})
+        values = {
+            metric["name"]: metric["value"]
+            for metric in driver.execute_cdp_cmd('Performance.getMetrics', {}).get("metrics", [])
+        }
+        footprint["js_heap_bytes"] = int(values["JSHeapUsedSize"]) if "JSHeapUsedSize" in values else None
+        footprint["dom_nodes"] = int(values["Nodes"]) if "Nodes" in values else None
+    except Exception:
+        pass
+
+    try:
+        navigation = driver.execute_script(
+            "var entry = performance.getEntriesByType('navigation')[0];"
+            "return {origin: performance.timeOrigin,"
+            " duration: entry && entry.loadEventEnd ? entry.loadEventEnd - entry.startTime : null};"
+        ) or {}
+        duration = navigation.get("duration")
+        footprint["page_load_seconds"] = round(duration / 1000, 3) if duration else None
+        footprint["document"] = navigation.get("origin")
+    except Exception:
+        pass
+
+    return footprint
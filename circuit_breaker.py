@@ -0,0 +1,134 @@
+import os
+import time
+import threading
+from typing import Dict, Optional
+
+import metrics
+from errors import AutomationError, CircuitOpenError
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 max_reset_timeout: float = 600.0, half_open_probes: int = 1):
+        """
+        Fails calls to a dependency fast while it is down
+
+        After failure_threshold consecutive failures the breaker opens and
+        allow() raises CircuitOpenError without touching the dependency. Once
+        reset_timeout has passed it goes half-open and lets half_open_probes
+        calls through: a success closes it, a failure reopens it with the
+        timeout doubled (up to max_reset_timeout).
+
+        Args:
+            name: Dependency name used in errors, stats and metrics
+            failure_threshold: Consecutive failures that open the breaker
+            reset_timeout: Seconds open before the first probe
+            max_reset_timeout: Longest open period after repeated failed probes
+            half_open_probes: Calls allowed through while half-open
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self.half_open_probes = half_open_probes
+        self.state = CLOSED
+        self.failures = 0
+        self.last_error = None
+        self.stats = {"calls": 0, "failures": 0, "rejected": 0, "opened": 0}
+        self._timeout = reset_timeout
+        self._opened_at = 0.0
+        self._probes = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, name: str) -> 'CircuitBreaker':
+        """Build a breaker from CIRCUIT_FAILURE_THRESHOLD and CIRCUIT_RESET_TIMEOUT"""
+        return cls(
+            name,
+            failure_threshold=int(os.getenv('CIRCUIT_FAILURE_THRESHOLD', '5')),
+            reset_timeout=float(os.getenv('CIRCUIT_RESET_TIMEOUT', '30'))
+        )
+
+    def allow(self):
+        """
+        Admit a call, or fail fast
+
+        Raises:
+            CircuitOpenError: While the breaker is open or its half-open probes are taken
+        """
+        with self._lock:
+            if self.state == OPEN:
+                retry_in = self._opened_at + self._timeout - time.monotonic()
+                if retry_in > 0:
+                    self.stats["rejected"] += 1
+                    raise CircuitOpenError(
+                        f"{self.name} is unavailable after repeated failures ({self.last_error}); "
+                        f"retrying in {retry_in:.0f}s",
+                        retry_after=round(retry_in, 1)
+                    )
+                self._transition(HALF_OPEN)
+                self._probes = 0
+            if self.state == HALF_OPEN:
+                if self._probes >= self.half_open_probes:
+                    self.stats["rejected"] += 1
+                    raise CircuitOpenError(f"{self.name} is being probed after an outage; try again shortly",
+                                           retry_after=1.0)
+                self._probes += 1
+            self.stats["calls"] += 1
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            if self.state != CLOSED:
+                self._timeout = self.reset_timeout
+                self._transition(CLOSED)
+
+    def release(self):
+        """Give back an admitted call that never reached the dependency"""
+        with self._lock:
+            self._release()
+
+    def record_failure(self, error: Optional[Exception] = None):
+        """Count a failure; errors with trips_breaker False only give the call back"""
+        with self._lock:
+            if isinstance(error, AutomationError) and not error.trips_breaker:
+                self._release()
+                return
+            self.failures += 1
+            self.stats["failures"] += 1
+            self.last_error = str(error) if error else None
+            if self.state == HALF_OPEN:
+                self._timeout = min(self._timeout * 2, self.max_reset_timeout)
+                self._open()
+            elif self.state == CLOSED and self.failures >= self.failure_threshold:
+                self._open()
+
+    def summary(self) -> Dict:
+        with self._lock:
+            retry_in = self._opened_at + self._timeout - time.monotonic() if self.state == OPEN else 0.0
+            return {
+                "state": self.state,
+                "consecutive_failures": self.failures,
+                "retry_in": round(max(0.0, retry_in), 1),
+                "last_error": self.last_error,
+                **self.stats
+            }
+
+    def _release(self):
+        self.stats["calls"] -= 1
+        if self.state == HALF_OPEN:
+            self._probes = max(0, self._probes - 1)
+
+    def _open(self):
+        self._opened_at = time.monotonic()
+        self.stats["opened"] += 1
+        self._transition(OPEN)
+        print(f"Circuit breaker for {self.name} opened for {self._timeout:.0f}s: {self.last_error}")
+
+    def _transition(self, state: str):
+        self.state = state
+        metrics.increment("circuit_breaker_transitions_total", breaker=self.name, state=state)
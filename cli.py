@@ -0,0 +1,143 @@
+import sys
+import json
+import time
+import argparse
+
+from settings import settings, SettingsError
+
+
+def build_generator():
+    """Generation needs only GROQ_API_KEY; no LinkedIn login or browser is set up"""
+    from generation import ContentGenerator
+    from activity_log import ActivityLog
+
+    return ContentGenerator(activity_log=ActivityLog.from_env(), account=settings.linkedin_username)
+
+
+def build_linkedin():
+    from linkedin_manager import LinkedInAutomation
+
+    username, password = settings.require('LINKEDIN_USERNAME', 'LINKEDIN_PASSWORD')
+    linkedin = LinkedInAutomation(linkedin_username=username, linkedin_password=password)
+    if settings.company_id:
+        linkedin.set_company_id(settings.company_id)
+    return linkedin
+
+
+def read_topics(args) -> list:
+    topics = list(args.topics)
+    if args.file:
+        with open(args.file, encoding='utf-8') as f:
+            topics.extend(line.strip() for line in f if line.strip())
+    return topics
+
+
+def generate_batch(args) -> int:
+    topics = read_topics(args)
+    if not topics:
+        print("No topics given", file=sys.stderr)
+        return 2
+
+    settings.require('GROQ_API_KEY')
+    generator = build_generator()
+    try:
+        def progress(message, index, topic, success):
+            status = "ok" if success else "FAILED"
+            print(f"[{index + 1}/{len(topics)}] {status}: {topic}", file=sys.stderr)
+
+        start = time.perf_counter()
+        results = generator.generate_batch(
+            topics,
+            include_hashtags=not args.no_hashtags,
+            concurrency=args.concurrency,
+            fresh=args.fresh,
+            progress=progress
+        )
+        elapsed = time.perf_counter() - start
+    finally:
+        generator.close()
+        generator.activity_log.close()
+
+    failed = sum(1 for result in results if not result["success"])
+    print(f"Generated {len(results) - failed}/{len(results)} drafts in {elapsed:.1f}s", file=sys.stderr)
+
+    output = json.dumps(results, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+    else:
+        print(output)
+    return 1 if failed else 0
+
+
+def generate(args) -> int:
+    settings.require('GROQ_API_KEY')
+    generator = build_generator()
+    try:
+        prompt = generator.topic_prompt(args.topic, include_hashtags=not args.no_hashtags)
+        for fragment in generator.stream_content_with_ai(prompt, fresh=args.fresh):
+            sys.stdout.write(fragment)
+            sys.stdout.flush()
+        print()
+    finally:
+        generator.close()
+        generator.activity_log.close()
+    return 0
+
+
+def post(args) -> int:
+    if args.file:
+        with open(args.file, encoding='utf-8') as f:
+            text = f.read().strip()
+    else:
+        text = args.text
+    if not text:
+        print("No post text given", file=sys.stderr)
+        return 2
+
+    linkedin = build_linkedin()
+    try:
+        result = linkedin.create_post(text, media_urls=args.media or None)
+    finally:
+        linkedin.close()
+        linkedin.activity_log.close()
+
+    print(json.dumps(result, indent=2, ensure_ascii=False, default=str))
+    return 0 if result.get("success") else 1
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="LinkedIn automation command line tools")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    batch = subparsers.add_parser('generate-batch', help="Generate drafts for many topics concurrently")
+    batch.add_argument('topics', nargs='*', help="Topics to generate posts about")
+    batch.add_argument('-f', '--file', help="File with one topic per line")
+    batch.add_argument('-c', '--concurrency', type=int, default=5, help="Maximum Groq requests in flight")
+    batch.add_argument('-o', '--output', help="Write results as JSON to this file instead of stdout")
+    batch.add_argument('--no-hashtags', action='store_true', help="Don't ask for hashtags")
+    batch.add_argument('--fresh', action='store_true', help="Skip the generation cache")
+    batch.set_defaults(handler=generate_batch)
+
+    single = subparsers.add_parser('generate', help="Stream a draft for one topic")
+    single.add_argument('topic', help="Topic to generate a post about")
+    single.add_argument('--no-hashtags', action='store_true', help="Don't ask for hashtags")
+    single.add_argument('--fresh', action='store_true', help="Skip the generation cache")
+    single.set_defaults(handler=generate)
+
+    publish = subparsers.add_parser('post', help="Publish a post to LinkedIn")
+    publish.add_argument('text', nargs='?', help="Post text")
+    publish.add_argument('-f', '--file', help="Read the post text from this file")
+    publish.add_argument('-m', '--media', action='append', help="Media URL to attach; repeat for several")
+    publish.set_defaults(handler=post)
+
+    args = parser.parse_args(argv)
+    try:
+        return args.handler(args)
+    except SettingsError as e:
+        print(str(e), file=sys.stderr)
+        return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
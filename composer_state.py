@@ -0,0 +1,140 @@
+import uuid
+import threading
+import weakref
+from typing import Dict
+
+import metrics
+from selector_registry import as_locator
+
+# Stamped on the page after a navigation; it disappears on any reload or navigation,
+# so finding our token again proves the driver is still on the document we loaded.
+STAMP_JS = "window.__liComposerPage = arguments[0];"
+
+# One round-trip check that the page is ours, the composer is closed and the
+# start post button can be clicked.
+PAGE_READY_JS = """
+    if (window.__liComposerPage !== arguments[0]) { return false; }
+    if (document.querySelector(arguments[2])) { return false; }
+    var button = document.querySelector(arguments[1]);
+    if (!button || button.disabled) { return false; }
+    var rect = button.getBoundingClientRect();
+    return rect.width > 0 && rect.height > 0;
+"""
+
+ACTOR_LABEL_JS = """
+    var toggle = document.querySelector(arguments[0]);
+    return toggle ? toggle.textContent.trim() : null;
+"""
+
+
+class ComposerState:
+    """What a driver's page, posting actor and composer were last known to be"""
+
+    def __init__(self):
+        self.page = None
+        self.token = None
+        self.actor = None
+        self.actor_label = None
+
+
+class ComposerTracker:
+    def __init__(self):
+        """
+        Remembers each driver's page and posting actor between posts
+
+        Consecutive posts to the same page skip the navigation when the page
+        stamp, closed composer and start post button all check out, and skip
+        the actor switch when the actor toggle still shows the label it had
+        after the last switch. Any failed check falls back to the full flow.
+        """
+        self._states = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self.stats = {"page_reused": 0, "navigations": 0, "actor_reused": 0, "actor_switches": 0, "resets": 0}
+
+    def _state(self, driver) -> ComposerState:
+        with self._lock:
+            state = self._states.get(driver)
+            if state is None:
+                state = self._states[driver] = ComposerState()
+            return state
+
+    def page_ready(self, driver, page: str, trigger, editor) -> bool:
+        """
+        Whether the driver is still on page with the composer closed and ready to open
+
+        Args:
+            driver: WebDriver to check
+            page: Page key, e.g. feed or company:<id>
+            trigger: Start post button Locator or selector
+            editor: Post editor Locator or selector, which must be absent
+
+        Returns:
+            True if navigation can be skipped
+        """
+        state = self._state(driver)
+        ready = False
+        if state.page == page and state.token:
+            try:
+                ready = bool(driver.execute_script(PAGE_READY_JS, state.token, as_locator(trigger).group,
+                                                   as_locator(editor).group))
+            except Exception:
+                ready = False
+        if ready:
+            self.stats["page_reused"] += 1
+        else:
+            self.reset(driver, counted=state.page == page)
+        metrics.increment("linkedin_composer_fast_path_total", step="navigation",
+                          outcome="reused" if ready else "full")
+        return ready
+
+    def navigated(self, driver, page: str):
+        """Record a fresh navigation to page and stamp the new document"""
+        state = self._state(driver)
+        state.page = page
+        state.token = uuid.uuid4().hex
+        state.actor = None
+        state.actor_label = None
+        try:
+            driver.execute_script(STAMP_JS, state.token)
+        except Exception:
+            state.token = None
+        self.stats["navigations"] += 1
+
+    def actor_ready(self, driver, actor: str, toggle) -> bool:
+        """Whether the open composer still posts as actor, judged by the toggle label"""
+        state = self._state(driver)
+        ready = False
+        if state.actor == actor and state.actor_label:
+            try:
+                ready = driver.execute_script(ACTOR_LABEL_JS, as_locator(toggle).group) == state.actor_label
+            except Exception:
+                ready = False
+        if ready:
+            self.stats["actor_reused"] += 1
+        metrics.increment("linkedin_composer_fast_path_total", step="company_switch",
+                          outcome="reused" if ready else "full")
+        return ready
+
+    def actor_switched(self, driver, actor: str, toggle):
+        """Record a completed actor switch and the toggle label it left behind"""
+        state = self._state(driver)
+        state.actor = actor
+        try:
+            state.actor_label = driver.execute_script(ACTOR_LABEL_JS, as_locator(toggle).group)
+        except Exception:
+            state.actor_label = None
+        self.stats["actor_switches"] += 1
+
+    def reset(self, driver, counted: bool = True):
+        """Forget everything known about driver, forcing the full flow next time"""
+        with self._lock:
+            self._states.pop(driver, None)
+        if counted:
+            self.stats["resets"] += 1
+
+    def summary(self) -> Dict:
+        attempts = self.stats["page_reused"] + self.stats["navigations"]
+        return {
+            **self.stats,
+            "page_reuse_rate": round(self.stats["page_reused"] / attempts, 3) if attempts else None
+        }
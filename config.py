@@ -1,15 +1,26 @@
-import os
-from dotenv import load_dotenv
+from settings import settings
 
-# Load environment variables from .env file
-load_dotenv()
+# Values are read through settings on first access, so importing this module
+# never fails; call validate() where the full LinkedIn configuration is needed.
+_SETTINGS = {
+    'LINKEDIN_USERNAME': 'LINKEDIN_USERNAME',
+    'LINKEDIN_PASSWORD': 'LINKEDIN_PASSWORD',
+    'COMPANY_ID': 'COMPANY_ID',
+    'OPENAI_API_KEY': 'GROQ_API_KEY',  # Using GROQ API key for OpenAI compatibility
+}
 
-# LinkedIn credentials
-LINKEDIN_USERNAME = os.getenv('LINKEDIN_USERNAME')
-LINKEDIN_PASSWORD = os.getenv('LINKEDIN_PASSWORD')
-COMPANY_ID = os.getenv('COMPANY_ID')
-OPENAI_API_KEY = os.getenv('GROQ_API_KEY')  # Using GROQ API key for OpenAI compatibility
 
-# Validate required environment variables
-if not all([LINKEDIN_USERNAME, LINKEDIN_PASSWORD, COMPANY_ID]):
-    raise ValueError("Missing required environment variables. Please check your .env file.")
\ No newline at end of file
+def __getattr__(name):
+    if name in _SETTINGS:
+        return settings.get(_SETTINGS[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def validate():
+    """
+    Check the LinkedIn credentials and company are configured
+
+    Raises:
+        SettingsError: Naming every missing variable
+    """
+    settings.require('LINKEDIN_USERNAME', 'LINKEDIN_PASSWORD', 'COMPANY_ID')
@@ -0,0 +1,266 @@
+import time
+import queue
+import threading
+from contextlib import contextmanager
+from typing import Dict, List
+
+from errors import LOGIN_URL_MARKERS, CHALLENGE_URL_MARKERS
+
+
+class PooledSession:
+    """A warm Chrome session owned by a DriverPool, bound to its own debugging port"""
+
+    def __init__(self, port: int):
+        self.port = port
+        self.driver = None
+        self.created_at = None
+        self.uses = 0
+        self.footprint = None
+        # Set by mark_unhealthy while leased, when a result shows the session is unusable
+        self.failed = False
+
+    @property
+    def age(self) -> float:
+        """Seconds since the current driver was started"""
+        if self.created_at is None:
+            return 0.0
+        return time.monotonic() - self.created_at
+
+
+class DriverPool:
+    def __init__(self, automation, size: int = 2, base_port: int = 9222,
+                 health_check_interval: float = 30.0, max_uses: int = 100,
+                 max_age: float = 3600.0, lease_timeout: float = 120.0):
+        """
+        Pool of logged-in WebDriver sessions leased out to posting calls
+
+        Sessions are built and logged in by background threads, so a lease
+        only ever hands out a driver that is already on an authenticated page.
+        A session that fails a health check, raises during a lease, is marked
+        unhealthy by its lessee, or reaches its use/age limit is quit and
+        rebuilt in the background.
+
+        Args:
+            automation: LinkedInAutomation providing credentials and driver setup
+            size: Number of sessions to keep warm
+            base_port: First remote debugging port; session i uses base_port + i
+            health_check_interval: Seconds between checks of idle sessions
+            max_uses: Leases after which a session is recycled
+            max_age: Seconds after which a session is recycled
+            lease_timeout: Default seconds to wait for a free session
+        """
+        if size < 1:
+            raise ValueError("Driver pool size must be at least 1")
+
+        self.automation = automation
+        self.size = size
+        self.base_port = base_port
+        self.health_check_interval = health_check_interval
+        self.max_uses = max_uses
+        self.max_age = max_age
+        self.lease_timeout = lease_timeout
+
+        self._sessions: List[PooledSession] = [PooledSession(base_port + i) for i in range(size)]
+        self._idle = queue.Queue()
+        self._recycle = queue.Queue()
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        # Footprints are written by the recycle and health threads while stats() reads them
+        self._footprint_lock = threading.Lock()
+
+    def start(self, wait: bool = True, timeout: float = 180.0) -> bool:
+        """
+        Warm up all sessions and start the background recycler
+
+        Args:
+            wait: Block until every session is logged in
+            timeout: Maximum seconds to wait when blocking
+
+        Returns:
+            True if all sessions are ready (always True when not waiting)
+        """
+        for session in self._sessions:
+            self._recycle.put(session)
+
+        # One rebuild thread per session so warm-up and recovery run in parallel
+        for i in range(self.size):
+            self._spawn(self._recycle_worker, f"driver-pool-recycler-{i}")
+        self._spawn(self._health_check_loop, "driver-pool-health")
+
+        if not wait:
+            return True
+
+        deadline = time.monotonic() + timeout
+        while self._idle.qsize() < self.size:
+            if time.monotonic() > deadline:
+                print(f"Driver pool warm-up timed out ({self._idle.qsize()}/{self.size} ready)")
+                return False
+            time.sleep(0.5)
+        print(f"Driver pool ready with {self.size} sessions")
+        return True
+
+    @contextmanager
+    def lease(self, timeout: float = None):
+        """
+        Lease a logged-in driver for the duration of a with-block
+
+        Args:
+            timeout: Seconds to wait for a free session
+
+        Yields:
+            WebDriver instance
+        """
+        timeout = self.lease_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(f"No healthy WebDriver session available after {timeout}s")
+            try:
+                session = self._idle.get(timeout=remaining)
+            except queue.Empty:
+                continue
+            if self._is_healthy(session):
+                break
+            self._recycle.put(session)
+
+        session.uses += 1
+        session.failed = False
+        healthy = True
+        try:
+            yield session.driver
+        except Exception:
+            healthy = False
+            raise
+        finally:
+            self._release(session, healthy and not session.failed)
+
+    def mark_unhealthy(self, driver):
+        """Recycle a leased driver when its lease ends, e.g. after its session was logged out"""
+        for session in self._sessions:
+            if session.driver is driver:
+                session.failed = True
+
+    def stats(self) -> Dict:
+        """Return a snapshot of pool occupancy"""
+        with self._footprint_lock:
+            footprints = {session.port: session.footprint for session in self._sessions}
+        return {
+            "size": self.size,
+            "idle": self._idle.qsize(),
+            "recycling": self._recycle.qsize(),
+            "ports": [session.port for session in self._sessions],
+            "sessions": [
+                {"port": session.port, "uses": session.uses, "age": round(session.age, 1),
+                 **(footprints[session.port] or {})}
+                for session in self._sessions if session.driver
+            ]
+        }
+
+    def close(self):
+        """Stop background threads and quit every session"""
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout=5)
+        for session in self._sessions:
+            self._quit(session)
+        self._threads = []
+
+    def _spawn(self, target, name: str):
+        thread = threading.Thread(target=target, name=name, daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    def _release(self, session: PooledSession, healthy: bool):
+        """Return a session to the idle queue, or hand it to the recycler"""
+        if self._stop.is_set():
+            self._quit(session)
+            return
+
+        retire = session.uses >= self.max_uses or session.age >= self.max_age
+        if healthy and not retire and self._is_healthy(session):
+            self._idle.put(session)
+        else:
+            self._recycle.put(session)
+
+    def _is_healthy(self, session: PooledSession) -> bool:
+        """Cheap liveness check: the browser answers and is not on a login, checkpoint or captcha page"""
+        if session.driver is None:
+            return False
+        try:
+            current_url = session.driver.current_url
+        except Exception:
+            return False
+        return not any(marker in current_url for marker in LOGIN_URL_MARKERS + CHALLENGE_URL_MARKERS)
+
+    def _recycle_worker(self):
+        """Rebuild and log in sessions handed to the recycler"""
+        backoff = 1.0
+        while not self._stop.is_set():
+            try:
+                session = self._recycle.get(timeout=1)
+            except queue.Empty:
+                continue
+
+            self._quit(session)
+            driver = self.automation._build_driver(session.port)
+            logged_in = False
+            if driver:
+                try:
+                    logged_in = self.automation._authenticate_driver(driver)
+                except Exception as e:
+                    print(f"Driver pool login failed on port {session.port}: {str(e)}")
+
+            if logged_in and not self._stop.is_set():
+                session.driver = driver
+                session.created_at = time.monotonic()
+                session.uses = 0
+                self._measure(session)
+                self._idle.put(session)
+                backoff = 1.0
+                continue
+
+            if driver:
+                try:
+                    driver.quit()
+                except Exception:
+                    pass
+            if self._stop.is_set():
+                return
+
+            # Back off before retrying so a LinkedIn outage doesn't spin Chrome in a loop
+            print(f"Driver pool could not start session on port {session.port}, retrying in {backoff:.0f}s")
+            self._stop.wait(backoff)
+            backoff = min(backoff * 2, 60.0)
+            self._recycle.put(session)
+
+    def _health_check_loop(self):
+        """Periodically validate and measure idle sessions so dead ones are rebuilt before they are leased"""
+        while not self._stop.wait(self.health_check_interval):
+            for _ in range(self._idle.qsize()):
+                try:
+                    session = self._idle.get_nowait()
+                except queue.Empty:
+                    break
+                # Measured here, off the posting path, while nobody holds the session
+                if self._is_healthy(session):
+                    self._measure(session)
+                self._release(session, True)
+
+    def _measure(self, session: PooledSession):
+        """Measure a session nobody has leased, publishing the footprint for stats()"""
+        footprint = self.automation._measure_session(session.driver)
+        with self._footprint_lock:
+            session.footprint = footprint
+
+    def _quit(self, session: PooledSession):
+        if session.driver:
+            try:
+                session.driver.quit()
+            except Exception as e:
+                print(f"Error quitting WebDriver on port {session.port}: {str(e)}")
+            session.driver = None
+            session.created_at = None
+            with self._footprint_lock:
+                session.footprint = None
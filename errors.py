@@ -0,0 +1,161 @@
+from typing import Optional
+
+# Where the browser ends up when LinkedIn wants the user to sign in again or prove they're human
+LOGIN_URL_MARKERS = ('/login', '/uas/login', '/authwall')
+CHALLENGE_URL_MARKERS = ('/checkpoint', '/challenge', 'captcha')
+
+
+class AutomationError(Exception):
+    """
+    A classified failure of Groq or LinkedIn
+
+    kind names the failure in result dicts ("error_type") and retryable
+    tells callers whether trying again later can help; retry_after, when
+    set, is the earliest that is worth it in seconds. trips_breaker is False
+    for failures that say nothing about the dependency's health.
+    """
+    kind = "error"
+    retryable = False
+    trips_breaker = True
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+    def to_dict(self) -> dict:
+        return {"error": str(self), "error_type": self.kind, "retryable": self.retryable,
+                "retry_after": self.retry_after}
+
+
+class TransientError(AutomationError):
+    """Timeouts, network errors, 5xx responses and crashed browsers; retry with backoff"""
+    kind = "transient"
+    retryable = True
+
+
+class QuotaError(AutomationError):
+    """A rate limit or quota was hit; retry after retry_after"""
+    kind = "quota"
+    retryable = True
+
+
+class SessionExpiredError(AutomationError):
+    """The LinkedIn session is logged out; log in again before retrying"""
+    kind = "session_expired"
+    retryable = True
+    trips_breaker = False
+
+
+class ChallengeError(AutomationError):
+    """LinkedIn showed a checkpoint or captcha; needs a human, don't retry"""
+    kind = "challenge"
+
+
+class LoginFailedError(AutomationError):
+    """The login form didn't sign in, e.g. wrong credentials"""
+    kind = "login_failed"
+
+
+class SelectorError(AutomationError):
+    """The page loaded but an expected element never appeared; the selectors are likely stale"""
+    kind = "selector"
+
+
+class ConfigurationError(AutomationError):
+    """Missing or rejected credentials or settings"""
+    kind = "configuration"
+    trips_breaker = False
+
+
+class InvalidRequestError(AutomationError):
+    """The request itself was rejected, e.g. a 400 from Groq; retrying won't help"""
+    kind = "invalid_request"
+    trips_breaker = False
+
+
+class CircuitOpenError(AutomationError):
+    """A dependency's circuit breaker is open; the call was not attempted"""
+    kind = "circuit_open"
+    retryable = True
+    trips_breaker = False
+
+
+ERROR_TYPES = {cls.kind: cls for cls in (
+    TransientError, QuotaError, SessionExpiredError, ChallengeError, LoginFailedError,
+    SelectorError, ConfigurationError, InvalidRequestError, CircuitOpenError
+)}
+
+
+def error_from_result(result: dict) -> AutomationError:
+    """Typed error for a failed result dict, from its error_type"""
+    cls = ERROR_TYPES.get(result.get("error_type"), AutomationError)
+    return cls(result.get("error") or "Unknown error", retry_after=result.get("retry_after"))
+
+
+def classify_groq_error(error: Exception) -> AutomationError:
+    """Typed error for a failed Groq call"""
+    if isinstance(error, AutomationError):
+        return error
+    status = getattr(error, 'status_code', None)
+    message = str(error)
+    if status == 429:
+        return QuotaError(message, retry_after=getattr(error, 'retry_after', None))
+    if status in (401, 403):
+        return ConfigurationError(message)
+    if status is not None and 400 <= status < 500 and status != 408:
+        return InvalidRequestError(message)
+    return TransientError(message)
+
+
+def classify_browser_error(error: Exception, driver=None) -> AutomationError:
+    """
+    Typed error for a failed Selenium step
+
+    Looks at where the browser is first: a login or checkpoint page
+    explains any failure. Otherwise a timeout on a fully loaded page
+    points at a stale selector, and other WebDriver failures
+    (slow pages, a crashed or disconnected browser) are transient.
+
+    Args:
+        error: Exception raised by the step
+        driver: WebDriver the step ran on, if still usable
+
+    Returns:
+        The classified error
+    """
+    if isinstance(error, AutomationError):
+        return error
+    message = str(error) or type(error).__name__
+
+    page = _page_state(driver) if driver is not None else None
+    if page:
+        url = page.get("url") or ''
+        if any(marker in url for marker in CHALLENGE_URL_MARKERS) or page.get("captcha"):
+            return ChallengeError(f"LinkedIn checkpoint or captcha: {message}")
+        if any(marker in url for marker in LOGIN_URL_MARKERS):
+            return SessionExpiredError(f"LinkedIn session logged out: {message}")
+
+    # Selenium's exception classes are matched by name so this module doesn't import Selenium
+    name = type(error).__name__
+    if name in ('NoSuchElementException', 'InvalidSelectorException'):
+        return SelectorError(message)
+    if name == 'TimeoutException':
+        if page and page.get("ready"):
+            return SelectorError(message)
+        return TransientError(message)
+    return TransientError(message) if _is_webdriver_error(error) else AutomationError(message)
+
+
+def _page_state(driver) -> Optional[dict]:
+    try:
+        return driver.execute_script(
+            "return {url: location.href, ready: document.readyState === 'complete',"
+            " captcha: document.querySelector(\"iframe[src*='captcha'], #captcha-internal\") !== null};"
+        )
+    except Exception:
+        return None
+
+
+def _is_webdriver_error(error: Exception) -> bool:
+    return any(cls.__name__ == 'WebDriverException' for cls in type(error).__mro__) or \
+        isinstance(error, (TimeoutError, ConnectionError))
@@ -23,11 +23,20 @@ def main():
         "Innovation in Software Development"
     ]
 
-    for topic in topics:
+    # Generate all drafts concurrently, then post them one by one
+    drafts = linkedin.generate_batch(topics, include_hashtags=True, concurrency=3)
+
+    for draft in drafts:
+        topic = draft["topic"]
+        if not draft["success"]:
+            print(f"Error generating content about {topic}: {draft['error']}")
+            continue
         try:
-            # Generate and post content
-            result = linkedin.generate_and_post(topic, include_hashtags=True)
-            print(f"Successfully posted about {topic}")
+            result = linkedin.create_post(draft["content"])
+            if result.get("success"):
+                print(f"Successfully posted about {topic}")
+            else:
+                print(f"Error posting about {topic}: {result.get('error')}")
         except Exception as e:
             print(f"Error posting about {topic}: {str(e)}")
 
@@ -0,0 +1,227 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, List, Callable, Iterator
+
+from groq_client import GroqClient
+from generation_cache import GenerationCache, cache_key
+from circuit_breaker import CircuitBreaker
+from errors import AutomationError, ConfigurationError, classify_groq_error
+from settings import settings
+
+# Groq API configuration
+GROQ_MODEL = "mixtral-8x7b-32768"
+GROQ_GENERATION_PARAMS = {
+    "temperature": 0.7,
+    "max_tokens": 800,
+    "top_p": 1
+}
+GROQ_SYSTEM_PROMPT = "You are a professional LinkedIn content writer. Create engaging, business-appropriate content that resonates with a professional audience. Focus on clarity, value, and maintaining a professional tone."
+
+
+class ContentGenerator:
+    def __init__(self, llm_client: Optional[GroqClient] = None, generation_cache: Optional[GenerationCache] = None,
+                 activity_log=None, account: Optional[str] = None, breaker: Optional[CircuitBreaker] = None):
+        """
+        AI draft generation with Groq, independent of any LinkedIn session
+
+        Generation-only workers and the CLI use this directly; it needs
+        GROQ_API_KEY but no LinkedIn credentials, browser or Selenium.
+
+        Args:
+            llm_client: Optional GroqClient; one is built from the environment if omitted
+            generation_cache: Optional GenerationCache; one is built from the environment if omitted
+            activity_log: Optional ActivityLog that batch generations are recorded to
+            account: Account name attached to recorded events
+            breaker: Optional CircuitBreaker guarding Groq; one is built from the environment if omitted
+        """
+        settings.load()
+        self.llm_client = llm_client or GroqClient.from_env(settings.groq_api_key)
+        self.generation_cache = generation_cache or GenerationCache.from_env()
+        self.activity_log = activity_log
+        self.account = account
+        self.breaker = breaker or CircuitBreaker.from_env("groq")
+        self.last_error = None
+
+    def _build_messages(self, prompt: str) -> List[Dict]:
+        """Chat messages for a content generation prompt"""
+        return [
+            {
+                "role": "system",
+                "content": GROQ_SYSTEM_PROMPT
+            },
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ]
+
+    def _generation_key(self, messages: List[Dict]) -> str:
+        """Cache key covering everything that determines a generation's output"""
+        return cache_key({"model": GROQ_MODEL, "messages": messages, **GROQ_GENERATION_PARAMS})
+
+    def _check_api_key(self):
+        if not self.llm_client.api_key:
+            raise ConfigurationError("GROQ_API_KEY environment variable is not set. Please set it in your .env file.")
+
+    def _failed(self, error: Exception) -> AutomationError:
+        """Classify a failed Groq call and count it against the breaker"""
+        error = classify_groq_error(error)
+        self.breaker.record_failure(error)
+        return error
+
+    def generate_content_with_ai(self, prompt: str, fresh: bool = False) -> str:
+        """
+        Generate content using Groq's API
+
+        Args:
+            prompt: Content generation prompt
+            fresh: Skip the generation cache and request a new completion
+
+        Returns:
+            Generated content string, or None on failure with the typed error in last_error
+        """
+        try:
+            self.last_error = None
+            return self.generate(prompt, fresh)
+        except Exception as e:
+            self.last_error = classify_groq_error(e)
+            print(f"Error generating content: {str(e)}")
+            return None
+
+    def generate(self, prompt: str, fresh: bool = False) -> str:
+        """
+        Cached, non-streaming generation that raises on failure
+
+        Raises:
+            AutomationError: Typed failure; CircuitOpenError without calling Groq while its breaker is open
+        """
+        messages = self._build_messages(prompt)
+        key = self._generation_key(messages)
+        if not fresh:
+            cached = self.generation_cache.get(key)
+            if cached is not None:
+                return cached
+
+        self._check_api_key()
+        self.breaker.allow()
+        try:
+            content = self.llm_client.chat(
+                messages=messages,
+                model=GROQ_MODEL,
+                stream=False,
+                **GROQ_GENERATION_PARAMS
+            )
+        except Exception as e:
+            raise self._failed(e) from e
+        self.breaker.record_success()
+        self.generation_cache.put(key, content)
+        return content
+
+    def generate_batch(self, topics: List[str], include_hashtags: bool = True, concurrency: int = 5,
+                       fresh: bool = False, progress: Optional[Callable] = None) -> List[Dict]:
+        """
+        Generate drafts for many topics, running Groq requests concurrently
+
+        Requests still pass through the Groq client's rate limiter, so
+        concurrency only overlaps round-trips within the configured quota.
+
+        Args:
+            topics: Topics to generate content about
+            include_hashtags: Whether to include relevant hashtags
+            concurrency: Maximum requests in flight at once
+            fresh: Skip the generation cache and request new completions
+            progress: Optional callback invoked as each draft finishes
+
+        Returns:
+            One result dict per topic, in input order
+        """
+        def generate(index: int, topic: str) -> Dict:
+            start = time.perf_counter()
+            try:
+                content = self.generate(self.topic_prompt(topic, include_hashtags), fresh)
+                result = {"topic": topic, "success": True, "content": content}
+            except Exception as e:
+                error = classify_groq_error(e)
+                result = {"topic": topic, "success": False, "error": str(e), "error_type": error.kind,
+                          "retryable": error.retryable, "content": None}
+            result["elapsed"] = round(time.perf_counter() - start, 3)
+
+            if progress:
+                progress("generated", index=index, topic=topic, success=result["success"])
+            return result
+
+        if not topics:
+            return []
+
+        workers = max(1, min(concurrency, len(topics)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='groq-batch') as executor:
+            results = list(executor.map(generate, range(len(topics)), topics))
+
+        succeeded = sum(1 for result in results if result["success"])
+        if self.activity_log:
+            self.activity_log.record(
+                "generation",
+                "Drafts generated",
+                f"{succeeded} of {len(results)} topics succeeded",
+                account=self.account,
+                status="ok" if succeeded == len(results) else "failed",
+                topics=len(results),
+                succeeded=succeeded
+            )
+        return results
+
+    def topic_prompt(self, topic: str, include_hashtags: bool = True) -> str:
+        """Prompt used for topic-based post generation"""
+        prompt = f"Write a professional LinkedIn post about {topic}"
+        if include_hashtags:
+            prompt += " Include 3-5 relevant hashtags at the end."
+        return prompt
+
+    def stream_content_with_ai(self, prompt: str, fresh: bool = False) -> Iterator[str]:
+        """
+        Generate content using Groq's API, yielding text as it is produced
+
+        A cached draft is yielded as a single fragment; a completed stream is
+        added to the cache.
+
+        Args:
+            prompt: Content generation prompt
+            fresh: Skip the generation cache and request a new completion
+
+        Yields:
+            Content fragments in order
+
+        Raises:
+            AutomationError: If the request fails or the stream breaks off; CircuitOpenError while Groq's breaker is open
+        """
+        messages = self._build_messages(prompt)
+        key = self._generation_key(messages)
+        if not fresh:
+            cached = self.generation_cache.get(key)
+            if cached is not None:
+                yield cached
+                return
+
+        self._check_api_key()
+        self.breaker.allow()
+        fragments = []
+        try:
+            for fragment in self.llm_client.stream_chat(
+                messages=messages,
+                model=GROQ_MODEL,
+                **GROQ_GENERATION_PARAMS
+            ):
+                fragments.append(fragment)
+                yield fragment
+        except GeneratorExit:
+            # The consumer stopped reading, which says nothing about Groq
+            self.breaker.release()
+            raise
+        except Exception as e:
+            raise self._failed(e) from e
+        self.breaker.record_success()
+
+        self.generation_cache.put(key, ''.join(fragments))
+
+    def close(self):
+        self.llm_client.close()
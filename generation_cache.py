@@ -0,0 +1,146 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Optional, Dict
+
+
+def cache_key(payload: Dict) -> str:
+    """
+    Content address of a generation request
+
+    Args:
+        payload: Everything that determines the output (model, messages, sampling parameters)
+
+    Returns:
+        Hex SHA-256 of the canonical JSON encoding
+    """
+    canonical = json.dumps(payload, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+class GenerationCache:
+    def __init__(self, max_memory_bytes: int = 8 * 1024 * 1024, db_path: Optional[str] = None,
+                 ttl: float = 7 * 24 * 3600):
+        """
+        Two-tier cache of AI-generated drafts keyed by a hash of the full request
+
+        Args:
+            max_memory_bytes: Size of the in-memory LRU tier; least recently used entries are evicted beyond it
+            db_path: Optional SQLite file for the on-disk tier
+            ttl: Seconds an on-disk entry stays valid
+        """
+        self.max_memory_bytes = max_memory_bytes
+        self.db_path = db_path
+        self.ttl = ttl
+        self._memory: 'OrderedDict[str, str]' = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+
+        if db_path:
+            conn = self._conn()
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS generations ("
+                "key TEXT PRIMARY KEY, content TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_generations_expires ON generations (expires_at)")
+
+    @classmethod
+    def from_env(cls) -> 'GenerationCache':
+        """Build a cache from GENERATION_CACHE_* environment variables"""
+        return cls(
+            max_memory_bytes=int(os.getenv('GENERATION_CACHE_MEMORY_BYTES', str(8 * 1024 * 1024))),
+            db_path=os.getenv('GENERATION_CACHE_PATH') or None,
+            ttl=float(os.getenv('GENERATION_CACHE_TTL', str(7 * 24 * 3600)))
+        )
+
+    def get(self, key: str) -> Optional[str]:
+        """Return cached content, promoting disk hits into memory"""
+        with self._lock:
+            content = self._memory.get(key)
+            if content is not None:
+                self._memory.move_to_end(key)
+                self.stats["memory_hits"] += 1
+                return content
+
+        content = self._disk_get(key)
+        with self._lock:
+            if content is None:
+                self.stats["misses"] += 1
+                return None
+            self.stats["disk_hits"] += 1
+            self._memory_put(key, content)
+        return content
+
+    def put(self, key: str, content: str):
+        """Store content in both tiers"""
+        if not content:
+            return
+        with self._lock:
+            self._memory_put(key, content)
+        self._disk_put(key, content)
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+        if self.db_path:
+            self._conn().execute("DELETE FROM generations")
+
+    def summary(self) -> Dict:
+        """Counters plus current memory tier occupancy"""
+        with self._lock:
+            lookups = self.stats["memory_hits"] + self.stats["disk_hits"] + self.stats["misses"]
+            hits = lookups - self.stats["misses"]
+            return {
+                **self.stats,
+                "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_bytes
+            }
+
+    def _memory_put(self, key: str, content: str):
+        """Insert into the LRU tier and evict down to the size limit; caller holds the lock"""
+        size = len(content.encode('utf-8'))
+        if size > self.max_memory_bytes:
+            return
+        if key in self._memory:
+            self._memory_bytes -= len(self._memory.pop(key).encode('utf-8'))
+        self._memory[key] = content
+        self._memory_bytes += size
+        while self._memory_bytes > self.max_memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted.encode('utf-8'))
+            self.stats["evictions"] += 1
+
+    def _disk_get(self, key: str) -> Optional[str]:
+        if not self.db_path:
+            return None
+        row = self._conn().execute(
+            "SELECT content FROM generations WHERE key = ? AND expires_at > ?", (key, time.time())
+        ).fetchone()
+        return row[0] if row else None
+
+    def _disk_put(self, key: str, content: str):
+        if not self.db_path:
+            return
+        conn = self._conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO generations (key, content, expires_at) VALUES (?, ?, ?)",
+            (key, content, time.time() + self.ttl)
+        )
+        # Opportunistically drop expired rows so the file doesn't grow without bound
+        conn.execute("DELETE FROM generations WHERE expires_at <= ?", (time.time(),))
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
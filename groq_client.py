@@ -0,0 +1,226 @@
+import os
+import json
+import time
+import random
+import threading
+from email.utils import parsedate_to_datetime
+from typing import Optional, Dict, List, Iterator
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import metrics
+from rate_limit import TokenBucket
+
+DEFAULT_GROQ_API_URL = "https://api.groq.com/openai/v1/chat/completions"
+
+# Status codes worth retrying: rate limiting and transient server errors
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+
+class GroqAPIError(Exception):
+    """Raised when the Groq API returns an error or an unusable response"""
+
+    def __init__(self, message: str, status_code: Optional[int] = None, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class GroqClient:
+    def __init__(self, api_key: str, api_url: str = DEFAULT_GROQ_API_URL, pool_size: int = 10,
+                 timeout: float = 30.0, max_retries: int = 4, backoff_base: float = 0.5,
+                 backoff_cap: float = 30.0, requests_per_minute: Optional[float] = 30,
+                 tokens_per_minute: Optional[float] = None):
+        """
+        Connection-pooled Groq chat completions client with retries and client-side rate limiting
+
+        Args:
+            api_key: Groq API key
+            api_url: Chat completions endpoint; point at a local stub for testing
+            pool_size: Maximum keep-alive connections held open
+            timeout: Per-request timeout in seconds
+            max_retries: Retries after the first attempt for retryable failures
+            backoff_base: Base delay in seconds for exponential backoff
+            backoff_cap: Maximum backoff delay in seconds
+            requests_per_minute: Request quota enforced before sending, or None to disable
+            tokens_per_minute: Token quota enforced before sending, or None to disable
+        """
+        self.api_key = api_key
+        self.api_url = api_url
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.request_bucket = TokenBucket.per_minute(requests_per_minute) if requests_per_minute else None
+        self.token_bucket = TokenBucket.per_minute(tokens_per_minute) if tokens_per_minute else None
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json"
+        })
+        self._stats_lock = threading.Lock()
+        self.stats = {"requests": 0, "retries": 0, "failures": 0}
+
+    @classmethod
+    def from_env(cls, api_key: Optional[str] = None) -> 'GroqClient':
+        """Build a client from GROQ_* environment variables"""
+        tokens_per_minute = os.getenv('GROQ_TOKENS_PER_MINUTE')
+        return cls(
+            api_key=api_key or os.getenv('GROQ_API_KEY'),
+            api_url=os.getenv('GROQ_API_URL', DEFAULT_GROQ_API_URL),
+            pool_size=int(os.getenv('GROQ_POOL_SIZE', '10')),
+            max_retries=int(os.getenv('GROQ_MAX_RETRIES', '4')),
+            requests_per_minute=float(os.getenv('GROQ_REQUESTS_PER_MINUTE', '30')),
+            tokens_per_minute=float(tokens_per_minute) if tokens_per_minute else None
+        )
+
+    def chat(self, messages: List[Dict], model: str, **params) -> str:
+        """
+        Run a chat completion and return the first choice's content
+
+        Args:
+            messages: Chat messages
+            model: Model name
+            **params: Extra payload fields (temperature, max_tokens, ...)
+
+        Returns:
+            Generated content string
+        """
+        payload = {"model": model, "messages": messages, **params}
+        result = self.request(payload).json()
+        if result and result.get("choices"):
+            return result["choices"][0]["message"]["content"]
+        raise GroqAPIError(f"No content in response: {result}")
+
+    def stream_chat(self, messages: List[Dict], model: str, **params) -> Iterator[str]:
+        """
+        Run a streaming chat completion, yielding content deltas as Groq sends them
+
+        Retries only apply until the response starts; a stream that breaks
+        off midway raises GroqAPIError.
+
+        Args:
+            messages: Chat messages
+            model: Model name
+            **params: Extra payload fields (temperature, max_tokens, ...)
+
+        Yields:
+            Content fragments in order
+        """
+        payload = {"model": model, "messages": messages, **params, "stream": True}
+        response = self.request(payload, stream=True)
+        # SSE responses rarely declare a charset; the body is always UTF-8
+        response.encoding = 'utf-8'
+        try:
+            # chunk_size=None hands over data as soon as it arrives instead of filling a buffer
+            for line in response.iter_lines(chunk_size=None, decode_unicode=True):
+                if not line or not line.startswith('data:'):
+                    continue
+                data = line[len('data:'):].strip()
+                if data == '[DONE]':
+                    return
+                choices = json.loads(data).get("choices") or []
+                if choices:
+                    delta = choices[0].get("delta", {}).get("content")
+                    if delta:
+                        yield delta
+        except (requests.exceptions.RequestException, ValueError) as e:
+            self._count("failures")
+            raise GroqAPIError(f"Groq stream interrupted: {str(e)}")
+        finally:
+            response.close()
+
+    def request(self, payload: Dict, stream: bool = False) -> requests.Response:
+        """
+        POST a payload, retrying rate limits and transient failures
+
+        Args:
+            payload: Chat completions request body
+            stream: Leave the response body unread for incremental consumption
+
+        Returns:
+            Successful response
+        """
+        self._throttle(payload)
+
+        for attempt in range(self.max_retries + 1):
+            retry_after = None
+            start = time.perf_counter()
+            try:
+                self._count("requests")
+                response = self.session.post(self.api_url, json=payload, timeout=self.timeout, stream=stream)
+                metrics.observe("groq_request_duration_seconds", time.perf_counter() - start,
+                                status=response.status_code, stream=str(stream).lower())
+                if response.status_code == 200:
+                    return response
+
+                error = GroqAPIError(
+                    f"API request failed with status code {response.status_code}: {response.text[:500]}",
+                    status_code=response.status_code
+                )
+                if response.status_code not in RETRYABLE_STATUS_CODES:
+                    self._count("failures")
+                    raise error
+                retry_after = self._retry_after(response)
+                response.close()
+                if retry_after is not None and retry_after > self.backoff_cap:
+                    # Quota resets too far out to wait for; surface it to the caller
+                    self._count("failures")
+                    error.retry_after = retry_after
+                    raise error
+            except requests.exceptions.RequestException as e:
+                metrics.observe("groq_request_duration_seconds", time.perf_counter() - start,
+                                status='network_error', stream=str(stream).lower())
+                error = GroqAPIError(f"Network error while calling Groq: {str(e)}")
+
+            if attempt == self.max_retries:
+                self._count("failures")
+                raise error
+
+            delay = self._backoff(attempt, retry_after)
+            print(f"Groq request failed ({error}), retrying in {delay:.1f}s")
+            self._count("retries")
+            metrics.increment("groq_retries_total")
+            time.sleep(delay)
+
+    def close(self):
+        self.session.close()
+
+    def _throttle(self, payload: Dict):
+        """Wait for client-side quota before sending"""
+        if self.request_bucket:
+            self.request_bucket.acquire()
+        if self.token_bucket:
+            # Rough estimate: ~4 characters per prompt token plus the completion budget
+            prompt_chars = sum(len(message.get("content", "")) for message in payload.get("messages", []))
+            self.token_bucket.acquire(prompt_chars / 4 + payload.get("max_tokens", 0))
+
+    def _backoff(self, attempt: int, retry_after: Optional[float]) -> float:
+        """Full-jitter exponential backoff, never shorter than the server's Retry-After"""
+        delay = random.uniform(0, min(self.backoff_cap, self.backoff_base * (2 ** attempt)))
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    def _retry_after(self, response: requests.Response) -> Optional[float]:
+        """Parse Retry-After as seconds or an HTTP date"""
+        value = response.headers.get('Retry-After')
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+    def _count(self, key: str):
+        with self._stats_lock:
+            self.stats[key] += 1
@@ -0,0 +1,204 @@
+import time
+import uuid
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterator, List, Optional
+
+
+class Job:
+    """A unit of background work and the progress events it has emitted"""
+
+    def __init__(self, kind: str, account: str):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.account = account
+        self.status = 'queued'
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.events: List[Dict] = []
+
+    @property
+    def done(self) -> bool:
+        return self.status in ('succeeded', 'failed')
+
+    def to_dict(self) -> Dict:
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "account": self.account,
+            "status": self.status,
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "events": list(self.events)
+        }
+
+
+class QueueFullError(Exception):
+    """Raised when the job manager is at its queued job limit"""
+
+
+class JobManager:
+    def __init__(self, max_workers: int = 4, max_queued: int = 1000, max_retained: int = 1000):
+        """
+        Runs browser and API work off the request thread
+
+        Jobs are executed on a bounded thread pool. Jobs for the same account
+        run strictly one at a time in submission order; they wait in a
+        per-account queue rather than holding a pool thread, so a busy
+        account never starves the others.
+
+        Args:
+            max_workers: Maximum jobs running at once
+            max_queued: Maximum jobs waiting or running before submit() refuses work
+            max_retained: Finished jobs kept for status lookups
+        """
+        self.max_queued = max_queued
+        self.max_retained = max_retained
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='linkedin-job')
+        self._jobs: 'OrderedDict[str, Job]' = OrderedDict()
+        self._pending: Dict[str, deque] = {}
+        self._busy = set()
+        self._active = 0
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+
+    def submit(self, kind: str, account: str, fn: Callable, *args, **kwargs) -> Job:
+        """
+        Queue a job for an account
+
+        The callable receives a `progress(message, **data)` keyword argument
+        it may use to report intermediate steps.
+
+        Args:
+            kind: Job type shown in status responses (e.g. "create_post")
+            account: Serialization key; jobs with the same key never overlap
+            fn: Callable doing the work; its return value becomes the job result
+
+        Returns:
+            The queued Job
+        """
+        with self._lock:
+            if self._active >= self.max_queued:
+                raise QueueFullError(f"Too many queued jobs ({self._active}); try again later")
+
+            job = Job(kind, account)
+            self._jobs[job.id] = job
+            self._active += 1
+            self._record(job, 'queued')
+            self._pending.setdefault(account, deque()).append((job, fn, args, kwargs))
+            if account not in self._busy:
+                self._dispatch(account)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Return a job by id"""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def events(self, job_id: str, heartbeat: float = 15.0) -> Iterator[Optional[Dict]]:
+        """
+        Yield a job's events as they happen, ending once it finishes
+
+        Yields None every `heartbeat` seconds without news so streaming
+        responses can keep the connection alive.
+
+        Args:
+            job_id: Job to follow
+            heartbeat: Seconds between keep-alive yields
+        """
+        sent = 0
+        while True:
+            with self._lock:
+                job = self._jobs.get(job_id)
+                if job is None:
+                    return
+                # Other jobs' events also wake us; keep waiting until this one has news
+                deadline = time.monotonic() + heartbeat
+                while sent >= len(job.events) and not job.done:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._changed.wait(remaining)
+                new_events = job.events[sent:]
+                done = job.done
+            sent += len(new_events)
+
+            if new_events:
+                for event in new_events:
+                    yield event
+            elif not done:
+                yield None
+
+            if done and sent >= len(job.events):
+                return
+
+    def stats(self) -> Dict:
+        """Return queue occupancy"""
+        with self._lock:
+            return {
+                "active": self._active,
+                "running_accounts": len(self._busy),
+                "queued_by_account": {account: len(jobs) for account, jobs in self._pending.items() if jobs}
+            }
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)
+
+    def _dispatch(self, account: str):
+        """Start the next job for an account; caller holds the lock"""
+        queue = self._pending.get(account)
+        if not queue:
+            self._busy.discard(account)
+            self._pending.pop(account, None)
+            return
+        job, fn, args, kwargs = queue.popleft()
+        self._busy.add(account)
+        self._executor.submit(self._run, job, fn, args, kwargs)
+
+    def _run(self, job: Job, fn: Callable, args: tuple, kwargs: dict):
+        with self._lock:
+            job.status = 'running'
+            job.started_at = time.time()
+            self._record(job, 'running')
+
+        def progress(message: str, **data):
+            with self._lock:
+                self._record(job, message, **data)
+
+        status, result, error = 'succeeded', None, None
+        try:
+            result = fn(*args, progress=progress, **kwargs)
+            if isinstance(result, dict) and result.get("success") is False:
+                status, error = 'failed', result.get("error")
+        except Exception as e:
+            print(f"Job {job.id} ({job.kind}) failed: {str(e)}")
+            status, error = 'failed', str(e)
+
+        # Status and final event change together so streaming readers never see one without the other
+        with self._lock:
+            job.status = status
+            job.result = result
+            job.error = error
+            job.finished_at = time.time()
+            self._record(job, status)
+            self._active -= 1
+            self._trim()
+            self._dispatch(job.account)
+
+    def _record(self, job: Job, message: str, **data):
+        """Append a progress event and wake streaming readers; caller holds the lock"""
+        job.events.append({"job_id": job.id, "status": job.status, "message": message, "time": time.time(), **data})
+        self._changed.notify_all()
+
+    def _trim(self):
+        """Forget the oldest finished jobs beyond max_retained; caller holds the lock"""
+        finished = [job_id for job_id, job in self._jobs.items() if job.done]
+        for job_id in finished[:max(0, len(finished) - self.max_retained)]:
+            del self._jobs[job_id]
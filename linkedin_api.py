@@ -0,0 +1,241 @@
+import os
+import time
+import random
+import threading
+from typing import Optional, Dict, List
+from urllib.parse import quote
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+
+DEFAULT_LINKEDIN_API_URL = "https://api.linkedin.com"
+
+# LinkedIn marketing API version (YYYYMM) sent with every /rest request
+DEFAULT_LINKEDIN_API_VERSION = "202405"
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class LinkedInAPIError(Exception):
+    """Raised when the LinkedIn REST API returns an error"""
+
+    def __init__(self, message: str, status_code: Optional[int] = None, published: Optional[bool] = False):
+        super().__init__(message)
+        self.status_code = status_code
+        # None when a publish request may have gone through (e.g. a timeout after sending)
+        self.published = published
+
+
+def _never_sent(error: requests.exceptions.RequestException) -> bool:
+    """
+    Whether a failed request certainly never reached LinkedIn
+
+    Only a connection that was never established qualifies. requests also
+    reports a connection dropped after the body was sent (reset, remote
+    disconnect) as a ConnectionError, and that request may have gone through.
+    """
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    if not isinstance(error, requests.exceptions.ConnectionError):
+        return False
+    reason = error.args[0] if error.args else None
+    reason = getattr(reason, 'reason', reason)
+    return isinstance(reason, NewConnectionError)
+
+
+def organization_urn(company_id: str) -> str:
+    return company_id if str(company_id).startswith('urn:li:') else f"urn:li:organization:{company_id}"
+
+
+class LinkedInAPIClient:
+    def __init__(self, access_token: str, api_url: str = DEFAULT_LINKEDIN_API_URL,
+                 version: str = DEFAULT_LINKEDIN_API_VERSION, pool_size: int = 10, timeout: float = 30.0,
+                 max_retries: int = 3, backoff_base: float = 0.5, backoff_cap: float = 30.0):
+        """
+        Connection-pooled client for LinkedIn's Posts, Images and share statistics REST APIs
+
+        Args:
+            access_token: OAuth access token with w_member_social / w_organization_social scope
+            api_url: API root; point at a local mock for testing
+            version: LinkedIn-Version header value
+            pool_size: Maximum keep-alive connections held open
+            timeout: Per-request timeout in seconds
+            max_retries: Retries for rate limits and transient server errors
+            backoff_base: Base delay in seconds for exponential backoff
+            backoff_cap: Maximum backoff delay in seconds
+        """
+        self.api_url = api_url.rstrip('/')
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self._person_urn = None
+        self._lock = threading.Lock()
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({
+            "Authorization": f"Bearer {access_token}",
+            "LinkedIn-Version": version,
+            "X-Restli-Protocol-Version": "2.0.0"
+        })
+
+    @classmethod
+    def from_env(cls, access_token: Optional[str] = None) -> Optional['LinkedInAPIClient']:
+        """Build a client from LINKEDIN_* environment variables, or None when no access token is set"""
+        access_token = access_token or os.getenv('LINKEDIN_ACCESS_TOKEN')
+        if not access_token:
+            return None
+        return cls(
+            access_token=access_token,
+            api_url=os.getenv('LINKEDIN_API_URL', DEFAULT_LINKEDIN_API_URL),
+            version=os.getenv('LINKEDIN_API_VERSION', DEFAULT_LINKEDIN_API_VERSION)
+        )
+
+    def person_urn(self) -> str:
+        """URN of the member the token belongs to, looked up once"""
+        with self._lock:
+            if self._person_urn is None:
+                self._person_urn = os.getenv('LINKEDIN_PERSON_URN') or \
+                    f"urn:li:person:{self.request('GET', '/v2/userinfo').json()['sub']}"
+            return self._person_urn
+
+    def create_post(self, author: str, text: str, image_urns: Optional[List[str]] = None,
+                    visibility: str = 'PUBLIC') -> str:
+        """
+        Publish a post
+
+        Args:
+            author: Organization or person URN posting
+            text: Post commentary
+            image_urns: Uploaded image URNs to attach
+            visibility: PUBLIC or CONNECTIONS
+
+        Returns:
+            URN of the created post
+        """
+        payload = {
+            "author": author,
+            "commentary": text,
+            "visibility": visibility,
+            "distribution": {"feedDistribution": "MAIN_FEED", "targetEntities": [], "thirdPartyDistributionChannels": []},
+            "lifecycleState": "PUBLISHED",
+            "isReshareDisabledByAuthor": False
+        }
+        if image_urns and len(image_urns) == 1:
+            payload["content"] = {"media": {"id": image_urns[0]}}
+        elif image_urns:
+            payload["content"] = {"multiImage": {"images": [{"id": urn} for urn in image_urns]}}
+
+        # Not retried: a retry after an ambiguous failure could publish twice
+        try:
+            response = self.session.post(f"{self.api_url}/rest/posts", json=payload, timeout=self.timeout)
+        except requests.exceptions.RequestException as e:
+            if _never_sent(e):
+                raise LinkedInAPIError(f"Could not reach LinkedIn: {str(e)}", published=False)
+            raise LinkedInAPIError(f"Publish request failed, outcome unknown: {str(e)}", published=None)
+
+        if response.status_code not in (200, 201):
+            raise LinkedInAPIError(
+                f"Publish failed with status code {response.status_code}: {response.text[:500]}",
+                status_code=response.status_code,
+                published=None if response.status_code >= 500 else False
+            )
+        return response.headers.get('x-restli-id') or response.json().get('id')
+
+    def upload_image(self, owner: str, path: str) -> str:
+        """
+        Upload an image file for use in a post
+
+        Args:
+            owner: URN of the post author
+            path: Local image file
+
+        Returns:
+            Image URN
+        """
+        init = self.request('POST', '/rest/images', params={"action": "initializeUpload"},
+                            json={"initializeUploadRequest": {"owner": owner}}).json()["value"]
+        with open(path, 'rb') as f:
+            # Upload URLs are absolute and pre-signed; stream the file rather than reading it into memory
+            response = self.session.put(init["uploadUrl"], data=f, timeout=self.timeout,
+                                        headers={"Content-Type": "application/octet-stream"})
+        if response.status_code not in (200, 201):
+            raise LinkedInAPIError(f"Image upload failed with status code {response.status_code}",
+                                   status_code=response.status_code)
+        return init["image"]
+
+    def get_posts(self, author: str, count: int = 10) -> List[Dict]:
+        """Most recent posts by an author"""
+        response = self.request('GET', '/rest/posts', params={"q": "author", "author": author, "count": count,
+                                                               "sortBy": "LAST_MODIFIED"})
+        return response.json().get("elements", [])
+
+    def get_share_statistics(self, organization: str, post_urns: List[str]) -> Dict[str, Dict]:
+        """
+        Lifetime share statistics for an organization's posts
+
+        Only share and ugcPost URNs can be queried; any other URN is skipped.
+
+        Returns:
+            totalShareStatistics per post URN
+        """
+        if not post_urns:
+            return {}
+        shares = [urn for urn in post_urns if ':share:' in urn]
+        ugc_posts = [urn for urn in post_urns if ':ugcPost:' in urn]
+        skipped = [urn for urn in post_urns if ':share:' not in urn and ':ugcPost:' not in urn]
+        if skipped:
+            print(f"Skipping share statistics for unsupported post URNs: {', '.join(skipped)}")
+        if not shares and not ugc_posts:
+            return {}
+        # Rest.li 2.0 list syntax; URNs inside are percent-encoded, the List(...) wrapper is not
+        query = f"q=organizationalEntity&organizationalEntity={quote(organization, safe='')}"
+        if shares:
+            query += "&shares=List(" + ','.join(quote(urn, safe='') for urn in shares) + ")"
+        if ugc_posts:
+            query += "&ugcPosts=List(" + ','.join(quote(urn, safe='') for urn in ugc_posts) + ")"
+        elements = self.request('GET', f"/rest/organizationalEntityShareStatistics?{query}").json().get("elements", [])
+        return {
+            element.get("share") or element.get("ugcPost"): element.get("totalShareStatistics", {})
+            for element in elements
+        }
+
+    def get_follower_count(self, organization: str) -> int:
+        """Current follower count of an organization"""
+        response = self.request('GET', f"/rest/networkSizes/{quote(organization, safe='')}",
+                                params={"edgeType": "COMPANY_FOLLOWED_BY_MEMBER"})
+        return response.json().get("firstDegreeSize", 0)
+
+    def request(self, method: str, path: str, **kwargs) -> requests.Response:
+        """Send an idempotent or pre-publish request, retrying rate limits and transient failures"""
+        url = path if path.startswith('http') else f"{self.api_url}{path}"
+        for attempt in range(self.max_retries + 1):
+            retry_after = None
+            try:
+                response = self.session.request(method, url, timeout=self.timeout, **kwargs)
+                if response.status_code < 400:
+                    return response
+                error = LinkedInAPIError(
+                    f"{method} {path} failed with status code {response.status_code}: {response.text[:500]}",
+                    status_code=response.status_code
+                )
+                if response.status_code not in RETRYABLE_STATUS_CODES:
+                    raise error
+                retry_after = response.headers.get('Retry-After')
+            except requests.exceptions.RequestException as e:
+                error = LinkedInAPIError(f"Network error while calling LinkedIn: {str(e)}")
+
+            if attempt == self.max_retries:
+                raise error
+            delay = random.uniform(0, min(self.backoff_cap, self.backoff_base * (2 ** attempt)))
+            if retry_after and retry_after.isdigit():
+                delay = max(delay, float(retry_after))
+            print(f"LinkedIn API request failed ({error}), retrying in {delay:.1f}s")
+            time.sleep(delay)
+
+    def close(self):
+        self.session.close()
@@ -1,47 +1,149 @@
 import os
 import json
 import time
-import requests
+import weakref
+import threading
 from datetime import datetime
-from typing import Optional, Dict, List
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from typing import Optional, Dict, List, Callable, Iterator
 
-# Load environment variables
-from dotenv import load_dotenv
-load_dotenv()
+from groq_client import GroqClient
+from generation_cache import GenerationCache
+from generation import ContentGenerator
+from media_fetcher import MediaFetcher
+from media_processor import MediaProcessor
+from linkedin_api import LinkedInAPIClient, LinkedInAPIError, organization_urn
+from posting_backends import PostingBackend, SeleniumBackend, RestBackend
+from activity_log import ActivityLog
+from browser_profile import BrowserProfile, measure_session
+from composer_state import ComposerTracker
+from publish_ledger import PublishLedger, content_hash
+from rate_limit import RateController
+from selector_registry import SelectorRegistry
+from circuit_breaker import CircuitBreaker
+from errors import (
+    AutomationError, CircuitOpenError, ChallengeError, LoginFailedError, QuotaError,
+    CHALLENGE_URL_MARKERS, classify_browser_error, error_from_result
+)
+from settings import settings
+import metrics
+from waits import (
+    StepTimer, install_network_tracker, element_present, element_absent,
+    element_clickable, composer_ready, uploads_finished, post_confirmed, wait_for_post_urn
+)
 
-# Check for required environment variables
-GROQ_API_KEY = os.getenv("GROQ_API_KEY")
-if not GROQ_API_KEY:
-    raise ValueError("GROQ_API_KEY environment variable is not set. Please set it in your .env file.")
+# Posting steps whose start means the post may be live, so a retry could duplicate it
+SUBMIT_STEPS = ("publish",)
 
-# Groq API configuration
-GROQ_API_URL = "https://api.groq.com/openai/v1/chat/completions"
-GROQ_HEADERS = {
-    "Authorization": f"Bearer {GROQ_API_KEY}",
-    "Content-Type": "application/json"
-}
+# Failures after which a browser session is rebuilt rather than reused
+UNHEALTHY_SESSION_ERRORS = ("session_expired", "challenge", "transient")
+
+# Progress signal the browser flow sends right before clicking Post; not passed on to callers
+SUBMIT_SIGNAL = "post_submit"
+
+# Selenium is imported inside the methods that drive a browser, so importing
+# this module (e.g. for generation or REST-only posting) stays cheap, and
+# configuration is read through settings when first needed rather than here.
 
 class LinkedInAutomation:
-    def __init__(self, linkedin_username: str, linkedin_password: str):
+    def __init__(self, linkedin_username: str, linkedin_password: str, debugging_port: int = 9222,
+                 session_store=None, step_budgets: Optional[Dict[str, float]] = None,
+                 llm_client: Optional[GroqClient] = None, generation_cache: Optional[GenerationCache] = None,
+                 media_fetcher: Optional[MediaFetcher] = None, media_processor: Optional[MediaProcessor] = None,
+                 api_client: Optional[LinkedInAPIClient] = None, posting_backend: Optional[str] = None,
+                 activity_log: Optional[ActivityLog] = None, browser_profile: Optional[BrowserProfile] = None,
+                 publish_ledger: Optional[PublishLedger] = None, rate_controller: Optional[RateController] = None,
+                 groq_breaker: Optional[CircuitBreaker] = None, selector_registry: Optional[SelectorRegistry] = None):
         """
         Initialize LinkedIn Automation with credentials
         
         Args:
             linkedin_username: LinkedIn account username/email
             linkedin_password: LinkedIn account password
+            debugging_port: Chrome remote debugging port for the standalone driver
+            session_store: Optional SessionStore used to skip the login form on restart
+            step_budgets: Optional per-step timeouts (seconds) for the posting flow
+            llm_client: Optional GroqClient; one is built from the environment if omitted
+            generation_cache: Optional GenerationCache; one is built from the environment if omitted
+            media_fetcher: Optional MediaFetcher; one is built from the environment if omitted
+            media_processor: Optional MediaProcessor; one is built from the environment if omitted
+            api_client: Optional LinkedInAPIClient; built from LINKEDIN_ACCESS_TOKEN if omitted, False for none
+            posting_backend: "auto" (REST API when configured, browser as fallback), "rest" or "selenium";
+                defaults to POSTING_BACKEND or "auto"
+            activity_log: Optional ActivityLog for the recent activity feed; one is built from the environment if omitted
+            browser_profile: Optional BrowserProfile for Chrome sessions; built from BROWSER_PROFILE if omitted
+            publish_ledger: Optional PublishLedger that deduplicates posts; one is built from the environment if omitted
+            rate_controller: Optional RateController pacing logins, posts and uploads; built from RATE_LIMIT_* if omitted
+            groq_breaker: Optional CircuitBreaker guarding Groq, shared with other automations using the same client
+            selector_registry: Optional SelectorRegistry of the flows' selectors; built from SELECTOR_REGISTRY_PATH if omitted
         """
         self.username = linkedin_username
         self.password = linkedin_password
+        self.debugging_port = debugging_port
+        self.session_store = session_store
+        self.step_budgets = step_budgets
+        settings.load()
+        self.activity_log = activity_log or ActivityLog.from_env()
+        self.generator = ContentGenerator(llm_client, generation_cache, self.activity_log, linkedin_username,
+                                          breaker=groq_breaker)
+        self.llm_client = self.generator.llm_client
+        self.generation_cache = self.generator.generation_cache
+        self.media_fetcher = media_fetcher or MediaFetcher.from_env()
+        self.media_processor = media_processor or MediaProcessor.from_env()
+        self.api = LinkedInAPIClient.from_env() if api_client is None else api_client or None
+        self.backends = self._build_backends(posting_backend or os.getenv("POSTING_BACKEND", "auto"))
+        self.browser_profile = browser_profile or BrowserProfile.from_env()
+        self.session_footprint = None
+        # Document each driver was last measured on, so a page load is only observed once; the pool's
+        # threads measure too, so this and session_footprint are only touched under _measure_lock
+        self._measured_documents = weakref.WeakKeyDictionary()
+        self._measure_lock = threading.Lock()
+        self.composer_tracker = ComposerTracker()
+        self.selectors = selector_registry or SelectorRegistry.from_env()
+        self.publish_ledger = publish_ledger or PublishLedger.from_env()
+        self.rate_controller = rate_controller or RateController.from_env()
+        # Longest a call waits for a rate limit slot before giving up
+        self.rate_limit_wait = float(os.getenv("RATE_LIMIT_MAX_WAIT", "300"))
+        self.last_login_outcome = None
+        self.last_login_error = None
+        # Login and composer failures are tracked per account: one account's lockout says nothing about another's
+        self.breakers = {name: CircuitBreaker.from_env(name) for name in ("linkedin_login", "linkedin_composer")}
         self.company_id = None
         self.driver = None
+        self.driver_pool = None
+        self.post_queue = None
+        
+    def _build_backends(self, preference: str) -> List[PostingBackend]:
+        """Posting backends in the order they are tried"""
+        if preference not in ("auto", "rest", "selenium"):
+            raise ValueError(f"Unknown posting backend: {preference}")
+        if preference == "rest" and not self.api:
+            raise ValueError("The rest posting backend needs LINKEDIN_ACCESS_TOKEN or an api_client")
+        
+        backends = []
+        if preference in ("auto", "rest") and self.api:
+            backends.append(RestBackend(self.api, self.media_fetcher, self.media_processor))
+        if preference in ("auto", "selenium"):
+            backends.append(SeleniumBackend(self))
+        return backends
         
     def _setup_driver(self):
-        """Setup Selenium WebDriver with comprehensive options to mitigate GPU and rendering issues"""
+        """Setup the standalone Selenium WebDriver used when no driver pool is enabled"""
+        self.driver = self._build_driver(self.debugging_port)
+        return self.driver is not None
+        
+    def _build_driver(self, debugging_port: int = 9222):
+        """
+        Build a Selenium WebDriver with comprehensive options to mitigate GPU and rendering issues
+        
+        Args:
+            debugging_port: Chrome remote debugging port, unique per running session
+            
+        Returns:
+            WebDriver instance, or None if Chrome could not be started
+        """
+        from selenium import webdriver
+        
+        start = time.perf_counter()
         try:
             # Comprehensive Chrome options
             options = webdriver.ChromeOptions()
@@ -65,7 +167,7 @@ class LinkedInAutomation:
             options.add_argument('--mute-audio')
             
             # Specific WebDriver stability arguments
-            options.add_argument('--remote-debugging-port=9222')
+            options.add_argument(f'--remote-debugging-port={debugging_port}')
             options.add_argument('--no-first-run')
             options.add_argument('--no-service-autorun')
             options.add_argument('--disable-features=VizDisplayCompositor')
@@ -76,31 +178,244 @@ class LinkedInAutomation:
             # Additional experimental options
             options.add_experimental_option('excludeSwitches', ['enable-logging'])
             
+            # Resource limits of the configured profile (lean blocks images, fonts and trackers)
+            self.browser_profile.apply(options)
+            
             # Create WebDriver service with logging
             service = webdriver.chrome.service.Service()
             service.creationflags = 0x08000000  # No-window flag
             
             # Initialize WebDriver with enhanced options
-            self.driver = webdriver.Chrome(
+            driver = webdriver.Chrome(
                 options=options,
                 service=service
             )
             
             # Set page load and script timeouts
-            self.driver.set_page_load_timeout(30)
-            self.driver.set_script_timeout(30)
+            driver.set_page_load_timeout(30)
+            driver.set_script_timeout(30)
             
-            # Additional configuration
-            self.driver.implicitly_wait(10)
+            # No implicit wait: lookups are explicit waits on selector registry probes, and an
+            # implicit wait would make every missing fallback candidate cost its full timeout
             
-            return True
+            # Track in-flight requests so posting waits can key off network activity
+            install_network_tracker(driver)
+            
+            try:
+                self.browser_profile.install(driver)
+            except Exception as e:
+                print(f"Could not apply {self.browser_profile.name} browser profile: {str(e)}")
+            
+            metrics.observe("linkedin_driver_setup_seconds", time.perf_counter() - start, outcome="ok")
+            return driver
         except Exception as e:
+            metrics.observe("linkedin_driver_setup_seconds", time.perf_counter() - start, outcome="error")
             print(f"Critical error setting up WebDriver: {str(e)}")
             # Log the full traceback for debugging
             import traceback
             traceback.print_exc()
+            return None
+            
+    def _login_driver(self, driver) -> bool:
+        """
+        Run the LinkedIn login form flow once on the given driver
+        
+        Args:
+            driver: WebDriver to authenticate
+            
+        Returns:
+            True if the session is logged in
+        """
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.common.exceptions import TimeoutException
+        
+        # Navigate to LinkedIn login
+        driver.get(f'{settings.linkedin_base_url}/login')
+        
+        # Wait for username field with explicit wait
+        username_field = WebDriverWait(driver, 15, poll_frequency=0.1).until(
+            element_present(self.selectors.locator("login_username"))
+        )
+        
+        # Clear and input username
+        username_field.clear()
+        username_field.send_keys(self.username)
+        
+        # Find and fill password field
+        password_field = WebDriverWait(driver, 5, poll_frequency=0.1).until(
+            element_present(self.selectors.locator("login_password"))
+        )
+        password_field.clear()
+        password_field.send_keys(self.password)
+        
+        # Click login button
+        WebDriverWait(driver, 5, poll_frequency=0.1).until(
+            element_clickable(self.selectors.locator("login_submit"))
+        ).click()
+        
+        # Wait for successful login with multiple checks
+        try:
+            WebDriverWait(driver, 20, poll_frequency=0.25).until(
+                element_present(self.selectors.locator("logged_in_marker"))
+            )
+            print("Successfully logged in to LinkedIn")
+            return True
+        
+        except TimeoutException:
+            # Additional checks for login success
+            current_url = driver.current_url
+            if 'feed' in current_url or 'home' in current_url:
+                print("Login successful (URL-based verification)")
+                return True
+            
             return False
             
+    def _authenticate_driver(self, driver) -> bool:
+        """
+        Log the driver in, preferring a saved session over the login form
+        
+        Args:
+            driver: WebDriver to authenticate
+            
+        Returns:
+            True if the session is logged in
+        """
+        if self.session_store:
+            start = time.perf_counter()
+            try:
+                restored = self.session_store.restore(driver, self.username)
+            except Exception as e:
+                print(f"Could not restore saved session: {str(e)}")
+                restored = False
+            metrics.observe("linkedin_login_seconds", time.perf_counter() - start,
+                            method="restore", outcome="ok" if restored else "error")
+            if restored:
+                print("Restored saved LinkedIn session")
+                self.activity_log.record("login", "Logged in", "Restored saved session",
+                                         account=self.username, method="restore")
+                return True
+        
+        breaker = self.breakers["linkedin_login"]
+        try:
+            breaker.allow()
+        except CircuitOpenError as e:
+            print(f"Not logging in: {str(e)}")
+            self.last_login_outcome = "circuit_open"
+            self.last_login_error = e
+            return False
+        
+        if not self.rate_controller.acquire(self.username, "login", timeout=self.rate_limit_wait):
+            wait = self.rate_controller.wait_time(self.username, "login")
+            print(f"Login rate limit reached for {self.username}; next attempt allowed in {wait:.0f}s")
+            breaker.release()
+            self.last_login_outcome = "rate_limited"
+            self.last_login_error = QuotaError(f"Login rate limit reached; next attempt allowed in {wait:.0f}s",
+                                               retry_after=wait)
+            return False
+        
+        start = time.perf_counter()
+        logged_in = False
+        error = None
+        try:
+            logged_in = self._login_driver(driver)
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            if logged_in:
+                self.last_login_outcome = "ok"
+                self.last_login_error = None
+                breaker.record_success()
+            else:
+                if error is not None:
+                    self.last_login_error = classify_browser_error(error, driver)
+                elif self._challenge_page(driver):
+                    self.last_login_error = ChallengeError("LinkedIn asked for a checkpoint or captcha at login")
+                else:
+                    self.last_login_error = LoginFailedError("LinkedIn did not accept the login")
+                self.last_login_outcome = "challenge" if self.last_login_error.kind == "challenge" else "error"
+                breaker.record_failure(self.last_login_error)
+            self.rate_controller.record(self.username, "login", self.last_login_outcome, elapsed)
+            metrics.observe("linkedin_login_seconds", elapsed, method="form", outcome="ok" if logged_in else "error")
+            self.activity_log.record(
+                "login",
+                "Logged in" if logged_in else "Login failed",
+                f"Signed in with the login form in {elapsed:.1f}s",
+                account=self.username,
+                status="ok" if logged_in else "failed",
+                method="form"
+            )
+        if not logged_in:
+            return False
+        
+        self._save_session(driver)
+        return True
+        
+    def _measure_session(self, driver) -> Dict:
+        """
+        Record a session's memory and page-load footprint; see browser_profile.measure_session
+        
+        Costs a process-tree walk and several CDP round-trips, so it runs after
+        logins and real navigations or from the pool's threads, never after
+        every post. The page load is observed once per document. A footprint
+        of the standalone driver is kept as session_footprint.
+        """
+        footprint = measure_session(driver)
+        document = footprint["document"]
+        with self._measure_lock:
+            try:
+                new_document = document is None or self._measured_documents.get(driver) != document
+                self._measured_documents[driver] = document
+            except TypeError:
+                new_document = True
+            if driver is self.driver:
+                self.session_footprint = footprint
+        if footprint["page_load_seconds"] is not None and new_document:
+            metrics.observe("linkedin_page_load_seconds", footprint["page_load_seconds"],
+                            profile=self.browser_profile.name)
+        return footprint
+        
+    def session_stats(self) -> Dict:
+        """Browser profile plus the last measured footprint of each browser session"""
+        sessions = []
+        with self._measure_lock:
+            footprint = self.session_footprint
+        if self.driver and footprint:
+            sessions.append({"port": self.debugging_port, "pooled": False, **footprint})
+        if self.driver_pool:
+            sessions.extend({"pooled": True, **session} for session in self.driver_pool.stats()["sessions"])
+        return {"profile": self.browser_profile.describe(), "sessions": sessions}
+        
+    def _challenge_page(self, driver) -> bool:
+        """Whether LinkedIn has put the session on a checkpoint or captcha page"""
+        try:
+            if any(marker in driver.current_url for marker in CHALLENGE_URL_MARKERS):
+                return True
+            return bool(driver.execute_script(
+                "return document.querySelector(\"iframe[src*='captcha'], #captcha-internal\") !== null;"
+            ))
+        except Exception:
+            return False
+        
+    def breaker_stats(self) -> Dict:
+        """State of the Groq, LinkedIn login and composer circuit breakers"""
+        breakers = [self.generator.breaker, *self.breakers.values()]
+        return {breaker.name: breaker.summary() for breaker in breakers}
+        
+    def rate_budgets(self) -> Dict:
+        """Current login, post and media upload budgets of this account"""
+        return self.rate_controller.budgets(self.username).get(self.username, {})
+        
+    def _save_session(self, driver):
+        """Persist the driver's session if a session store is configured"""
+        if not self.session_store or not driver:
+            return
+        try:
+            self.session_store.save(driver, self.username)
+        except Exception as e:
+            print(f"Could not save LinkedIn session: {str(e)}")
+            
     def login(self) -> bool:
         """Enhanced LinkedIn login method with multiple retry mechanisms"""
         max_attempts = 3
@@ -112,43 +427,15 @@ class LinkedInAutomation:
                         print(f"Failed to setup WebDriver (Attempt {attempt + 1})")
                         continue
                 
-                # Navigate to LinkedIn login
-                self.driver.get('https://www.linkedin.com/login')
-                
-                # Wait for username field with explicit wait
-                username_field = WebDriverWait(self.driver, 15).until(
-                    EC.presence_of_element_located((By.ID, "username"))
-                )
-                
-                # Clear and input username
-                username_field.clear()
-                username_field.send_keys(self.username)
-                
-                # Find and fill password field
-                password_field = self.driver.find_element(By.ID, "password")
-                password_field.clear()
-                password_field.send_keys(self.password)
-                
-                # Click login button with retry
-                login_button = self.driver.find_element(By.CSS_SELECTOR, "button[type='submit']")
-                login_button.click()
-                
-                # Wait for successful login with multiple checks
-                try:
-                    WebDriverWait(self.driver, 20).until(
-                        EC.presence_of_element_located((By.ID, "global-nav"))
-                    )
-                    print("Successfully logged in to LinkedIn")
+                if self._authenticate_driver(self.driver):
+                    self._measure_session(self.driver)
                     return True
                 
-                except TimeoutException:
-                    # Additional checks for login success
-                    current_url = self.driver.current_url
-                    if 'feed' in current_url or 'home' in current_url:
-                        print("Login successful (URL-based verification)")
-                        return True
-                    
-                    print(f"Login verification failed (Attempt {attempt + 1})")
+                print(f"Login verification failed (Attempt {attempt + 1})")
+                if self.last_login_outcome in ("challenge", "rate_limited", "circuit_open"):
+                    # Retrying into a checkpoint or past the limit only makes a lock more likely
+                    print(f"Not retrying login: {self.last_login_outcome.replace('_', ' ')}")
+                    break
             
             except Exception as e:
                 print(f"Login attempt {attempt + 1} failed: {str(e)}")
@@ -170,237 +457,592 @@ class LinkedInAutomation:
         print("Failed to log in to LinkedIn after multiple attempts")
         return False
         
+    def enable_driver_pool(self, size: int = 2, base_port: Optional[int] = None, health_check_interval: float = 30.0,
+                           wait: bool = True):
+        """
+        Keep a pool of warm, logged-in browser sessions for posting
+        
+        Args:
+            size: Number of Chrome sessions to keep warm
+            base_port: First remote debugging port; session i uses base_port + i. Defaults to the port
+                after debugging_port, so the pool never collides with the standalone driver
+            health_check_interval: Seconds between background health checks
+            wait: Block until every session is logged in
+            
+        Returns:
+            The started DriverPool
+        """
+        from driver_pool import DriverPool
+        
+        if self.driver_pool:
+            self.driver_pool.close()
+        
+        self.driver_pool = DriverPool(
+            self,
+            size=size,
+            base_port=self.debugging_port + 1 if base_port is None else base_port,
+            health_check_interval=health_check_interval
+        )
+        self.driver_pool.start(wait=wait)
+        return self.driver_pool
+        
+    def get_company_updates(self, limit: int = 10, company_id: Optional[str] = None) -> List[Dict]:
+        """
+        Recent posts of a company page via the REST API
+        
+        Args:
+            limit: Maximum posts to return
+            company_id: Company page; defaults to the one set with set_company_id
+            
+        Returns:
+            List of dicts with id, text, date and url, newest first
+        """
+        organization = self._api_organization(company_id)
+        updates = []
+        for post in self.api.get_posts(organization, count=limit):
+            published = post.get("publishedAt") or post.get("createdAt")
+            updates.append({
+                "id": post.get("id"),
+                "text": post.get("commentary", ""),
+                "date": datetime.fromtimestamp(published / 1000).isoformat() if published else None,
+                "state": post.get("lifecycleState"),
+                "url": f"{settings.linkedin_base_url}/feed/update/{post.get('id')}/"
+            })
+        return updates
+        
+    def get_post_analytics(self, post_id: str, company_id: Optional[str] = None) -> Dict:
+        """
+        Lifetime statistics for a company post via the REST API
+        
+        Args:
+            post_id: Post URN, or the numeric id of a share
+            company_id: Company page that published it; defaults to the one set with set_company_id
+            
+        Returns:
+            Dict of impressions, likes, comments, shares, clicks and engagement
+        """
+        post_urn = post_id if post_id.startswith('urn:li:') else f"urn:li:share:{post_id}"
+        return self.get_posts_analytics([post_urn], company_id)[post_urn]
+        
+    def get_posts_analytics(self, post_ids: List[str], company_id: Optional[str] = None) -> Dict[str, Dict]:
+        """
+        Lifetime statistics for several company posts in one request
+        
+        Args:
+            post_ids: Post URNs
+            company_id: Company page that published them; defaults to the one set with set_company_id
+            
+        Returns:
+            Statistics dict (as returned by get_post_analytics) per post URN
+        """
+        stats = self.api.get_share_statistics(self._api_organization(company_id), post_ids) if post_ids else {}
+        analytics = {}
+        for post_urn in post_ids:
+            counts = stats.get(post_urn, {})
+            analytics[post_urn] = {
+                "post_id": post_urn,
+                "impressions": counts.get("impressionCount", 0),
+                "unique_impressions": counts.get("uniqueImpressionsCount", 0),
+                "likes": counts.get("likeCount", 0),
+                "comments": counts.get("commentCount", 0),
+                "shares": counts.get("shareCount", 0),
+                "clicks": counts.get("clickCount", 0),
+                "engagement": counts.get("engagement", 0)
+            }
+        return analytics
+        
+    def get_follower_count(self, company_id: Optional[str] = None) -> int:
+        """Current follower count of a company page via the REST API"""
+        return self.api.get_follower_count(self._api_organization(company_id))
+        
+    def _api_organization(self, company_id: Optional[str]) -> str:
+        company_id = company_id or self.company_id
+        if not self.api:
+            raise LinkedInAPIError("LinkedIn API access is not configured; set LINKEDIN_ACCESS_TOKEN")
+        if not company_id:
+            raise ValueError("No company ID set")
+        return organization_urn(company_id)
+        
     def set_company_id(self, company_id: str):
         """Set the company ID for operations"""
         self.company_id = company_id
         
-    def generate_content_with_ai(self, prompt: str) -> str:
+    def generate_content_with_ai(self, prompt: str, fresh: bool = False) -> str:
         """
         Generate content using Groq's API
         
         Args:
             prompt: Content generation prompt
+            fresh: Skip the generation cache and request a new completion
             
         Returns:
             Generated content string
         """
-        try:
-            payload = {
-                "model": "mixtral-8x7b-32768",
-                "messages": [
-                    {
-                        "role": "system",
-                        "content": "You are a professional LinkedIn content writer. Create engaging, business-appropriate content that resonates with a professional audience. Focus on clarity, value, and maintaining a professional tone."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                "temperature": 0.7,
-                "max_tokens": 800,
-                "top_p": 1,
-                "stream": False
-            }
-
-            response = requests.post(
-                GROQ_API_URL,
-                headers=GROQ_HEADERS,
-                json=payload,
-                timeout=30
-            )
-
-            if response.status_code == 200:
-                result = response.json()
-                if result and "choices" in result and len(result["choices"]) > 0:
-                    return result["choices"][0]["message"]["content"]
-                else:
-                    print("No content in response:", result)
-                    return None
+        return self.generator.generate_content_with_ai(prompt, fresh)
+        
+    def generate_batch(self, topics: List[str], include_hashtags: bool = True, concurrency: int = 5,
+                       fresh: bool = False, progress: Optional[Callable] = None) -> List[Dict]:
+        """Generate drafts for many topics concurrently; see ContentGenerator.generate_batch"""
+        return self.generator.generate_batch(topics, include_hashtags, concurrency, fresh, progress)
+        
+    def stream_content_with_ai(self, prompt: str, fresh: bool = False) -> Iterator[str]:
+        """Yield generated content as it is produced; see ContentGenerator.stream_content_with_ai"""
+        return self.generator.stream_content_with_ai(prompt, fresh)
+        
+    def create_post(self, text: str, media_urls: Optional[List[str]] = None, drag_and_drop: bool = True,
+                    progress: Optional[Callable] = None, company_id: Optional[str] = None) -> Dict:
+        """
+        Create a new LinkedIn post using Selenium with advanced media handling
+        
+        Backends are tried in order: the REST API when configured, then the
+        browser. In the browser, a driver pool lends an already logged-in
+        session; otherwise the standalone driver is used.
+        
+        Args:
+            text: Post content
+            media_urls: Optional list of media URLs to attach
+            drag_and_drop: Whether to use drag and drop for image upload
+            progress: Optional callback receiving the name of each step as it starts
+            company_id: Company page to post as for this post only; defaults to set_company_id's
+            
+        Returns:
+            Dict indicating success/failure
+        """
+        company_id = company_id or self.company_id
+        target = company_id or "member"
+        claimed, entry = self.publish_ledger.begin(self.username, target, content_hash(text, media_urls))
+        if not claimed:
+            result = self._ledger_result(entry, text, company_id)
+            self._record_post(text, company_id, result)
+            return result
+        key = entry["key"] if entry else None
+        
+        limited = self._acquire_post_budget(media_urls)
+        if limited:
+            self.publish_ledger.failed(key, limited["error"])
+            limited["ledger_key"] = key
+            self._record_post(text, company_id, limited)
+            return limited
+        
+        for backend in self.backends:
+            def tracked(step, backend=backend):
+                # The Post click / publish request is the point of no return for retries
+                if step in SUBMIT_STEPS or step == SUBMIT_SIGNAL:
+                    self.publish_ledger.submitted(key, backend.name)
+                if progress and step != SUBMIT_SIGNAL:
+                    progress(step)
+            
+            start = time.perf_counter()
+            result = backend.create_post(text, media_urls, company_id, tracked, drag_and_drop)
+            result["backend"] = backend.name
+            self._record_post_outcome(result, media_urls)
+            
+            if result["success"] and result.get("confirmed") and not result.get("post_urn"):
+                result["post_urn"] = self._read_back_post_urn(text, company_id)
+            
+            if not result["success"]:
+                outcome = "failed"
             else:
-                print(f"API request failed with status code {response.status_code}")
-                print("Response:", response.text)
-                return None
-
-        except requests.exceptions.RequestException as e:
-            print(f"Network error while generating content: {str(e)}")
+                outcome = "confirmed" if result.get("confirmed") else "unconfirmed"
+            metrics.increment("linkedin_posts_total", outcome=outcome, backend=backend.name)
+            metrics.observe("linkedin_post_duration_seconds", time.perf_counter() - start,
+                            outcome=outcome, backend=backend.name)
+            
+            # Only fall back when the post certainly wasn't published, so it can't appear twice
+            if result["success"] or result.get("published") is not False:
+                break
+            print(f"Posting via {backend.name} failed ({result.get('error')}); trying the next backend")
+            self.publish_ledger.reopen(key)
+        
+        if result["success"] and result.get("confirmed"):
+            self.publish_ledger.confirmed(key, result["backend"], result.get("post_urn"))
+        elif result.get("published") is False:
+            self.publish_ledger.failed(key, result.get("error"))
+        else:
+            current = self.publish_ledger.get(key) if key else None
+            if current and current["state"] == "pending":
+                # Failed before anything was sent
+                self.publish_ledger.failed(key, result.get("error"))
+            else:
+                self.publish_ledger.unresolved(key, result.get("error") or result.get("message"))
+        result["ledger_key"] = key
+        
+        self._record_post(text, company_id, result)
+        return result
+        
+    def _acquire_post_budget(self, media_urls: Optional[List[str]]) -> Optional[Dict]:
+        """Wait for post and media upload slots; a failed result if they don't come in time"""
+        actions = [("post", 1)]
+        if media_urls:
+            actions.append(("media_upload", len(media_urls)))
+        for action, tokens in actions:
+            if not self.rate_controller.acquire(self.username, action, tokens, timeout=self.rate_limit_wait):
+                wait = self.rate_controller.wait_time(self.username, action, tokens)
+                return {
+                    "success": False,
+                    "published": False,
+                    "rate_limited": True,
+                    "error": f"{action.replace('_', ' ').capitalize()} rate limit reached; next slot in {wait:.0f}s",
+                    "media_count": len(media_urls) if media_urls else 0
+                }
+        return None
+        
+    def _record_post_outcome(self, result: Dict, media_urls: Optional[List[str]]):
+        """Feed a posting result to the adaptive post and media upload limits"""
+        if result["success"]:
+            outcome = "ok"
+        elif result.get("challenge"):
+            outcome = "challenge"
+        else:
+            outcome = self._failure_outcome(result.get("error"), result.get("status_code"))
+        self.rate_controller.record(self.username, "post", outcome, result.get("elapsed"))
+        if not media_urls:
+            return
+        upload_seconds = (result.get("timings") or {}).get("media_upload")
+        if result.get("media_error"):
+            # The post went out but some media didn't; that is the upload limit's signal, not the post's
+            self.rate_controller.record(self.username, "media_upload",
+                                        self._failure_outcome(result["media_error"], None), upload_seconds)
+        elif outcome != "error" or result.get("failed_step") == "media_upload":
+            self.rate_controller.record(self.username, "media_upload", outcome, upload_seconds)
+        
+    @staticmethod
+    def _failure_outcome(error: Optional[str], status_code: Optional[int]) -> str:
+        """throttled when a failure looks like LinkedIn pushing back, error otherwise"""
+        error = (error or "").lower()
+        throttled = status_code in (429, 999) or "429" in error or "too many requests" in error or "throttl" in error
+        return "throttled" if throttled else "error"
+        
+    def _ledger_result(self, entry: Dict, text: str, company_id: Optional[str]) -> Dict:
+        """Answer a repeated post from the publish ledger instead of posting again"""
+        base = {"duplicate": True, "ledger_key": entry["key"], "ledger_state": entry["state"],
+                "backend": entry["backend"], "media_count": 0}
+        if entry["state"] == "submitted" and \
+                time.time() - datetime.fromisoformat(entry["updated_at"]).timestamp() > self.publish_ledger.pending_timeout:
+            # An attempt died after sending; look for the post before declaring anything
+            post_urn = self._read_back_post_urn(text, company_id)
+            if post_urn:
+                self.publish_ledger.confirmed(entry["key"], entry["backend"], post_urn)
+                entry = {**entry, "state": "confirmed", "post_urn": post_urn}
+                base["ledger_state"] = "confirmed"
+        
+        if entry["state"] == "confirmed":
+            return {**base, "success": True, "confirmed": True, "post_urn": entry["post_urn"],
+                    "message": "Already published; not posting again"}
+        if entry["state"] == "submitted":
+            return {**base, "success": False, "published": None,
+                    "error": "An earlier attempt sent this post without confirmation; not posting again. "
+                             "If it never appeared on LinkedIn, clear the publish ledger entry to retry"}
+        return {**base, "success": False, "published": None,
+                "error": "The same post is already being published"}
+        
+    def _read_back_post_urn(self, text: str, company_id: Optional[str]) -> Optional[str]:
+        """URN of a just-published company post, found among the page's latest posts via the API"""
+        if not self.api or not company_id:
             return None
+        try:
+            for update in self.get_company_updates(limit=10, company_id=company_id):
+                if (update.get("text") or "").strip() == text.strip():
+                    return update["id"]
         except Exception as e:
-            print(f"Error generating content: {str(e)}")
-            return None
+            print(f"Could not read back the published post: {str(e)}")
+        return None
+        
+    def _record_post(self, text: str, company_id: Optional[str], result: Dict):
+        preview = text[:100] + "..." if len(text) > 100 else text
+        if result.get("duplicate"):
+            title = "Duplicate post skipped"
+            description = preview
+        elif result["success"]:
+            title = "Post published" if result.get("confirmed") else "Post submitted"
+            description = preview
+        else:
+            title = "Post failed"
+            description = result.get("error") or preview
+        self.activity_log.record(
+            "post",
+            title,
+            description,
+            account=self.username,
+            status="skipped" if result.get("duplicate") else "ok" if result["success"] else "failed",
+            backend=result.get("backend"),
+            company_id=company_id,
+            post_urn=result.get("post_urn"),
+            media_count=result.get("media_count", 0),
+            media_error=result.get("media_error"),
+            elapsed=result.get("elapsed")
+        )
         
-    def create_post(self, text: str, media_urls: Optional[List[str]] = None, drag_and_drop: bool = True) -> Dict:
+    def _post_with_session(self, text: str, media_urls: Optional[List[str]], drag_and_drop: bool,
+                           progress: Optional[Callable], company_id: Optional[str]) -> Dict:
         """
-        Create a new LinkedIn post using Selenium with advanced media handling
+        Run the posting flow on a pooled session or the standalone driver
+        
+        The composer breaker fails posts fast while the flow keeps breaking,
+        e.g. after a LinkedIn layout change, instead of letting each one run
+        into its step timeouts.
+        """
+        media_count = len(media_urls) if media_urls else 0
+        breaker = self.breakers["linkedin_composer"]
+        try:
+            breaker.allow()
+        except CircuitOpenError as e:
+            print(f"Not posting: {str(e)}")
+            return {"success": False, "published": False, **e.to_dict(), "media_count": media_count}
+        
+        prepared_media = self._prepare_media(media_urls, progress) if media_urls else None
+        
+        if self.driver_pool:
+            try:
+                with self.driver_pool.lease() as driver:
+                    result = self._create_post_with_driver(driver, text, media_urls, drag_and_drop, progress,
+                                                           company_id, prepared_media)
+                    if result.get("error_type") in UNHEALTHY_SESSION_ERRORS:
+                        self.driver_pool.mark_unhealthy(driver)
+            except Exception as e:
+                print(f"Error leasing WebDriver session: {str(e)}")
+                breaker.release()
+                error = classify_browser_error(e)
+                return {"success": False, "published": False, **error.to_dict(), "media_count": media_count}
+        else:
+            if not self.driver and not self.login():
+                breaker.release()
+                error = self.last_login_error or LoginFailedError("Failed to login to LinkedIn")
+                return {
+                    "success": False,
+                    "published": False,
+                    **error.to_dict(),
+                    "error": f"Failed to login to LinkedIn: {str(error)}",
+                    "media_count": media_count
+                }
+            
+            driver = self.driver
+            result = self._create_post_with_driver(driver, text, media_urls, drag_and_drop, progress, company_id,
+                                                   prepared_media)
+            if not (result.get("reused") or {}).get("page", True):
+                # Only a fresh page load changes the footprint enough to be worth measuring
+                self._measure_session(driver)
+            if result.get("error_type") == "session_expired":
+                # Log in again on the next post rather than reusing the logged-out browser
+                driver.quit()
+                self.driver = None
+        
+        if result["success"]:
+            breaker.record_success()
+        else:
+            breaker.record_failure(error_from_result(result))
+        return result
+        
+    def _create_post_with_driver(self, driver, text: str, media_urls: Optional[List[str]] = None,
+                                 drag_and_drop: bool = True, progress: Optional[Callable] = None,
+                                 company_id: Optional[str] = None, prepared_media: Optional[Dict] = None) -> Dict:
+        """
+        Run the post creation flow on a logged-in driver
+        
+        Each step waits on a page condition rather than a fixed sleep, bounded
+        by the step's timeout budget, and its duration is reported in "timings".
         
         Args:
+            driver: Logged-in WebDriver session
             text: Post content
             media_urls: Optional list of media URLs to attach
             drag_and_drop: Whether to use drag and drop for image upload
+            progress: Optional callback receiving the name of each step as it starts
+            company_id: Company page to post as, or None to post as the member
+            prepared_media: _prepare_media() result for media_urls; prepared here if omitted
             
         Returns:
             Dict indicating success/failure
         """
+        from selenium.common.exceptions import TimeoutException
+        
+        timer = StepTimer(driver, self.step_budgets, on_step=progress)
+        editor = self.selectors.locator("post_editor")
+        preview = self.selectors.locator("media_preview")
+        trigger = self.selectors.locator("start_post_button")
+        toggle = self.selectors.locator("actor_toggle")
+        toast = self.selectors.locator("post_toast")
+        page = f"company:{company_id}" if company_id else "feed"
+        reused = {"page": False, "actor": False}
         try:
-            if not self.driver:
-                if not self.login():
-                    raise Exception("Failed to login to LinkedIn")
-            
-            # Navigate to posting interface
-            if self.company_id:
-                self.driver.get(f'https://www.linkedin.com/company/{self.company_id}/admin/')
-                time.sleep(3)
-            else:
-                self.driver.get('https://www.linkedin.com/feed/')
-                time.sleep(3)
+            # Navigate to posting interface and wait for the start post button,
+            # unless the driver is still on that page from the previous post
+            with timer.measure("navigation"):
+                reused["page"] = self.composer_tracker.page_ready(driver, page, trigger, editor)
+                if not reused["page"]:
+                    self._open_composer_page(driver, page, company_id)
+                start_post_button = timer.wait("navigation", element_clickable(trigger), "start post button")
             
-            # Click on start post button
-            start_post_button = WebDriverWait(self.driver, 10).until(
-                EC.element_to_be_clickable((By.CSS_SELECTOR, "button[class*='share-box-feed-entry__trigger']"))
-            )
-            start_post_button.click()
-            time.sleep(2)
+            # Open the composer
+            with timer.measure("composer_open"):
+                start_post_button.click()
+                try:
+                    timer.wait("composer_open", composer_ready(editor), "post editor")
+                except TimeoutException:
+                    if not reused["page"]:
+                        raise
+                    # The reused page stopped responding; reload it and try once more
+                    print("Reused composer page did not open the editor, reloading")
+                    self.composer_tracker.reset(driver)
+                    reused["page"] = False
+                    self._open_composer_page(driver, page, company_id)
+                    timer.wait("composer_open", element_clickable(trigger), "start post button").click()
+                    timer.wait("composer_open", composer_ready(editor), "post editor")
             
             # Switch to company account if needed
-            if self.company_id:
-                try:
-                    posting_as_button = WebDriverWait(self.driver, 5).until(
-                        EC.element_to_be_clickable((By.CSS_SELECTOR, "button[class*='share-actor-toggle']"))
-                    )
-                    posting_as_button.click()
-                    time.sleep(1)
-                    
-                    company_option = WebDriverWait(self.driver, 5).until(
-                        EC.element_to_be_clickable((By.CSS_SELECTOR, f"div[data-company-id='{self.company_id}']"))
-                    )
-                    company_option.click()
-                    time.sleep(1)
-                except Exception as e:
-                    print(f"Warning: Could not switch to company account: {str(e)}")
-            
-            # Find post textarea
-            post_textarea = WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "div[data-placeholder='What do you want to talk about?']"))
-            )
+            if company_id:
+                company_option = self.selectors.locator("company_option", company_id=company_id)
+                reused["actor"] = self.composer_tracker.actor_ready(driver, company_id, toggle)
+                if not reused["actor"]:
+                    try:
+                        with timer.measure("company_switch"):
+                            posting_as_button = timer.wait("company_switch", element_clickable(toggle))
+                            posting_as_button.click()
+                            
+                            timer.wait("company_switch", element_clickable(company_option)).click()
+                            timer.wait("company_switch", element_absent(company_option))
+                        self.composer_tracker.actor_switched(driver, company_id, toggle)
+                    except Exception as e:
+                        print(f"Warning: Could not switch to company account: {str(e)}")
             
-            # Set post text using JavaScript
-            self.driver.execute_script(
-                "arguments[0].innerHTML = arguments[1];", 
-                post_textarea,
-                text.replace('\n', '<br>')
-            )
-            time.sleep(1)
+            # Set post text using JavaScript and notify the editor so the Post button enables
+            with timer.measure("text_injection"):
+                post_textarea = timer.wait("text_injection", composer_ready(editor), "post editor")
+                driver.execute_script(
+                    "arguments[0].innerHTML = arguments[1];"
+                    "arguments[0].dispatchEvent(new Event('input', {bubbles: true}));",
+                    post_textarea,
+                    text.replace('\n', '<br>')
+                )
             
             # Advanced Media Upload
+            media_bytes_saved = 0
+            media_uploaded = 0
+            media_error = None
             if media_urls and len(media_urls) > 0:
-                try:
-                    # Prepare a temporary directory for downloads
-                    temp_dir = os.path.join(os.getcwd(), 'temp_linkedin_uploads')
-                    os.makedirs(temp_dir, exist_ok=True)
-                    
-                    # Download and prepare media files
-                    media_files = []
-                    for i, url in enumerate(media_urls):
-                        try:
-                            # Download image
-                            response = requests.get(url)
-                            if response.status_code == 200:
-                                # Save with unique filename
-                                file_ext = os.path.splitext(url.split('/')[-1])[-1] or '.jpg'
-                                temp_file = os.path.join(temp_dir, f'linkedin_media_{i}{file_ext}')
-                                
-                                with open(temp_file, 'wb') as f:
-                                    f.write(response.content)
-                                media_files.append(temp_file)
-                        except Exception as download_err:
-                            print(f"Error downloading media {url}: {download_err}")
-                    
-                    # Media Upload Methods
-                    if drag_and_drop:
-                        # Drag and Drop Method
-                        media_button = WebDriverWait(self.driver, 5).until(
-                            EC.presence_of_element_located((By.CSS_SELECTOR, "button[aria-label*='Add media']"))
-                        )
-                        media_button.click()
-                        time.sleep(1)
+                if prepared_media is None:
+                    prepared_media = self._prepare_media(media_urls, progress)
+                media_files = [media["path"] for media in prepared_media["files"]]
+                media_types = [media["mime_type"] for media in prepared_media["files"]]
+                media_bytes_saved = prepared_media["bytes_saved"]
+                media_error = prepared_media["error"]
+                # Nothing to attach when every download failed; don't leave the media dialog open
+                if media_files:
+                    try:
+                        with timer.measure("media_upload"):
+                            media_button = timer.wait(
+                                "media_upload",
+                                element_clickable(self.selectors.locator("add_media_button")),
+                                "add media button"
+                            )
+                            media_button.click()
                         
-                        # Find the drop zone
-                        drop_zone = WebDriverWait(self.driver, 5).until(
-                            EC.presence_of_element_located((By.CSS_SELECTOR, "div[class*='file-upload-input']"))
-                        )
-                        
-                        # Use JavaScript to simulate drag and drop
-                        for media_file in media_files:
-                            # Create a file list for drag and drop
-                            file_list = self.driver.execute_script("""
-                                var files = new DataTransfer();
-                                files.items.add(new File([''], arguments[0], {type: 'image/jpeg'}));
-                                return files.files;
-                            """, media_file)
+                            # Media Upload Methods
+                            if drag_and_drop:
+                                # Drag and Drop Method: find the drop zone
+                                drop_zone = timer.wait(
+                                    "media_upload",
+                                    element_present(self.selectors.locator("media_drop_zone")),
+                                    "drop zone"
+                                )
                             
-                            # Simulate drag and drop
-                            self.driver.execute_script("""
-                                var event = new DragEvent('drop', {
-                                    bubbles: true,
-                                    cancelable: true,
-                                    dataTransfer: arguments[0]
-                                });
-                                arguments[1].dispatchEvent(event);
-                            """, file_list, drop_zone)
+                                # Use JavaScript to simulate drag and drop
+                                files = zip(media_files, media_types)
+                                for uploaded, (media_file, media_type) in enumerate(files, start=1):
+                                    with metrics.timer("linkedin_media_upload_seconds", method="drag_and_drop"):
+                                        # Create a file list for drag and drop
+                                        file_list = driver.execute_script("""
+                                            var files = new DataTransfer();
+                                            files.items.add(new File([''], arguments[0], {type: arguments[1]}));
+                                            return files.files;
+                                        """, media_file, media_type)
+                                
+                                        # Simulate drag and drop
+                                        driver.execute_script("""
+                                            var event = new DragEvent('drop', {
+                                                bubbles: true,
+                                                cancelable: true,
+                                                dataTransfer: arguments[0]
+                                            });
+                                            arguments[1].dispatchEvent(event);
+                                        """, file_list, drop_zone)
+                                
+                                        # Wait until this file's preview is rendered
+                                        timer.wait("media_upload", uploads_finished(preview, uploaded), "media preview")
+                                    media_uploaded = uploaded
+                            else:
+                                # Traditional File Input Method
+                                file_input = timer.wait(
+                                    "media_upload",
+                                    element_present(self.selectors.locator("media_file_input")),
+                                    "file input"
+                                )
                             
-                            time.sleep(2)
-                    else:
-                        # Traditional File Input Method
-                        media_button = WebDriverWait(self.driver, 5).until(
-                            EC.presence_of_element_located((By.CSS_SELECTOR, "button[aria-label*='Add media']"))
-                        )
-                        media_button.click()
-                        time.sleep(1)
-                        
-                        # Find file input
-                        file_input = self.driver.find_element(By.CSS_SELECTOR, "input[type='file']")
-                        
-                        # Send files
-                        file_paths = '\n'.join(media_files)
-                        file_input.send_keys(file_paths)
-                        time.sleep(3)
-                    
-                    # Verify media upload
-                    WebDriverWait(self.driver, 10).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, "img[class*='share-mixed-media-image']"))
-                    )
-                    
-                    # Clean up temporary files
-                    for media_file in media_files:
-                        try:
-                            os.remove(media_file)
-                        except Exception as cleanup_err:
-                            print(f"Error cleaning up {media_file}: {cleanup_err}")
-                    
-                except Exception as media_err:
-                    print(f"Media upload error: {media_err}")
+                                # Send files
+                                file_paths = '\n'.join(media_files)
+                                with metrics.timer("linkedin_media_upload_seconds", method="file_input"):
+                                    file_input.send_keys(file_paths)
+                                
+                                    # Verify media upload
+                                    timer.wait("media_upload", uploads_finished(preview, len(media_files)),
+                                               "media preview")
+                                media_uploaded = len(media_files)
+                    except Exception as media_err:
+                        # The post goes out without the missing media; the result says so
+                        print(f"Media upload error: {media_err}")
+                        media_error = str(media_err)
             
             # Post button
-            post_button = WebDriverWait(self.driver, 10).until(
-                EC.element_to_be_clickable((By.CSS_SELECTOR, "button[class*='share-actions__primary-action']"))
-            )
-            post_button.click()
+            with timer.measure("post_confirmation"):
+                post_button = timer.wait(
+                    "post_confirmation",
+                    element_clickable(self.selectors.locator("post_button")),
+                    "post button"
+                )
+                if progress:
+                    progress(SUBMIT_SIGNAL)
+                post_button.click()
+                
+                # Wait for the confirmation toast or the composer to close
+                try:
+                    timer.wait(
+                        "post_confirmation",
+                        post_confirmed(editor, toast),
+                        "post confirmation"
+                    )
+                    confirmed = True
+                except TimeoutException as confirm_err:
+                    print(f"Warning: {confirm_err}")
+                    confirmed = False
             
-            # Wait for post confirmation
-            time.sleep(5)
+            post_urn = None
+            if confirmed:
+                post_urn = wait_for_post_urn(driver, toast)
+            else:
+                # The composer may still be open; start from a fresh page next time
+                self.composer_tracker.reset(driver)
             
             return {
                 "success": True, 
-                "message": "Post created successfully", 
-                "media_count": len(media_urls) if media_urls else 0
+                "message": "Post created successfully" if confirmed else "Post submitted; confirmation not detected",
+                "confirmed": confirmed,
+                "post_urn": post_urn,
+                "media_count": media_uploaded,
+                "media_error": media_error,
+                "media_bytes_saved": media_bytes_saved,
+                "reused": reused,
+                "timings": {**(prepared_media or {}).get("timings", {}), **timer.report()},
+                "elapsed": round(timer.elapsed, 3)
             }
             
         except Exception as e:
             print(f"Error creating LinkedIn post: {str(e)}")
+            self.composer_tracker.reset(driver)
+            error = classify_browser_error(e, driver)
             # Take a screenshot for debugging
             try:
                 screenshot_path = os.path.join(os.getcwd(), 'linkedin_post_error.png')
-                self.driver.save_screenshot(screenshot_path)
+                driver.save_screenshot(screenshot_path)
                 print(f"Error screenshot saved to {screenshot_path}")
             except Exception as screenshot_err:
                 print(f"Could not save error screenshot: {screenshot_err}")
@@ -408,37 +1050,117 @@ class LinkedInAutomation:
             return {
                 "success": False, 
                 "error": str(e),
-                "media_count": len(media_urls) if media_urls else 0
+                "error_type": error.kind,
+                "retryable": error.retryable,
+                "failed_step": timer.failed_step,
+                "challenge": error.kind == "challenge",
+                "media_count": len(media_urls) if media_urls else 0,
+                "timings": {**(prepared_media or {}).get("timings", {}), **timer.report()},
+                "elapsed": round(timer.elapsed, 3)
             }
         
-    def generate_and_post(self, topic: str, include_hashtags: bool = True) -> Dict:
+    def _prepare_media(self, media_urls: List[str], progress: Optional[Callable] = None) -> Dict:
+        """
+        Download and process a post's media before a browser is involved
+        
+        Runs before a pooled session is leased or the standalone driver logs
+        in, so slow downloads never hold a browser or an open composer.
+        
+        Returns:
+            Dict with files (path and mime_type), bytes_saved, error (None if every file is ready) and timings
+        """
+        timer = StepTimer(None, self.step_budgets, on_step=progress)
+        prepared = {"files": [], "bytes_saved": 0, "error": None, "timings": {}}
+        try:
+            # Download media in parallel, reusing cached copies of assets seen before
+            with timer.measure("media_download"):
+                downloaded = [path for path in self.media_fetcher.fetch_all(media_urls) if path]
+            
+            # Downscale, recompress and drop duplicate images
+            with timer.measure("media_processing"):
+                processed = self.media_processor.process_all(downloaded)
+            prepared["files"] = processed["files"]
+            prepared["bytes_saved"] = processed["bytes_saved"]
+            print(f"Prepared {len(processed['files'])} media file(s), saved {processed['bytes_saved']} bytes "
+                  f"({processed['duplicates']} duplicate(s) dropped)")
+            if len(downloaded) < len(media_urls):
+                prepared["error"] = f"{len(media_urls) - len(downloaded)} of {len(media_urls)} media downloads failed"
+        except Exception as e:
+            print(f"Media preparation error: {str(e)}")
+            prepared["error"] = str(e)
+        prepared["timings"] = timer.report()
+        return prepared
+        
+    def _open_composer_page(self, driver, page: str, company_id: Optional[str]):
+        """Load the page posts are composed on and record it with the composer tracker"""
+        if company_id:
+            driver.get(f'{settings.linkedin_base_url}/company/{company_id}/admin/')
+        else:
+            driver.get(f'{settings.linkedin_base_url}/feed/')
+        self.composer_tracker.navigated(driver, page)
+        
+    def schedule_post(self, text: str, schedule_time: datetime, media_urls: Optional[List[str]] = None) -> Dict:
+        """
+        Queue a post for the scheduler worker to publish later
+        
+        Args:
+            text: Post content
+            schedule_time: When to publish the post
+            media_urls: Optional list of media URLs to attach
+            
+        Returns:
+            Dict describing the queued post
+        """
+        if not self.post_queue:
+            from scheduler import PostQueue
+            self.post_queue = PostQueue.from_env()
+        
+        if schedule_time <= datetime.now():
+            raise ValueError("Schedule time must be in the future")
+        
+        post = self.post_queue.enqueue(
+            text=text,
+            schedule_time=schedule_time,
+            media_urls=media_urls,
+            company_id=self.company_id
+        )
+        self.activity_log.record(
+            "schedule",
+            "Post scheduled",
+            f"For {schedule_time.strftime('%Y-%m-%d %H:%M')}: {text[:80]}",
+            account=self.username,
+            scheduled_post_id=post["id"]
+        )
+        return post
+        
+    def generate_and_post(self, topic: str, include_hashtags: bool = True, fresh: bool = False) -> Dict:
         """
         Generate content using AI and post it to LinkedIn
         
         Args:
             topic: Topic to generate content about
             include_hashtags: Whether to include relevant hashtags
+            fresh: Skip the generation cache and request a new completion
             
         Returns:
             Dict with results
         """
         try:
             # Generate the content
-            prompt = f"Write a professional LinkedIn post about {topic}"
-            if include_hashtags:
-                prompt += " Include 3-5 relevant hashtags at the end."
-                
-            content = self.generate_content_with_ai(prompt)
+            prompt = self.generator.topic_prompt(topic, include_hashtags)
+            content = self.generator.generate(prompt, fresh=fresh)
             if not content:
                 raise Exception("Failed to generate content")
             
             print("Generated content successfully")
             print("Content preview:", content[:100] + "..." if len(content) > 100 else content)
+            self.activity_log.record("generation", "Content generated", f"Topic: {topic}",
+                                     account=self.username, characters=len(content))
             
             # Create the post
             result = self.create_post(content)
             if not result.get("success"):
-                raise Exception(f"Failed to create LinkedIn post: {result.get('error')}")
+                raise error_from_result({**result, "error": f"Failed to create LinkedIn post: {result.get('error')}"})
             
             print("Successfully posted to LinkedIn")
             return {
@@ -450,14 +1172,34 @@ class LinkedInAutomation:
         except Exception as e:
             error_msg = str(e)
             print(f"Error in generate_and_post: {error_msg}")
-            return {
+            if 'content' not in locals() or not content:
+                self.activity_log.record("generation", "Generation failed", error_msg,
+                                         account=self.username, status="failed", topic=topic)
+            failure = {
                 "success": False,
                 "error": error_msg,
                 "content": content if 'content' in locals() else None
             }
+            if isinstance(e, AutomationError):
+                failure.update(error_type=e.kind, retryable=e.retryable)
+            return failure
     
-    def close(self):
-        """Close the browser session"""
+    def close_sessions(self):
+        """Quit the standalone browser and any pooled sessions, leaving shared clients open"""
+        if self.driver_pool:
+            self.driver_pool.close()
+            self.driver_pool = None
         if self.driver:
+            self._save_session(self.driver)
             self.driver.quit()
-            self.driver = None
\ No newline at end of file
+            self.driver = None
+        
+    def close(self):
+        """Close the browser session, any pooled sessions and HTTP clients"""
+        self.close_sessions()
+        self.generator.close()
+        if self.api:
+            self.api.close()
+        self.media_fetcher.close()
+        self.media_processor.close()
+        self.activity_log.close()
\ No newline at end of file
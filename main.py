@@ -1,18 +1,26 @@
-from flask import Flask, render_template, request, jsonify, redirect, url_for, flash
+from flask import Flask, render_template, request, jsonify, redirect, url_for, flash, Response, stream_with_context
 from flask_login import LoginManager, UserMixin, login_user, login_required, logout_user, current_user
 from werkzeug.security import generate_password_hash, check_password_hash
 import os
+import json
+from datetime import datetime
 from linkedin_manager import LinkedInAutomation
-from dotenv import load_dotenv
+from errors import AutomationError
+from session_store import SessionStore
+from scheduler import PostQueue
+from jobs import JobManager, QueueFullError
+from accounts import AccountRegistry, AccountRouter, check_pool_size
+from analytics import AnalyticsStore, AnalyticsRefresher, EXPORT_FIELDS, HISTORY_EXPORT_FIELDS
+import rollups
+import publish_ledger
+import metrics
+from settings import settings
 
-# Load environment variables
-load_dotenv()
-
-# Get environment variables
-LINKEDIN_USERNAME = os.getenv('LINKEDIN_USERNAME')
-LINKEDIN_PASSWORD = os.getenv('LINKEDIN_PASSWORD')
-COMPANY_ID = os.getenv('COMPANY_ID')
-GROQ_API_KEY = os.getenv('GROQ_API_KEY')
+# Get environment variables (settings loads .env on first read)
+LINKEDIN_USERNAME = settings.linkedin_username
+LINKEDIN_PASSWORD = settings.linkedin_password
+COMPANY_ID = settings.company_id
+GROQ_API_KEY = settings.groq_api_key
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = os.getenv('FLASK_SECRET_KEY', 'default-secret-key')
@@ -25,12 +33,53 @@ login_manager.login_view = 'login'
 # Initialize LinkedIn Automation
 linkedin = LinkedInAutomation(
     linkedin_username=LINKEDIN_USERNAME,
-    linkedin_password=LINKEDIN_PASSWORD
+    linkedin_password=LINKEDIN_PASSWORD,
+    debugging_port=settings.debugging_port,
+    session_store=SessionStore.from_env()
 )
 
 if COMPANY_ID:
     linkedin.set_company_id(COMPANY_ID)
 
+# Every configured account gets its own worker; ACCOUNTS_FILE lists them, else the single account above.
+# Accounts get debugging ports outside the blocks of the main automation and the scheduler worker.
+accounts = AccountRegistry.from_env(reserved=[
+    (linkedin.debugging_port, LINKEDIN_USERNAME),
+    (settings.scheduler_debugging_port, None, 1)
+])
+
+# Browser work runs on background jobs, one at a time per LinkedIn account
+jobs = JobManager(max_workers=int(os.getenv('JOB_WORKERS', str(max(4, len(accounts))))))
+router = AccountRouter(accounts, jobs, linkedin)
+
+# Scheduled posts are published by the separate worker: python scheduler.py
+post_queue = PostQueue.from_env()
+linkedin.post_queue = post_queue
+
+def analytics_source(company_id):
+    """The automation whose account manages a company, falling back to the main one"""
+    account = accounts.for_company(company_id)
+    # Analytics only reads the REST API, so this must not start the account's browser pool
+    return router.automation(account.key, enable_pool=False) if account else linkedin
+
+# Dashboards read the local analytics store; a background thread keeps it fresh from the LinkedIn API
+analytics_store = AnalyticsStore.from_env()
+analytics_companies = {company_id for account in accounts.list() for company_id in account.company_ids}
+if COMPANY_ID:
+    analytics_companies.add(COMPANY_ID)
+analytics_refresher = AnalyticsRefresher(
+    analytics_store,
+    analytics_source,
+    sorted(analytics_companies),
+    interval=float(os.getenv('ANALYTICS_REFRESH_INTERVAL', '300'))
+).start()
+
+# Keep warm, logged-in browser sessions for posting when configured
+DRIVER_POOL_SIZE = int(os.getenv('DRIVER_POOL_SIZE', '0'))
+check_pool_size(DRIVER_POOL_SIZE, "DRIVER_POOL_SIZE")
+if DRIVER_POOL_SIZE > 0:
+    linkedin.enable_driver_pool(size=DRIVER_POOL_SIZE, wait=False)
+
 # Simple user model
 class User(UserMixin):
     def __init__(self, id, username, password_hash):
@@ -82,13 +131,77 @@ def create_post():
         media_urls = [url.strip() for url in media_urls if url.strip()]
         
         try:
-            response = linkedin.create_post(text=text, media_urls=media_urls if media_urls else None)
-            flash('Post created successfully!')
+            job = submit_post_job(text, media_urls, request.form.get('account'), request.form.get('company_id'))
+            flash(f'Post queued for publishing (job {job.id})')
         except Exception as e:
             flash(f'Error creating post: {str(e)}')
             
     return render_template('create_post.html')
 
+def submit_post_job(text, media_urls, account=None, company_id=None):
+    return router.submit_post(
+        text,
+        media_urls=media_urls if media_urls else None,
+        account=account or None,
+        company_id=company_id or None
+    )
+
+@app.route('/api/posts', methods=['POST'])
+@login_required
+def api_create_post():
+    data = request.get_json(silent=True) or request.form
+    text = data.get('text')
+    if not text:
+        return jsonify({'error': 'text is required'}), 400
+    
+    media_urls = data.get('media_urls') or []
+    if isinstance(media_urls, str):
+        media_urls = media_urls.split(',')
+    media_urls = [url.strip() for url in media_urls if url.strip()]
+    
+    try:
+        job = submit_post_job(text, media_urls, data.get('account'), data.get('company_id'))
+    except QueueFullError as e:
+        return jsonify({'error': str(e)}), 429
+    except (KeyError, ValueError) as e:
+        return jsonify({'error': str(e.args[0]) if e.args else str(e)}), 400
+    
+    return jsonify({
+        'job_id': job.id,
+        'status': job.status,
+        'status_url': url_for('job_status', job_id=job.id),
+        'events_url': url_for('job_events', job_id=job.id)
+    }), 202
+
+@app.route('/api/accounts')
+@login_required
+def list_accounts():
+    return jsonify({'accounts': router.stats()})
+
+@app.route('/api/jobs/<job_id>')
+@login_required
+def job_status(job_id):
+    job = jobs.get(job_id)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job.to_dict())
+
+@app.route('/api/jobs/<job_id>/events')
+@login_required
+def job_events(job_id):
+    if not jobs.get(job_id):
+        return jsonify({'error': 'Job not found'}), 404
+    
+    def stream():
+        for event in jobs.events(job_id):
+            if event is None:
+                yield ': keep-alive\n\n'
+            else:
+                yield f'data: {json.dumps(event)}\n\n'
+    
+    return Response(stream_with_context(stream()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
 @app.route('/generate_content', methods=['GET', 'POST'])
 @login_required
 def generate_content():
@@ -98,6 +211,7 @@ def generate_content():
         include_cta = request.form.get('include_cta') == 'true'
         tone = request.form.get('tone', 'professional')
         content_type = request.form.get('content_type', 'post')
+        fresh = request.form.get('fresh') == 'true'
         
         try:
             # Construct a more detailed prompt
@@ -109,12 +223,15 @@ def generate_content():
             if include_cta:
                 prompt += " Add a clear call-to-action at the end."
             
+            # Stream tokens to the browser as Groq produces them
+            if request.form.get('stream') == 'true':
+                return stream_generated_content(prompt, fresh)
+            
             # Generate content with AI
-            content = linkedin.generate_content_with_ai(prompt)
+            content = linkedin.generator.generate(prompt, fresh=fresh)
             
             # Try to parse the content if it's a JSON string
             try:
-                import json
                 content_dict = json.loads(content)
                 # Extract the content, preferring a 'text' or 'content' key
                 generated_content = content_dict.get('text') or content_dict.get('content') or content
@@ -128,11 +245,176 @@ def generate_content():
             
             return jsonify({'content': generated_content})
         
+        except AutomationError as e:
+            return automation_error_response(e)
         except Exception as e:
             return jsonify({'error': str(e)}), 400
     
     return render_template('generate_content.html')
 
+def automation_error_response(error):
+    """JSON error for a typed failure; quota and retryable errors tell clients when to come back"""
+    if error.kind == 'quota':
+        status = 429
+    elif error.retryable:
+        status = 503
+    else:
+        status = 400
+    response = jsonify(error.to_dict())
+    response.status_code = status
+    if error.retry_after:
+        response.headers['Retry-After'] = str(max(1, int(round(error.retry_after))))
+    return response
+
+def stream_generated_content(prompt, fresh=False):
+    tokens = linkedin.stream_content_with_ai(prompt, fresh=fresh)
+    
+    # Pull the first token before responding so setup errors still come back as JSON
+    first_token = next(tokens, '')
+    
+    def relay():
+        yield first_token
+        try:
+            for token in tokens:
+                yield token
+        except AutomationError as e:
+            print(f"Error streaming content: {str(e)}")
+            yield "\n\n[Generation interrupted. Please try again.]"
+    
+    return Response(stream_with_context(relay()), mimetype='text/plain',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/api/generate_batch', methods=['POST'])
+@login_required
+def api_generate_batch():
+    data = request.get_json(silent=True) or {}
+    topics = [str(topic).strip() for topic in data.get('topics', []) if str(topic).strip()]
+    if not topics:
+        return jsonify({'error': 'topics must be a non-empty list'}), 400
+    try:
+        concurrency = int(data.get('concurrency', 5))
+    except (TypeError, ValueError):
+        concurrency = 0
+    if concurrency <= 0:
+        return jsonify({'error': 'concurrency must be a positive integer'}), 400
+    
+    def run_batch(progress):
+        results = linkedin.generate_batch(
+            topics,
+            include_hashtags=data.get('include_hashtags', True),
+            concurrency=min(concurrency, 20),
+            fresh=bool(data.get('fresh', False)),
+            progress=progress
+        )
+        failed = sum(1 for result in results if not result['success'])
+        return {'success': True, 'succeeded': len(results) - failed, 'failed': failed, 'results': results}
+    
+    # Batches share the Groq quota, so they run one at a time, each fanning out internally
+    try:
+        job = jobs.submit('generate_batch', 'groq', run_batch)
+    except QueueFullError as e:
+        return jsonify({'error': str(e)}), 429
+    
+    return jsonify({
+        'job_id': job.id,
+        'status': job.status,
+        'status_url': url_for('job_status', job_id=job.id),
+        'events_url': url_for('job_events', job_id=job.id)
+    }), 202
+
+@app.route('/api/generation_cache')
+@login_required
+def generation_cache_stats():
+    return jsonify(linkedin.generation_cache.summary())
+
+@app.route('/metrics')
+def prometheus_metrics():
+    # Scrapers can't hold a login session; require a bearer token instead when one is configured
+    token = os.getenv('METRICS_TOKEN')
+    if token and request.headers.get('Authorization') != f'Bearer {token}':
+        return Response('Unauthorized\n', status=401, mimetype='text/plain')
+    return Response(metrics.REGISTRY.render_prometheus(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/api/metrics')
+@login_required
+def metrics_summary():
+    return jsonify({
+        **metrics.REGISTRY.summary(),
+        'groq': linkedin.llm_client.stats,
+        'generation_cache': linkedin.generation_cache.summary(),
+        'media_fetcher': linkedin.media_fetcher.stats,
+        'media_processor': linkedin.media_processor.stats,
+        'jobs': jobs.stats(),
+        'analytics': analytics_store.stats(),
+        'activity_log': linkedin.activity_log.stats,
+        'browser': linkedin.session_stats(),
+        'composer': linkedin.composer_tracker.summary(),
+        'publish_ledger': linkedin.publish_ledger.stats(),
+        'rate_limits': linkedin.rate_controller.budgets(),
+        'circuit_breakers': linkedin.breaker_stats(),
+        'selectors': linkedin.selectors.summary()
+    })
+
+@app.route('/api/selectors')
+@login_required
+def selector_stats():
+    """Selector registry version plus hits, misses and latency of each fallback chain"""
+    return jsonify(linkedin.selectors.summary())
+
+@app.route('/api/circuit_breakers')
+@login_required
+def circuit_breakers():
+    """State of the Groq, LinkedIn login and composer circuit breakers"""
+    return jsonify({'breakers': linkedin.breaker_stats()})
+
+@app.route('/api/rate_limits')
+@login_required
+def rate_limits():
+    """Current login, post and media upload budgets per account, for planning"""
+    return jsonify({'budgets': linkedin.rate_controller.budgets()})
+
+@app.route('/api/publish_ledger')
+@login_required
+def publish_ledger_entries():
+    state = request.args.get('state')
+    if state and state not in publish_ledger.STATES:
+        return jsonify({'error': f'Unknown state: {state}'}), 400
+    limit = max(1, min(request.args.get('limit', 100, type=int) or 100, 1000))
+    return jsonify({
+        'stats': linkedin.publish_ledger.stats(),
+        'entries': linkedin.publish_ledger.entries(state=state, limit=limit)
+    })
+
+@app.route('/api/publish_ledger/<key>', methods=['DELETE'])
+@login_required
+def forget_publish_ledger_entry(key):
+    """Clear an entry, e.g. a submitted post checked by hand to have never appeared, so it can be sent again"""
+    if not linkedin.publish_ledger.forget(key):
+        return jsonify({'error': 'Ledger entry not found'}), 404
+    return jsonify({'success': True})
+
+@app.route('/api/recent_activity')
+@login_required
+def recent_activity():
+    limit = max(1, min(request.args.get('limit', 20, type=int) or 20, 500))
+    events = linkedin.activity_log.iter_events(
+        account=request.args.get('account'),
+        kind=request.args.get('kind'),
+        before=request.args.get('before', type=int),
+        limit=limit
+    )
+    
+    def generate():
+        # Events are written out as they are read; pass "next" back as ?before= for the following page
+        yield '{"activities": ['
+        last_id, count = None, 0
+        for event in events:
+            yield (',' if count else '') + json.dumps(event)
+            last_id, count = event['id'], count + 1
+        yield '], "next": ' + json.dumps(last_id if count == limit else None) + '}'
+    
+    return Response(stream_with_context(generate()), mimetype='application/json')
+
 @app.route('/schedule_post', methods=['GET', 'POST'])
 @login_required
 def schedule_post():
@@ -155,54 +437,120 @@ def schedule_post():
             
     return render_template('schedule_post.html')
 
+@app.route('/api/scheduled_posts')
+@login_required
+def scheduled_posts():
+    status = request.args.get('status', 'pending')
+    limit = min(request.args.get('limit', 100, type=int), 500)
+    offset = request.args.get('offset', 0, type=int)
+    posts = post_queue.list(status=status or None, limit=limit, offset=offset)
+    return jsonify({'posts': posts})
+
+@app.route('/api/scheduled_posts/<post_id>', methods=['DELETE'])
+@login_required
+def cancel_scheduled_post(post_id):
+    if not post_queue.cancel(post_id):
+        return jsonify({'error': 'No pending post with that id'}), 404
+    return jsonify({'success': True})
+
+@app.route('/api/scheduled_posts/<post_id>', methods=['PATCH'])
+@login_required
+def reschedule_scheduled_post(post_id):
+    data = request.get_json(silent=True) or request.form
+    try:
+        schedule_datetime = datetime.strptime(data.get('schedule_time', ''), '%Y-%m-%dT%H:%M')
+    except ValueError:
+        return jsonify({'error': 'schedule_time must be formatted as YYYY-MM-DDTHH:MM'}), 400
+    
+    if schedule_datetime <= datetime.now():
+        return jsonify({'error': 'Schedule time must be in the future'}), 400
+    if not post_queue.reschedule(post_id, schedule_datetime):
+        return jsonify({'error': 'No pending post with that id'}), 404
+    return jsonify({'post': post_queue.get(post_id)})
+
 @app.route('/analytics')
 @login_required
 def analytics():
-    try:
-        # Ensure company ID is set before fetching updates
-        if not linkedin.company_id:
-            linkedin.set_company_id(COMPANY_ID)
-        
-        # Debugging: Print out the method signature and available methods
-        import inspect
-        print("LinkedIn API methods:", dir(linkedin.api))
-        
-        # Multiple approaches to fetch updates
-        updates = []
-        error_messages = []
-        
-        # Approach 1: Try with company ID
-        try:
-            updates = linkedin.get_company_updates(limit=5)
-        except Exception as e1:
-            error_messages.append(f"Approach 1 failed: {e1}")
-            print(f"Approach 1 failed: {e1}")
-        
-        # If no updates, add a flash message
-        if not updates:
-            flash('No company updates found.')
-            # Combine all error messages for logging
-            if error_messages:
-                print("Errors encountered:", " | ".join(error_messages))
-        
-        return render_template('analytics.html', updates=updates)
-    except Exception as e:
-        # Log the full error for debugging
-        import traceback
-        traceback.print_exc()
-        
-        # Provide a user-friendly error message
-        flash(f'Error fetching analytics: {str(e)}')
+    company_id = linkedin.company_id or COMPANY_ID
+    if not company_id:
+        flash('Set COMPANY_ID to see company analytics.')
         return render_template('analytics.html', updates=[])
+    
+    # Serve what the store has; never wait on LinkedIn during a page load
+    analytics_refresher.revalidate(company_id)
+    updates = analytics_store.recent_posts(company_id, limit=5)
+    if not updates:
+        flash('No company updates found yet; analytics refresh in the background.')
+    return render_template('analytics.html', updates=updates)
+
+@app.route('/api/analytics')
+@login_required
+def api_analytics():
+    company_id = request.args.get('company_id') or linkedin.company_id or COMPANY_ID
+    if not company_id:
+        return jsonify({'error': 'company_id is required'}), 400
+    days = request.args.get('range', 30, type=int)
+    if days is None or days <= 0:
+        return jsonify({'error': 'range must be a positive number of days'}), 400
+    granularity = request.args.get('granularity')
+    if granularity and granularity not in rollups.GRANULARITIES:
+        return jsonify({'error': f"granularity must be one of {', '.join(rollups.GRANULARITIES)}"}), 400
+    
+    # Stale-while-revalidate: answer from the store now, refresh in the background if stale
+    stale = analytics_refresher.revalidate(company_id)
+    return jsonify({
+        **analytics_store.summary(company_id, days),
+        'series': analytics_store.rollup(company_id, days, granularity),
+        'stale': stale
+    })
+
+@app.route('/api/analytics/export')
+@login_required
+def export_analytics():
+    company_id = request.args.get('company_id') or linkedin.company_id or COMPANY_ID
+    if not company_id:
+        return jsonify({'error': 'company_id is required'}), 400
+    days = request.args.get('range', type=int)
+    since = datetime.now().timestamp() - days * 86400 if days else 0
+    history = request.args.get('history') in ('1', 'true')
+    fields = HISTORY_EXPORT_FIELDS if history else EXPORT_FIELDS
+    batches = analytics_store.export_batches(company_id, since=since, history=history)
+    
+    # Rows stream out in batches as they are read; the export is never held in memory whole
+    export_format = request.args.get('format', 'csv')
+    if export_format == 'csv':
+        body, mimetype = rollups.stream_csv(fields, batches), 'text/csv'
+    elif export_format == 'parquet':
+        if rollups.pyarrow is None:
+            return jsonify({'error': 'Parquet export requires pyarrow'}), 400
+        body, mimetype = rollups.stream_parquet(fields, batches), 'application/vnd.apache.parquet'
+    else:
+        return jsonify({'error': 'format must be csv or parquet'}), 400
+    
+    filename = f"linkedin-analytics{'-history' if history else ''}.{export_format}"
+    return Response(stream_with_context(body), mimetype=mimetype,
+                    headers={'Content-Disposition': f'attachment; filename={filename}'})
 
 @app.route('/api/post_analytics/<post_id>')
 @login_required
 def post_analytics(post_id):
-    try:
-        analytics = linkedin.get_post_analytics(post_id)
-        return jsonify(analytics)
-    except Exception as e:
-        return jsonify({'error': str(e)}), 400
+    company_id = request.args.get('company_id') or linkedin.company_id or COMPANY_ID
+    post_urn = post_id if post_id.startswith('urn:li:') else f"urn:li:share:{post_id}"
+    cached = analytics_store.post(post_urn)
+    if cached is None:
+        if not company_id:
+            return jsonify({'error': 'company_id is required'}), 400
+        # Start tracking the post; its statistics arrive with the next refresh
+        analytics_store.upsert_posts(company_id, [{'id': post_urn}])
+        analytics_refresher.request_refresh(company_id)
+        return jsonify({'post_id': post_urn, 'status': 'pending'}), 202
+    if cached['refreshed_at'] is None:
+        analytics_refresher.request_refresh(cached['company_id'])
+        return jsonify({'post_id': post_urn, 'status': 'pending'}), 202
+    
+    if cached['stale']:
+        analytics_refresher.request_refresh(cached['company_id'])
+    return jsonify(cached)
 
 if __name__ == '__main__':
     app.run(debug=True)
\ No newline at end of file
@@ -0,0 +1,289 @@
+import os
+import time
+import sqlite3
+import hashlib
+import tempfile
+import mimetypes
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, List, Dict
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_CACHE_DIR = os.path.join(os.getcwd(), 'media_cache')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS media_urls (
+    url TEXT PRIMARY KEY,
+    digest TEXT NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    fetched_at REAL NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS media_objects (
+    digest TEXT PRIMARY KEY,
+    filename TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_media_urls_digest ON media_urls (digest);
+CREATE INDEX IF NOT EXISTS idx_media_objects_last_used ON media_objects (last_used);
+"""
+
+# Validator columns added to media_urls after its first release; older caches get them on open
+URL_COLUMNS = {"etag": "TEXT", "last_modified": "TEXT", "fetched_at": "REAL NOT NULL DEFAULT 0"}
+
+
+class MediaFetcher:
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_cache_bytes: int = 512 * 1024 * 1024,
+                 max_workers: int = 4, connect_timeout: float = 5.0, read_timeout: float = 30.0,
+                 max_file_bytes: int = 100 * 1024 * 1024, chunk_size: int = 64 * 1024,
+                 revalidate_after: float = 3600.0):
+        """
+        Downloads post media in parallel into a content-addressed, size-bounded cache
+
+        Files are streamed to disk in chunks and stored under their SHA-256,
+        so the same asset referenced by different URLs is kept once. A URL
+        fetched within revalidate_after seconds is served from disk without a
+        request; after that it is revalidated with a conditional GET using the
+        ETag / Last-Modified it was served with, so an asset replaced at the
+        same URL is downloaded again. Least recently used files are evicted
+        once the cache exceeds max_cache_bytes.
+
+        Args:
+            cache_dir: Directory holding cached files and the index database
+            max_cache_bytes: Total size the cache is trimmed back to
+            max_workers: Parallel downloads
+            connect_timeout: Seconds to establish a connection
+            read_timeout: Seconds to wait between received chunks
+            max_file_bytes: Downloads larger than this are aborted
+            chunk_size: Bytes read and written per chunk
+            revalidate_after: Seconds a URL is trusted before it is revalidated; 0 checks every time
+        """
+        self.cache_dir = cache_dir
+        self.objects_dir = os.path.join(cache_dir, 'objects')
+        self.max_cache_bytes = max_cache_bytes
+        self.max_workers = max_workers
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_file_bytes = max_file_bytes
+        self.chunk_size = chunk_size
+        self.revalidate_after = revalidate_after
+        os.makedirs(self.objects_dir, exist_ok=True)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_maxsize=max_workers)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        self._local = threading.local()
+        self._migrate()
+        self.stats = {"hits": 0, "revalidated": 0, "downloads": 0, "failures": 0, "bytes_downloaded": 0,
+                      "evictions": 0}
+        self._stats_lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> 'MediaFetcher':
+        """Build a fetcher from MEDIA_CACHE_* environment variables"""
+        return cls(
+            cache_dir=os.getenv('MEDIA_CACHE_DIR', DEFAULT_CACHE_DIR),
+            max_cache_bytes=int(os.getenv('MEDIA_CACHE_MAX_BYTES', str(512 * 1024 * 1024))),
+            revalidate_after=float(os.getenv('MEDIA_CACHE_REVALIDATE_AFTER', '3600'))
+        )
+
+    def fetch_all(self, urls: List[str]) -> List[Optional[str]]:
+        """
+        Fetch several URLs in parallel
+
+        Args:
+            urls: Media URLs
+
+        Returns:
+            Local file path per URL, in input order; None where the download failed
+        """
+        if not urls:
+            return []
+        workers = max(1, min(self.max_workers, len(urls)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='media-fetch') as executor:
+            paths = list(executor.map(self._fetch_or_none, urls))
+        self._evict()
+        return paths
+
+    def fetch(self, url: str) -> str:
+        """
+        Return a local path for a URL, downloading it only if not cached or changed
+
+        Args:
+            url: Media URL
+
+        Returns:
+            Path of the cached file
+        """
+        cached = self._lookup(url)
+        if cached and time.time() - cached["fetched_at"] < self.revalidate_after:
+            self._count("hits")
+            return cached["path"]
+
+        try:
+            downloaded = self._download(url, cached)
+        except Exception as e:
+            if not cached:
+                raise
+            # The origin is unreachable; the copy we have beats failing the post
+            print(f"Could not revalidate media {url}, using the cached copy: {str(e)}")
+            self._count("hits")
+            return cached["path"]
+
+        if downloaded is None:
+            # 304 Not Modified: the cached copy is still current
+            with self._conn() as conn:
+                conn.execute("UPDATE media_urls SET fetched_at = ? WHERE url = ?", (time.time(), url))
+            self._count("revalidated")
+            return cached["path"]
+
+        digest, temp_path, size, content_type, etag, last_modified = downloaded
+        filename = digest + self._extension(url, content_type)
+        path = os.path.join(self.objects_dir, filename)
+        if os.path.exists(path):
+            # Same content already cached under another URL
+            os.remove(temp_path)
+        else:
+            os.replace(temp_path, path)
+
+        with self._conn() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO media_objects (digest, filename, size, last_used) VALUES (?, ?, ?, ?)",
+                (digest, filename, size, time.time())
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO media_urls (url, digest, etag, last_modified, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (url, digest, etag, last_modified, time.time())
+            )
+        return path
+
+    def close(self):
+        self.session.close()
+
+    def _fetch_or_none(self, url: str) -> Optional[str]:
+        try:
+            return self.fetch(url)
+        except Exception as e:
+            self._count("failures")
+            print(f"Error downloading media {url}: {str(e)}")
+            return None
+
+    def _lookup(self, url: str) -> Optional[Dict]:
+        """Cached file and validators for a URL, or None if it was never fetched or its file is gone"""
+        row = self._conn().execute(
+            "SELECT o.digest, o.filename, u.etag, u.last_modified, u.fetched_at "
+            "FROM media_urls u JOIN media_objects o ON o.digest = u.digest WHERE u.url = ?", (url,)
+        ).fetchone()
+        if not row:
+            return None
+        path = os.path.join(self.objects_dir, row[1])
+        if not os.path.exists(path):
+            return None
+        with self._conn() as conn:
+            conn.execute("UPDATE media_objects SET last_used = ? WHERE digest = ?", (time.time(), row[0]))
+        return {"path": path, "etag": row[2], "last_modified": row[3], "fetched_at": row[4] or 0.0}
+
+    def _download(self, url: str, cached: Optional[Dict] = None):
+        """
+        Stream a URL to a unique temp file, hashing as it goes
+
+        With a cached entry the request is conditional on its validators.
+
+        Returns:
+            None if the server answered 304 Not Modified, otherwise
+            (digest, temp path, size, content type, etag, last modified)
+        """
+        headers = {}
+        if cached and cached["etag"]:
+            headers["If-None-Match"] = cached["etag"]
+        if cached and cached["last_modified"]:
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+        digest = hashlib.sha256()
+        size = 0
+        content_type = etag = last_modified = None
+        fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.part')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                with self.session.get(url, stream=True, timeout=self.timeout, headers=headers) as response:
+                    if response.status_code == 304 and cached:
+                        f.close()
+                        os.remove(temp_path)
+                        return None
+                    response.raise_for_status()
+                    content_type = response.headers.get('Content-Type', '')
+                    etag = response.headers.get('ETag')
+                    last_modified = response.headers.get('Last-Modified')
+                    for chunk in response.iter_content(chunk_size=self.chunk_size):
+                        size += len(chunk)
+                        if size > self.max_file_bytes:
+                            raise ValueError(f"Media exceeds {self.max_file_bytes} bytes")
+                        digest.update(chunk)
+                        f.write(chunk)
+        except Exception:
+            os.remove(temp_path)
+            raise
+
+        self._count("downloads")
+        self._count("bytes_downloaded", size)
+        return digest.hexdigest(), temp_path, size, content_type, etag, last_modified
+
+    def _extension(self, url: str, content_type: str) -> str:
+        """File extension from the URL path, falling back to the response Content-Type"""
+        content_type = content_type.split(';')[0].strip()
+        ext = os.path.splitext(urlparse(url).path)[1].lower()
+        if ext and len(ext) <= 5:
+            return ext
+        return mimetypes.guess_extension(content_type) or '.jpg'
+
+    def _evict(self, min_idle: float = 600.0):
+        """Drop least recently used files until the cache fits, sparing ones used in the last min_idle seconds"""
+        conn = self._conn()
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM media_objects").fetchone()[0]
+        if total <= self.max_cache_bytes:
+            return
+
+        rows = conn.execute(
+            "SELECT digest, filename, size FROM media_objects WHERE last_used < ? ORDER BY last_used",
+            (time.time() - min_idle,)
+        ).fetchall()
+        for digest, filename, size in rows:
+            if total <= self.max_cache_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.objects_dir, filename))
+            except FileNotFoundError:
+                pass
+            with conn:
+                conn.execute("DELETE FROM media_urls WHERE digest = ?", (digest,))
+                conn.execute("DELETE FROM media_objects WHERE digest = ?", (digest,))
+            total -= size
+            self._count("evictions")
+
+    def _migrate(self):
+        """Create the index, adding columns newer than an existing cache's schema"""
+        conn = self._conn()
+        conn.executescript(SCHEMA)
+        existing = {row[1] for row in conn.execute("PRAGMA table_info(media_urls)")}
+        with conn:
+            for column, definition in URL_COLUMNS.items():
+                if column not in existing:
+                    conn.execute(f"ALTER TABLE media_urls ADD COLUMN {column} {definition}")
+
+    def _count(self, key: str, amount: int = 1):
+        with self._stats_lock:
+            self.stats[key] += amount
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(os.path.join(self.cache_dir, 'index.db'), timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
@@ -0,0 +1,296 @@
+import os
+import time
+import threading
+import mimetypes
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional, Dict, List
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # pragma: no cover - optional dependency
+    Image = None
+    ImageOps = None
+
+from media_fetcher import DEFAULT_CACHE_DIR
+
+# Longest edge worth uploading; LinkedIn renders feed images well below this and rescales anything larger
+DEFAULT_MAX_DIMENSION = 2048
+
+# Formats Pillow re-encodes; GIFs and videos are uploaded untouched
+RECOMPRESSIBLE_TYPES = {'image/jpeg', 'image/png', 'image/webp', 'image/bmp', 'image/tiff'}
+
+# Leading bytes identifying common media formats
+MAGIC_NUMBERS = [
+    (b'\xff\xd8\xff', 'image/jpeg'),
+    (b'\x89PNG\r\n\x1a\n', 'image/png'),
+    (b'GIF87a', 'image/gif'),
+    (b'GIF89a', 'image/gif'),
+    (b'BM', 'image/bmp'),
+    (b'II*\x00', 'image/tiff'),
+    (b'MM\x00*', 'image/tiff'),
+]
+
+
+def sniff_mime_type(path: str) -> str:
+    """
+    Detect a file's MIME type from its content rather than its name
+
+    Args:
+        path: Local file path
+
+    Returns:
+        MIME type, falling back to a guess from the extension
+    """
+    with open(path, 'rb') as f:
+        head = f.read(16)
+    for magic, mime_type in MAGIC_NUMBERS:
+        if head.startswith(magic):
+            return mime_type
+    if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+        return 'image/webp'
+    if head[4:8] == b'ftyp':
+        return 'video/mp4'
+    return mimetypes.guess_type(path)[0] or 'application/octet-stream'
+
+
+def difference_hash(image, size: int = 8) -> int:
+    """
+    Perceptual hash: one bit per horizontally adjacent pixel pair of a tiny grayscale copy
+
+    Resized, recompressed or re-encoded copies of the same picture land
+    within a few bits of each other.
+    """
+    small = image.convert('L').resize((size + 1, size), Image.LANCZOS)
+    pixels = small.tobytes()
+    bits = 0
+    for row in range(size):
+        for col in range(size):
+            offset = row * (size + 1) + col
+            bits = (bits << 1) | (pixels[offset] > pixels[offset + 1])
+    return bits
+
+
+def process_image(path: str, output_dir: str, max_dimension: int, quality: int) -> Dict:
+    """
+    Downscale and recompress one file; runs in a worker process
+
+    The processed copy is named after the source (itself content-addressed
+    by MediaFetcher) and the settings, so repeat uploads reuse it. The
+    original is kept when re-encoding wouldn't make it smaller.
+
+    Args:
+        path: Source file
+        output_dir: Directory for processed copies
+        max_dimension: Longest edge in pixels
+        quality: JPEG quality
+
+    Returns:
+        Dict with the path to upload, its MIME type, original and final sizes and perceptual hash
+    """
+    mime_type = sniff_mime_type(path)
+    original_bytes = os.path.getsize(path)
+    result = {
+        "source": path,
+        "path": path,
+        "mime_type": mime_type,
+        "original_bytes": original_bytes,
+        "bytes": original_bytes,
+        "hash": None,
+        "aspect": None
+    }
+    if Image is None or mime_type not in RECOMPRESSIBLE_TYPES:
+        return result
+
+    with Image.open(path) as opened:
+        image = ImageOps.exif_transpose(opened)
+        result["hash"] = difference_hash(image)
+        result["aspect"] = image.width / image.height
+        oversized = max(image.size) > max_dimension
+        has_alpha = image.mode in ('RGBA', 'LA', 'PA') or (image.mode == 'P' and 'transparency' in image.info)
+
+        base = os.path.join(output_dir, f"{os.path.splitext(os.path.basename(path))[0]}-{max_dimension}q{quality}")
+        output_path = next((base + ext for ext in ('.jpg', '.png') if os.path.exists(base + ext)), None)
+        if output_path is None:
+            if oversized:
+                image.thumbnail((max_dimension, max_dimension), Image.LANCZOS)
+            # Transparency needs PNG; flat-colour graphics often stay smaller as PNG than as JPEG
+            candidates = [] if has_alpha else [_encode(image.convert('RGB'), output_dir, 'JPEG', quality=quality,
+                                                       optimize=True, progressive=True)]
+            if has_alpha or mime_type == 'image/png':
+                candidates.append(_encode(image, output_dir, 'PNG', optimize=True))
+            candidates.sort(key=os.path.getsize)
+            for extra in candidates[1:]:
+                os.remove(extra)
+            output_path = base + os.path.splitext(candidates[0])[1]
+            os.replace(candidates[0], output_path)
+
+    output_bytes = os.path.getsize(output_path)
+    if oversized or output_bytes < original_bytes:
+        output_type = 'image/png' if output_path.endswith('.png') else 'image/jpeg'
+        result.update(path=output_path, mime_type=output_type, bytes=output_bytes)
+    return result
+
+
+def _encode(image, output_dir: str, image_format: str, **options) -> str:
+    """Save to a unique hidden temp file so concurrent posts never see a partial copy"""
+    fd, temp_path = tempfile.mkstemp(dir=output_dir, prefix='.', suffix='.png' if image_format == 'PNG' else '.jpg')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            image.save(f, format=image_format, **options)
+    except Exception:
+        os.remove(temp_path)
+        raise
+    return temp_path
+
+
+class MediaProcessor:
+    def __init__(self, output_dir: str = os.path.join(DEFAULT_CACHE_DIR, 'processed'),
+                 max_dimension: int = DEFAULT_MAX_DIMENSION, quality: int = 85,
+                 max_workers: Optional[int] = None, duplicate_distance: int = 4, prune_interval: float = 3600.0):
+        """
+        Prepares downloaded media for upload: real MIME type, downscale, recompress and dedupe
+
+        Image work runs in a process pool so it neither holds the GIL nor
+        stalls the thread driving the browser. Without Pillow installed,
+        files pass through unchanged apart from MIME detection.
+
+        Args:
+            output_dir: Directory for processed copies
+            max_dimension: Longest edge in pixels after downscaling
+            quality: JPEG quality used when recompressing
+            max_workers: Worker processes; 0 processes inline, None uses the CPU count
+            duplicate_distance: Maximum perceptual hash distance (bits) treated as the same image
+            prune_interval: Seconds between sweeps removing processed copies whose source was evicted
+        """
+        self.output_dir = output_dir
+        self.max_dimension = max_dimension
+        self.quality = quality
+        self.max_workers = max_workers
+        self.duplicate_distance = duplicate_distance
+        self.prune_interval = prune_interval
+        self._last_prune = 0.0
+        os.makedirs(output_dir, exist_ok=True)
+        if Image is None:
+            print("Pillow is not installed; media will be uploaded without resizing or recompression")
+
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.stats = {"processed": 0, "duplicates": 0, "failures": 0, "bytes_saved": 0}
+
+    @classmethod
+    def from_env(cls) -> 'MediaProcessor':
+        """Build a processor from MEDIA_* environment variables"""
+        workers = os.getenv('MEDIA_PROCESS_WORKERS')
+        return cls(
+            output_dir=os.path.join(os.getenv('MEDIA_CACHE_DIR', DEFAULT_CACHE_DIR), 'processed'),
+            max_dimension=int(os.getenv('MEDIA_MAX_DIMENSION', str(DEFAULT_MAX_DIMENSION))),
+            quality=int(os.getenv('MEDIA_JPEG_QUALITY', '85')),
+            max_workers=int(workers) if workers else None
+        )
+
+    def process_all(self, paths: List[str]) -> Dict:
+        """
+        Process files in parallel and drop near-duplicate images
+
+        Args:
+            paths: Local media files in upload order
+
+        Returns:
+            Dict with the files to upload (in order), duplicates removed and bytes saved
+        """
+        results = self._run(paths)
+        if paths:
+            self._prune(os.path.dirname(paths[0]))
+
+        files, seen_paths = [], set()
+        duplicates = 0
+        for result in results:
+            if result["path"] in seen_paths or any(self._is_duplicate(result, kept) for kept in files):
+                duplicates += 1
+                continue
+            seen_paths.add(result["path"])
+            files.append(result)
+
+        bytes_saved = sum(result["original_bytes"] for result in results) - sum(f["bytes"] for f in files)
+        with self._stats_lock:
+            self.stats["processed"] += len(results)
+            self.stats["duplicates"] += duplicates
+            self.stats["bytes_saved"] += bytes_saved
+        return {"files": files, "duplicates": duplicates, "bytes_saved": bytes_saved}
+
+    def close(self):
+        with self._pool_lock:
+            if self._pool:
+                self._pool.shutdown(wait=True)
+                self._pool = None
+
+    def _run(self, paths: List[str]) -> List[Dict]:
+        """Process every path, falling back to the untouched file where processing fails"""
+        args = (self.output_dir, self.max_dimension, self.quality)
+        pool = self._get_pool() if paths else None
+        if pool is not None:
+            try:
+                futures = [pool.submit(process_image, path, *args) for path in paths]
+                return [self._result_or_original(path, future=future) for path, future in zip(paths, futures)]
+            except BrokenProcessPool as e:
+                print(f"Media process pool failed ({e}); processing inline")
+                with self._pool_lock:
+                    self._pool = None
+        return [self._result_or_original(path, args=args) for path in paths]
+
+    def _result_or_original(self, path: str, future=None, args: tuple = ()) -> Dict:
+        try:
+            return future.result() if future is not None else process_image(path, *args)
+        except BrokenProcessPool:
+            raise
+        except Exception as e:
+            print(f"Error processing media {path}: {str(e)}")
+            with self._stats_lock:
+                self.stats["failures"] += 1
+            size = os.path.getsize(path)
+            return {
+                "source": path,
+                "path": path,
+                "mime_type": sniff_mime_type(path),
+                "original_bytes": size,
+                "bytes": size,
+                "hash": None,
+                "aspect": None
+            }
+
+    def _get_pool(self) -> Optional[ProcessPoolExecutor]:
+        if self.max_workers == 0 or Image is None:
+            return None
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+            return self._pool
+
+    def _prune(self, source_dir: str):
+        """Delete processed copies whose source file has been evicted from the media cache"""
+        now = time.monotonic()
+        with self._pool_lock:
+            if now - self._last_prune < self.prune_interval:
+                return
+            self._last_prune = now
+
+        sources = {os.path.splitext(name)[0] for name in os.listdir(source_dir)}
+        for name in os.listdir(self.output_dir):
+            # Dot files are copies still being written
+            if name.startswith('.') or name.rsplit('-', 1)[0] in sources:
+                continue
+            try:
+                os.remove(os.path.join(self.output_dir, name))
+            except OSError:
+                pass
+
+    def _is_duplicate(self, media: Dict, kept: Dict) -> bool:
+        """Near-identical perceptual hashes and matching shape; the shape check keeps flat images apart"""
+        if media["hash"] is None or kept["hash"] is None:
+            return False
+        if abs(media["aspect"] - kept["aspect"]) > 0.02 * kept["aspect"]:
+            return False
+        return bin(media["hash"] ^ kept["hash"]).count('1') <= self.duplicate_distance
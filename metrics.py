@@ -0,0 +1,180 @@
+import time
+import bisect
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+# Latency buckets in seconds, spanning fast DOM steps to slow uploads and logins
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+# Help text shown in the Prometheus exposition
+HELP = {
+    "linkedin_driver_setup_seconds": "Time to start a Chrome WebDriver session",
+    "linkedin_login_seconds": "Time to authenticate a browser session",
+    "linkedin_page_load_seconds": "Load time of the page a browser session is on, by browser profile",
+    "linkedin_step_duration_seconds": "Time spent in each posting step",
+    "linkedin_media_upload_seconds": "Time to attach media in the LinkedIn composer",
+    "linkedin_post_duration_seconds": "End-to-end time to create a post",
+    "linkedin_posts_total": "Posts attempted, by backend and outcome",
+    "linkedin_composer_fast_path_total": "Posting steps skipped (reused) or run in full, by step",
+    "linkedin_selector_probe_seconds": "Round-trip time of one selector chain probe, by locator",
+    "linkedin_selector_hits_total": "Selector chain probes by the position of the candidate that matched",
+    "groq_request_duration_seconds": "Time until Groq responds to a chat completions request",
+    "groq_retries_total": "Groq requests retried after a transient failure",
+    "circuit_breaker_transitions_total": "Circuit breaker state changes, by dependency and new state",
+    "analytics_refresh_seconds": "Time to refresh one company's analytics from LinkedIn",
+    "analytics_posts_refreshed_total": "Post statistics fetched by the analytics refresher",
+}
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+class _Histogram:
+    """Cumulative bucket counts plus a window of recent samples for percentiles"""
+
+    def __init__(self, buckets: Tuple[float, ...], sample_size: int):
+        self.bucket_counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self.recent = deque(maxlen=sample_size)
+
+    def observe(self, buckets: Tuple[float, ...], value: float):
+        index = bisect.bisect_left(buckets, value)
+        if index < len(buckets):
+            self.bucket_counts[index] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+        self.recent.append(value)
+
+
+class MetricsRegistry:
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS, sample_size: int = 1024):
+        """
+        In-process latency histograms and counters
+
+        Args:
+            buckets: Histogram upper bounds in seconds
+            sample_size: Recent observations kept per series for the JSON percentiles
+        """
+        self.buckets = tuple(sorted(buckets))
+        self.sample_size = sample_size
+        self._histograms: Dict[str, Dict[LabelKey, _Histogram]] = {}
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, name: str, value: float, **labels):
+        """Record one latency sample in seconds"""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = _Histogram(self.buckets, self.sample_size)
+            histogram.observe(self.buckets, value)
+
+    def increment(self, name: str, amount: float = 1, **labels):
+        """Add to a counter"""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + amount
+
+    @contextmanager
+    def timer(self, name: str, **labels):
+        """Observe the enclosed block's duration, labelled with outcome ok or error"""
+        start = time.perf_counter()
+        outcome = 'error'
+        try:
+            yield
+            outcome = 'ok'
+        finally:
+            self.observe(name, time.perf_counter() - start, outcome=outcome, **labels)
+
+    def render_prometheus(self) -> str:
+        """All series in the Prometheus text exposition format"""
+        lines: List[str] = []
+        with self._lock:
+            for name in sorted(self._counters):
+                _header(lines, name, 'counter')
+                for key, value in sorted(self._counters[name].items()):
+                    lines.append(f"{name}{_format_labels(key)} {_format_value(value)}")
+
+            for name in sorted(self._histograms):
+                _header(lines, name, 'histogram')
+                for key, histogram in sorted(self._histograms[name].items()):
+                    cumulative = 0
+                    for bound, count in zip(self.buckets, histogram.bucket_counts):
+                        cumulative += count
+                        lines.append(f"{name}_bucket{_format_labels(key, le=_format_value(bound))} {cumulative}")
+                    lines.append(f"{name}_bucket{_format_labels(key, le='+Inf')} {histogram.count}")
+                    lines.append(f"{name}_sum{_format_labels(key)} {_format_value(histogram.sum)}")
+                    lines.append(f"{name}_count{_format_labels(key)} {histogram.count}")
+        return '\n'.join(lines) + '\n'
+
+    def summary(self) -> Dict:
+        """Per-series counts, averages and recent percentiles for dashboards"""
+        with self._lock:
+            histograms = {
+                name: [
+                    {
+                        "labels": dict(key),
+                        "count": histogram.count,
+                        "avg": round(histogram.sum / histogram.count, 4) if histogram.count else 0.0,
+                        "p50": _percentile(histogram.recent, 0.50),
+                        "p95": _percentile(histogram.recent, 0.95),
+                        "p99": _percentile(histogram.recent, 0.99),
+                        "max": round(histogram.max, 4)
+                    }
+                    for key, histogram in sorted(series.items())
+                ]
+                for name, series in sorted(self._histograms.items())
+            }
+            counters = {
+                name: [{"labels": dict(key), "value": value} for key, value in sorted(series.items())]
+                for name, series in sorted(self._counters.items())
+            }
+        return {"histograms": histograms, "counters": counters}
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+
+def _label_key(labels: Dict) -> LabelKey:
+    return tuple(sorted((name, str(value)) for name, value in labels.items() if value is not None))
+
+
+def _header(lines: List[str], name: str, metric_type: str):
+    if name in HELP:
+        lines.append(f"# HELP {name} {HELP[name]}")
+    lines.append(f"# TYPE {name} {metric_type}")
+
+
+def _format_labels(key: LabelKey, **extra) -> str:
+    pairs = list(key) + list(extra.items())
+    if not pairs:
+        return ''
+    escaped = (value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"') for _, value in pairs)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + '}'
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+def _percentile(samples, fraction: float) -> Optional[float]:
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))], 4)
+
+
+# Process-wide registry the automation code reports into
+REGISTRY = MetricsRegistry()
+observe = REGISTRY.observe
+increment = REGISTRY.increment
+timer = REGISTRY.timer
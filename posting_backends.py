@@ -0,0 +1,110 @@
+import time
+from typing import Optional, Dict, List, Callable
+
+from linkedin_api import LinkedInAPIClient, LinkedInAPIError, organization_urn
+from media_processor import sniff_mime_type
+
+
+class PostingBackend:
+    """How a post reaches LinkedIn; create_post returns the same result dict for every backend"""
+
+    name = 'base'
+
+    def create_post(self, text: str, media_urls: Optional[List[str]] = None, company_id: Optional[str] = None,
+                    progress: Optional[Callable] = None, drag_and_drop: bool = True) -> Dict:
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class SeleniumBackend(PostingBackend):
+    """Drives the LinkedIn web composer in a browser session"""
+
+    name = 'selenium'
+
+    def __init__(self, automation):
+        self.automation = automation
+
+    def create_post(self, text: str, media_urls: Optional[List[str]] = None, company_id: Optional[str] = None,
+                    progress: Optional[Callable] = None, drag_and_drop: bool = True) -> Dict:
+        return self.automation._post_with_session(text, media_urls, drag_and_drop, progress, company_id)
+
+
+class RestBackend(PostingBackend):
+    """Publishes through LinkedIn's Posts and Images APIs over a pooled HTTP session"""
+
+    name = 'rest'
+
+    def __init__(self, client: LinkedInAPIClient, media_fetcher, media_processor=None):
+        """
+        Args:
+            client: Authenticated LinkedInAPIClient
+            media_fetcher: MediaFetcher used to download media URLs
+            media_processor: Optional MediaProcessor applied before upload
+        """
+        self.client = client
+        self.media_fetcher = media_fetcher
+        self.media_processor = media_processor
+
+    def create_post(self, text: str, media_urls: Optional[List[str]] = None, company_id: Optional[str] = None,
+                    progress: Optional[Callable] = None, drag_and_drop: bool = True) -> Dict:
+        timings = {}
+        started = time.perf_counter()
+        published = False
+        try:
+            author = organization_urn(company_id) if company_id else self.client.person_urn()
+
+            image_urns = []
+            if media_urls:
+                step = time.perf_counter()
+                if progress:
+                    progress("media_upload")
+                for media in self._prepare_media(media_urls):
+                    if not media["mime_type"].startswith('image/'):
+                        raise LinkedInAPIError(f"Unsupported media type for the API backend: {media['mime_type']}")
+                    image_urns.append(self.client.upload_image(author, media["path"]))
+                timings["media_upload"] = round(time.perf_counter() - step, 3)
+
+            step = time.perf_counter()
+            if progress:
+                progress("publish")
+            published = None
+            post_urn = self.client.create_post(author, text, image_urns)
+            published = True
+            timings["publish"] = round(time.perf_counter() - step, 3)
+
+            return {
+                "success": True,
+                "message": "Post created successfully",
+                "confirmed": True,
+                "post_urn": post_urn,
+                "media_count": len(media_urls) if media_urls else 0,
+                "timings": timings,
+                "elapsed": round(time.perf_counter() - started, 3)
+            }
+        except Exception as e:
+            if isinstance(e, LinkedInAPIError) and published is None:
+                published = e.published
+            print(f"Error creating LinkedIn post via API: {str(e)}")
+            return {
+                "success": False,
+                "error": str(e),
+                # None means the post may exist; callers must not retry it on another backend
+                "published": published,
+                "status_code": getattr(e, 'status_code', None),
+                "media_count": len(media_urls) if media_urls else 0,
+                "timings": timings,
+                "elapsed": round(time.perf_counter() - started, 3)
+            }
+
+    def _prepare_media(self, media_urls: List[str]) -> List[Dict]:
+        paths = self.media_fetcher.fetch_all(media_urls)
+        if any(path is None for path in paths):
+            raise LinkedInAPIError("Could not download all media")
+        if self.media_processor:
+            return self.media_processor.process_all(paths)["files"]
+        return [{"path": path, "mime_type": sniff_mime_type(path)} for path in paths]
+
+    def close(self):
+        self.client.close()
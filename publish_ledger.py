@@ -0,0 +1,212 @@
+import os
+import time
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Optional, Dict, List, Tuple
+
+from generation_cache import cache_key
+
+DEFAULT_DB_PATH = os.path.join(os.getcwd(), 'publish_ledger.db')
+
+STATES = ('pending', 'submitted', 'confirmed', 'failed')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS publish_ledger (
+    key TEXT PRIMARY KEY,
+    account TEXT,
+    target TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    state TEXT NOT NULL,
+    backend TEXT,
+    post_urn TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_publish_ledger_state ON publish_ledger (state, updated_at);
+"""
+
+
+def content_hash(text: str, media_urls: Optional[List[str]] = None) -> str:
+    """Content address of a post's text and attached media"""
+    return cache_key({"text": text.strip(), "media_urls": list(media_urls or [])})
+
+
+class PublishLedger:
+    def __init__(self, db_path: Optional[str] = DEFAULT_DB_PATH, pending_timeout: float = 900.0,
+                 dedupe_window: float = 86400.0):
+        """
+        SQLite record of every publish attempt, keyed by content, account and target
+
+        create_post claims an entry before touching a backend. The entry moves
+        pending -> submitted (the Post click or API call is under way) ->
+        confirmed (the new post's URN was read back) or failed (it certainly
+        wasn't published). A retry of a confirmed or in-flight post is answered
+        from the ledger, and a post left submitted by a crash is never sent
+        again blindly, so retry storms can't double-post. A submitted entry
+        keeps blocking, however old, until it is reconciled (its post is found
+        and it becomes confirmed) or cleared with forget().
+
+        Args:
+            db_path: SQLite database file, or None to disable deduplication
+            pending_timeout: Seconds after which a pending entry is abandoned and a submitted one is checked against LinkedIn
+            dedupe_window: Seconds after a confirmed post during which identical content to the same target is
+                not posted again
+        """
+        self.db_path = db_path
+        self.pending_timeout = pending_timeout
+        self.dedupe_window = dedupe_window
+        self._local = threading.local()
+        if db_path:
+            self._conn().executescript(SCHEMA)
+
+    @classmethod
+    def from_env(cls) -> 'PublishLedger':
+        """Build a ledger at PUBLISH_LEDGER_PATH; an empty value disables it"""
+        return cls(
+            os.getenv('PUBLISH_LEDGER_PATH', DEFAULT_DB_PATH) or None,
+            pending_timeout=float(os.getenv('PUBLISH_LEDGER_PENDING_TIMEOUT', '900')),
+            dedupe_window=float(os.getenv('PUBLISH_LEDGER_DEDUPE_WINDOW', '86400'))
+        )
+
+    @staticmethod
+    def key(account: Optional[str], target: str, digest: str) -> str:
+        return cache_key({"account": account, "target": target, "content": digest})
+
+    def begin(self, account: Optional[str], target: str, digest: str) -> Tuple[bool, Optional[Dict]]:
+        """
+        Claim the right to publish a post
+
+        Args:
+            account: LinkedIn account posting
+            target: member or the company id posted as
+            digest: content_hash() of the post
+
+        Returns:
+            (claimed, entry). When claimed is False the entry says why: it was
+            confirmed within dedupe_window, is still in flight, or was submitted by
+            an attempt that never finished.
+        """
+        if not self.db_path:
+            return True, None
+        key = self.key(account, target, digest)
+        now = time.time()
+        with _Transaction(self._conn()) as conn:
+            row = conn.execute("SELECT * FROM publish_ledger WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                age = now - row["updated_at"]
+                if row["state"] == 'confirmed' and age < self.dedupe_window:
+                    return False, self._to_dict(row)
+                # The outcome is unknown, so the post may be live; age alone never makes it safe to resend
+                if row["state"] == 'submitted':
+                    return False, self._to_dict(row)
+                if row["state"] == 'pending' and age < self.pending_timeout:
+                    return False, self._to_dict(row)
+
+            conn.execute(
+                "INSERT INTO publish_ledger (key, account, target, content_hash, state, attempts, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, 'pending', 1, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET state = 'pending', backend = NULL, post_urn = NULL, error = NULL, "
+                "attempts = attempts + 1, updated_at = excluded.updated_at",
+                (key, account, target, digest, now, now)
+            )
+            row = conn.execute("SELECT * FROM publish_ledger WHERE key = ?", (key,)).fetchone()
+        return True, self._to_dict(row)
+
+    def submitted(self, key: str, backend: str):
+        """The post is being sent; from here a retry could publish it twice"""
+        self._update(key, "state = 'submitted', backend = ?", (backend,), only_states=('pending',))
+
+    def reopen(self, key: str):
+        """Back to pending after a backend certainly failed to publish, before the next one is tried"""
+        self._update(key, "state = 'pending'", ())
+
+    def confirmed(self, key: str, backend: Optional[str], post_urn: Optional[str]):
+        self._update(key, "state = 'confirmed', backend = ?, post_urn = ?, error = NULL", (backend, post_urn))
+
+    def failed(self, key: str, error: str):
+        """The post certainly wasn't published, so it may be retried"""
+        self._update(key, "state = 'failed', error = ?", (error,))
+
+    def unresolved(self, key: str, error: Optional[str]):
+        """The attempt ended without confirmation; keep it submitted so it isn't sent again"""
+        self._update(key, "state = 'submitted', error = ?", (error,))
+
+    def forget(self, key: str) -> bool:
+        """Drop an entry, e.g. after checking by hand that a submitted post never appeared"""
+        if not self.db_path:
+            return False
+        with _Transaction(self._conn()) as conn:
+            return conn.execute("DELETE FROM publish_ledger WHERE key = ?", (key,)).rowcount > 0
+
+    def get(self, key: str) -> Optional[Dict]:
+        if not self.db_path:
+            return None
+        row = self._conn().execute("SELECT * FROM publish_ledger WHERE key = ?", (key,)).fetchone()
+        return self._to_dict(row) if row else None
+
+    def entries(self, state: Optional[str] = None, limit: int = 100) -> List[Dict]:
+        """Most recently updated entries, optionally in one state"""
+        if not self.db_path:
+            return []
+        if state:
+            rows = self._conn().execute(
+                "SELECT * FROM publish_ledger WHERE state = ? ORDER BY updated_at DESC LIMIT ?", (state, limit)
+            ).fetchall()
+        else:
+            rows = self._conn().execute(
+                "SELECT * FROM publish_ledger ORDER BY updated_at DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [self._to_dict(row) for row in rows]
+
+    def stats(self) -> Dict:
+        """Entry counts by state"""
+        counts = {state: 0 for state in STATES}
+        if self.db_path:
+            for row in self._conn().execute("SELECT state, COUNT(*) AS n FROM publish_ledger GROUP BY state"):
+                counts[row["state"]] = row["n"]
+        return counts
+
+    def _update(self, key: str, assignment: str, params: tuple, only_states: Optional[tuple] = None):
+        if not self.db_path or key is None:
+            return
+        query = f"UPDATE publish_ledger SET {assignment}, updated_at = ? WHERE key = ?"
+        params = params + (time.time(), key)
+        if only_states:
+            query += f" AND state IN ({', '.join('?' for _ in only_states)})"
+            params += only_states
+        with _Transaction(self._conn()) as conn:
+            conn.execute(query, params)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _to_dict(self, row: sqlite3.Row) -> Dict:
+        entry = dict(row)
+        entry["created_at"] = datetime.fromtimestamp(entry["created_at"]).isoformat()
+        entry["updated_at"] = datetime.fromtimestamp(entry["updated_at"]).isoformat()
+        return entry
+
+
+class _Transaction:
+    """BEGIN IMMEDIATE ... COMMIT block so the ledger check and claim are atomic across processes"""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+    def __enter__(self) -> sqlite3.Connection:
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        return False
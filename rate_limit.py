@@ -0,0 +1,289 @@
+import os
+import time
+import threading
+from typing import Optional, Dict, Tuple
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """
+        Thread-safe token bucket
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum tokens held; defaults to one second's worth (at least 1)
+        """
+        if rate <= 0:
+            raise ValueError("Token bucket rate must be positive")
+
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def per_minute(cls, amount: float, burst: Optional[float] = None) -> 'TokenBucket':
+        """Bucket refilling `amount` tokens per minute, holding at most `burst` (default: amount)"""
+        return cls(amount / 60.0, capacity=burst if burst is not None else amount)
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """Take tokens if available without waiting"""
+        with self._lock:
+            self._refill()
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+            return False
+
+    def acquire(self, tokens: float = 1.0, timeout: Optional[float] = None) -> bool:
+        """
+        Take tokens, waiting for the bucket to refill if needed
+
+        Args:
+            tokens: Tokens to take; requests larger than capacity are capped to it
+            timeout: Maximum seconds to wait, or None to wait indefinitely
+
+        Returns:
+            True if the tokens were taken before the timeout
+        """
+        tokens = min(tokens, self.capacity)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return True
+                wait = (tokens - self._tokens) / self.rate
+
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            time.sleep(wait)
+
+    def available(self) -> float:
+        """Tokens currently in the bucket"""
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+    def wait_time(self, tokens: float = 1.0) -> float:
+        """Seconds until tokens can be taken, 0 if they can be now"""
+        tokens = min(tokens, self.capacity)
+        with self._lock:
+            self._refill()
+            return max(0.0, (tokens - self._tokens) / self.rate)
+
+    def set_rate(self, rate: float):
+        """Change the refill rate, keeping the tokens accrued so far"""
+        if rate <= 0:
+            raise ValueError("Token bucket rate must be positive")
+        with self._lock:
+            self._refill()
+            self.rate = rate
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+
+# Default (per hour, burst) for each rate-controlled LinkedIn action
+DEFAULT_ACTION_LIMITS = {
+    "login": (6.0, 2.0),
+    "post": (30.0, 5.0),
+    "media_upload": (120.0, 10.0),
+}
+
+# Outcomes that cut an action's rate, with the factor applied
+DECREASE_FACTORS = {
+    "throttled": 0.5,
+    "challenge": 0.25,
+    "slow": 0.8,
+    "error": 0.8,
+}
+
+
+class AdaptiveLimiter:
+    def __init__(self, per_hour: float, burst: float, min_fraction: float = 0.1, recovery: float = 0.1,
+                 challenge_cooldown: float = 1800.0, throttle_cooldown: float = 60.0, error_streak: int = 3,
+                 spike_factor: float = 3.0):
+        """
+        Token bucket whose rate adapts to how LinkedIn responds (AIMD)
+
+        Each success adds recovery x the configured rate back, up to the
+        configured rate; throttling, a checkpoint/captcha page, a latency spike
+        or a streak of errors multiplies the rate down (see DECREASE_FACTORS),
+        never below min_fraction of it. Throttling and challenges also pause
+        the action for a cooldown, during which nothing is let through.
+
+        Args:
+            per_hour: Configured (maximum) rate
+            burst: Bucket capacity
+            min_fraction: Lowest rate as a fraction of per_hour
+            recovery: Fraction of per_hour added back per success
+            challenge_cooldown: Seconds paused after a checkpoint or captcha
+            throttle_cooldown: Seconds paused after a throttling response
+            error_streak: Consecutive errors before the rate is cut
+            spike_factor: Latency over this multiple of the running average counts as a spike
+        """
+        self.max_rate = per_hour / 3600.0
+        self.min_rate = self.max_rate * min_fraction
+        self.recovery = recovery
+        self.challenge_cooldown = challenge_cooldown
+        self.throttle_cooldown = throttle_cooldown
+        self.error_streak = error_streak
+        self.spike_factor = spike_factor
+        self.bucket = TokenBucket(self.max_rate, capacity=burst)
+        self.cooldown_until = 0.0
+        self.errors = 0
+        self.latency = None
+        self.samples = 0
+        self.last_signal = None
+        self._lock = threading.Lock()
+
+    def wait_time(self, tokens: float = 1.0) -> float:
+        """Seconds until tokens can be taken, counting any cooldown"""
+        return max(self.cooldown_until - time.monotonic(), self.bucket.wait_time(tokens))
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        if time.monotonic() < self.cooldown_until:
+            return False
+        return self.bucket.try_acquire(tokens)
+
+    def acquire(self, tokens: float = 1.0, timeout: Optional[float] = None) -> bool:
+        """
+        Take tokens, waiting out cooldowns and refills
+
+        Returns:
+            True if the tokens were taken before the timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            pause = self.cooldown_until - time.monotonic()
+            if pause > 0:
+                if deadline is not None and time.monotonic() + pause > deadline:
+                    return False
+                time.sleep(pause)
+                continue
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            return self.bucket.acquire(tokens, timeout=remaining)
+
+    def record(self, outcome: str, latency: Optional[float] = None):
+        """
+        Adapt the rate to one observed result
+
+        Args:
+            outcome: ok, error, throttled or challenge
+            latency: Seconds the action took, used to spot latency spikes
+        """
+        with self._lock:
+            if latency is not None and outcome == "ok":
+                spike = self.samples >= 5 and latency > self.latency * self.spike_factor
+                self.latency = latency if self.latency is None else self.latency * 0.8 + latency * 0.2
+                self.samples += 1
+                if spike:
+                    outcome = "slow"
+
+            if outcome == "ok":
+                self.errors = 0
+                rate = min(self.max_rate, self.bucket.rate + self.max_rate * self.recovery)
+            else:
+                if outcome == "error":
+                    self.errors += 1
+                    if self.errors < self.error_streak:
+                        return
+                    self.errors = 0
+                rate = max(self.min_rate, self.bucket.rate * DECREASE_FACTORS.get(outcome, 0.8))
+                self.last_signal = outcome
+                cooldown = {"challenge": self.challenge_cooldown, "throttled": self.throttle_cooldown}.get(outcome)
+                if cooldown:
+                    self.cooldown_until = max(self.cooldown_until, time.monotonic() + cooldown)
+            self.bucket.set_rate(rate)
+
+    def budget(self) -> Dict:
+        """Current rate, tokens and waits for planning"""
+        return {
+            "per_hour": round(self.bucket.rate * 3600, 2),
+            "max_per_hour": round(self.max_rate * 3600, 2),
+            "tokens": round(self.bucket.available(), 2),
+            "burst": self.bucket.capacity,
+            "next_in": round(self.wait_time(), 1),
+            "cooldown": round(max(0.0, self.cooldown_until - time.monotonic()), 1),
+            "last_signal": self.last_signal
+        }
+
+
+class RateController:
+    def __init__(self, limits: Optional[Dict[str, Tuple[float, float]]] = None, **limiter_options):
+        """
+        Adaptive rate limits per LinkedIn account and action (login, post, media_upload)
+
+        Args:
+            limits: (per hour, burst) per action, merged over DEFAULT_ACTION_LIMITS
+            **limiter_options: Passed to every AdaptiveLimiter
+        """
+        self.limits = dict(DEFAULT_ACTION_LIMITS)
+        if limits:
+            self.limits.update(limits)
+        self.limiter_options = limiter_options
+        self._limiters: Dict[Tuple[str, str], Optional[AdaptiveLimiter]] = {}
+        self._overrides: Dict[Tuple[str, str], Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> 'RateController':
+        """Build limits from RATE_LIMIT_<ACTION>_PER_HOUR and RATE_LIMIT_<ACTION>_BURST"""
+        limits = {}
+        for action, (per_hour, burst) in DEFAULT_ACTION_LIMITS.items():
+            name = action.upper()
+            limits[action] = (
+                float(os.getenv(f'RATE_LIMIT_{name}_PER_HOUR', str(per_hour))),
+                float(os.getenv(f'RATE_LIMIT_{name}_BURST', str(burst)))
+            )
+        return cls(limits, challenge_cooldown=float(os.getenv('RATE_LIMIT_CHALLENGE_COOLDOWN', '1800')))
+
+    def configure(self, account: str, action: str, per_hour: Optional[float], burst: float):
+        """Give one account its own limit for an action, e.g. from ACCOUNTS_FILE; per_hour None means unlimited"""
+        with self._lock:
+            self._overrides[(account, action)] = (per_hour, burst)
+            self._limiters.pop((account, action), None)
+
+    def limiter(self, account: str, action: str) -> Optional[AdaptiveLimiter]:
+        """The account's limiter for an action, or None if it is unlimited"""
+        key = (account, action)
+        with self._lock:
+            if key not in self._limiters:
+                if action not in self.limits:
+                    raise ValueError(f"Unknown rate-limited action: {action}")
+                per_hour, burst = self._overrides.get(key, self.limits[action])
+                self._limiters[key] = AdaptiveLimiter(per_hour, burst, **self.limiter_options) if per_hour else None
+            return self._limiters[key]
+
+    def acquire(self, account: str, action: str, tokens: float = 1.0, timeout: Optional[float] = None) -> bool:
+        limiter = self.limiter(account, action)
+        return limiter.acquire(tokens, timeout) if limiter else True
+
+    def wait_time(self, account: str, action: str, tokens: float = 1.0) -> float:
+        limiter = self.limiter(account, action)
+        return limiter.wait_time(tokens) if limiter else 0.0
+
+    def record(self, account: str, action: str, outcome: str, latency: Optional[float] = None):
+        limiter = self.limiter(account, action)
+        if limiter:
+            limiter.record(outcome, latency)
+
+    def budgets(self, account: Optional[str] = None) -> Dict[str, Dict[str, Dict]]:
+        """Current budget of every action, by account"""
+        with self._lock:
+            keys = [key for key in self._limiters if account is None or key[0] == account]
+        if account is not None:
+            keys = sorted(set(keys) | {(account, action) for action in self.limits})
+        budgets: Dict[str, Dict[str, Dict]] = {}
+        for name, action in keys:
+            limiter = self.limiter(name, action)
+            budgets.setdefault(name, {})[action] = limiter.budget() if limiter else {"per_hour": None}
+        return budgets
@@ -0,0 +1,203 @@
+import io
+import csv
+import calendar
+from datetime import datetime, timezone
+from typing import Dict, List, Iterator, Iterable, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+try:
+    import pyarrow
+    import pyarrow.parquet as parquet
+except ImportError:  # pragma: no cover - optional dependency
+    pyarrow = None
+    parquet = None
+
+GRANULARITIES = ('day', 'week', 'month')
+
+# Counts summed per bucket; engagement rate is derived from them
+SUM_FIELDS = ('impressions', 'likes', 'comments', 'shares', 'clicks')
+
+DAY = 86400
+
+# Parquet column types for exported fields; anything unlisted is a string
+PARQUET_TYPES = {
+    'impressions': 'int64',
+    'unique_impressions': 'int64',
+    'likes': 'int64',
+    'comments': 'int64',
+    'shares': 'int64',
+    'clicks': 'int64',
+    'engagement': 'float64',
+}
+
+
+def bucket_start(timestamp: float, granularity: str) -> int:
+    """UTC start of the day, Monday-based week or month containing an epoch timestamp"""
+    day = int(timestamp // DAY)
+    if granularity == 'day':
+        return day * DAY
+    if granularity == 'week':
+        # 1970-01-01 was a Thursday
+        return (day - (day + 3) % 7) * DAY
+    if granularity == 'month':
+        date = datetime.fromtimestamp(day * DAY, timezone.utc)
+        return calendar.timegm((date.year, date.month, 1, 0, 0, 0))
+    raise ValueError(f"Unknown granularity: {granularity}")
+
+
+def bucket_range(start: float, end: float, granularity: str) -> List[int]:
+    """Every bucket start from the bucket containing start through the one containing end"""
+    buckets = []
+    current = bucket_start(start, granularity)
+    while current <= end:
+        buckets.append(current)
+        if granularity == 'month':
+            date = datetime.fromtimestamp(current, timezone.utc)
+            year, month = (date.year + 1, 1) if date.month == 12 else (date.year, date.month + 1)
+            current = calendar.timegm((year, month, 1, 0, 0, 0))
+        else:
+            current += DAY if granularity == 'day' else 7 * DAY
+    return buckets
+
+
+def rollup(columns: Dict[str, Sequence], granularity: str, start: float, end: float) -> List[Dict]:
+    """
+    Sum post counts into time buckets, including empty ones
+
+    Uses NumPy when installed (one pass of integer bucketing and bincount
+    per column); otherwise falls back to a plain loop with the same result.
+
+    Args:
+        columns: published_at plus each of SUM_FIELDS, one value per post
+        granularity: day, week or month
+        start: Epoch seconds the range starts at
+        end: Epoch seconds the range ends at
+
+    Returns:
+        One dict per bucket, oldest first, with start, posts, the summed counts and engagement_rate
+    """
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"Unknown granularity: {granularity}")
+    buckets = bucket_range(start, end, granularity)
+    if np is not None:
+        posts, sums = _rollup_numpy(columns, granularity, buckets)
+    else:
+        posts, sums = _rollup_python(columns, granularity, buckets)
+
+    series = []
+    for i, bucket in enumerate(buckets):
+        counts = {field: int(sums[field][i]) for field in SUM_FIELDS}
+        interactions = counts['likes'] + counts['comments'] + counts['shares'] + counts['clicks']
+        series.append({
+            "start": datetime.fromtimestamp(bucket, timezone.utc).date().isoformat(),
+            "posts": int(posts[i]),
+            **counts,
+            "engagement_rate": round(interactions / counts['impressions'] * 100, 2) if counts['impressions'] else 0.0
+        })
+    return series
+
+
+def _rollup_numpy(columns: Dict[str, Sequence], granularity: str, buckets: List[int]) -> Tuple:
+    published = np.asarray(columns['published_at'], dtype=np.float64)
+    days = np.floor_divide(published, DAY).astype(np.int64)
+    if granularity == 'day':
+        starts = days * DAY
+    elif granularity == 'week':
+        starts = (days - (days + 3) % 7) * DAY
+    else:
+        months = days.astype('datetime64[D]').astype('datetime64[M]')
+        starts = months.astype('datetime64[D]').astype(np.int64) * DAY
+
+    edges = np.asarray(buckets, dtype=np.int64)
+    index = np.searchsorted(edges, starts)
+    inside = (index < len(edges)) & (edges[np.minimum(index, len(edges) - 1)] == starts)
+    index = index[inside]
+
+    posts = np.bincount(index, minlength=len(edges))
+    sums = {
+        field: np.bincount(index, weights=np.asarray(columns[field], dtype=np.float64)[inside], minlength=len(edges))
+        for field in SUM_FIELDS
+    }
+    return posts, sums
+
+
+def _rollup_python(columns: Dict[str, Sequence], granularity: str, buckets: List[int]) -> Tuple:
+    positions = {bucket: i for i, bucket in enumerate(buckets)}
+    posts = [0] * len(buckets)
+    sums = {field: [0] * len(buckets) for field in SUM_FIELDS}
+    for row, published in enumerate(columns['published_at']):
+        i = positions.get(bucket_start(published, granularity))
+        if i is None:
+            continue
+        posts[i] += 1
+        for field in SUM_FIELDS:
+            sums[field][i] += columns[field][row]
+    return posts, sums
+
+
+def stream_csv(fields: Sequence[str], batches: Iterable[List[tuple]]) -> Iterator[str]:
+    """CSV text one batch of rows at a time, header first"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    for batch in batches:
+        writer.writerows(batch)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def stream_parquet(fields: Sequence[str], batches: Iterable[List[tuple]]) -> Iterator[bytes]:
+    """
+    Parquet file bytes written one row group per batch of rows
+
+    Raises:
+        RuntimeError: If pyarrow is not installed
+    """
+    if pyarrow is None:
+        raise RuntimeError("Parquet export requires pyarrow")
+    schema = pyarrow.schema([(field, PARQUET_TYPES.get(field, 'string')) for field in fields])
+    sink = _ChunkSink()
+    with parquet.ParquetWriter(sink, schema) as writer:
+        for batch in batches:
+            columns = list(zip(*batch)) if batch else [() for _ in fields]
+            writer.write_table(pyarrow.Table.from_arrays(
+                [pyarrow.array(column, type=schema.field(i).type) for i, column in enumerate(columns)],
+                schema=schema
+            ))
+            chunk = sink.drain()
+            if chunk:
+                yield chunk
+    yield sink.drain()
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands its bytes over as they are written"""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
@@ -0,0 +1,393 @@
+import os
+import json
+import time
+import uuid
+import heapq
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Optional, Dict, List
+
+DEFAULT_DB_PATH = os.path.join(os.getcwd(), 'scheduled_posts.db')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scheduled_posts (
+    id TEXT PRIMARY KEY,
+    text TEXT NOT NULL,
+    media_urls TEXT,
+    company_id TEXT,
+    schedule_time REAL NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    revision INTEGER NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    result TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_scheduled_posts_due ON scheduled_posts (status, schedule_time);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_scheduled_posts_revision ON scheduled_posts (revision);
+"""
+
+
+class PostQueue:
+    def __init__(self, db_path: str = DEFAULT_DB_PATH):
+        """
+        Durable SQLite queue of scheduled posts
+
+        Pending posts are indexed by (status, schedule_time), so enqueueing and
+        finding the next due post are B-tree operations. Every change bumps a
+        monotonically increasing revision, which lets a worker pick up only the
+        rows changed since its last look instead of rescanning the table.
+
+        Args:
+            db_path: SQLite database file
+        """
+        self.db_path = db_path
+        self._local = threading.local()
+        self._conn().executescript(SCHEMA)
+
+    @classmethod
+    def from_env(cls) -> 'PostQueue':
+        """Build a queue at SCHEDULER_DB_PATH"""
+        return cls(os.getenv('SCHEDULER_DB_PATH', DEFAULT_DB_PATH))
+
+    def enqueue(self, text: str, schedule_time: datetime, media_urls: Optional[List[str]] = None,
+                company_id: Optional[str] = None) -> Dict:
+        """
+        Add a post to the queue
+
+        Args:
+            text: Post content
+            schedule_time: When to publish (naive datetimes are local time)
+            media_urls: Optional list of media URLs to attach
+            company_id: Optional company page to post as
+
+        Returns:
+            The queued post
+        """
+        post_id = uuid.uuid4().hex
+        now = time.time()
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO scheduled_posts "
+                "(id, text, media_urls, company_id, schedule_time, revision, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (post_id, text, json.dumps(media_urls or []), company_id,
+                 schedule_time.timestamp(), self._next_revision(conn), now, now)
+            )
+        return self.get(post_id)
+
+    def get(self, post_id: str) -> Optional[Dict]:
+        """Return a queued post by id"""
+        row = self._conn().execute("SELECT * FROM scheduled_posts WHERE id = ?", (post_id,)).fetchone()
+        return self._to_dict(row) if row else None
+
+    def list(self, status: Optional[str] = 'pending', limit: int = 100, offset: int = 0) -> List[Dict]:
+        """
+        List posts in due-time order
+
+        Args:
+            status: Status to filter on, or None for all posts
+            limit: Maximum number of posts
+            offset: Number of posts to skip
+
+        Returns:
+            List of posts
+        """
+        if status:
+            rows = self._conn().execute(
+                "SELECT * FROM scheduled_posts WHERE status = ? ORDER BY schedule_time LIMIT ? OFFSET ?",
+                (status, limit, offset)
+            ).fetchall()
+        else:
+            rows = self._conn().execute(
+                "SELECT * FROM scheduled_posts ORDER BY schedule_time LIMIT ? OFFSET ?",
+                (limit, offset)
+            ).fetchall()
+        return [self._to_dict(row) for row in rows]
+
+    def cancel(self, post_id: str) -> bool:
+        """
+        Cancel a pending post
+
+        Returns:
+            True if a pending post was cancelled
+        """
+        return self._update_pending(post_id, "status = 'cancelled'")
+
+    def reschedule(self, post_id: str, schedule_time: datetime) -> bool:
+        """
+        Move a pending post to a new time
+
+        Returns:
+            True if a pending post was rescheduled
+        """
+        return self._update_pending(post_id, "schedule_time = ?", (schedule_time.timestamp(),))
+
+    def next_due_time(self) -> Optional[float]:
+        """Epoch time of the earliest pending post"""
+        row = self._conn().execute(
+            "SELECT schedule_time FROM scheduled_posts WHERE status = 'pending' ORDER BY schedule_time LIMIT 1"
+        ).fetchone()
+        return row["schedule_time"] if row else None
+
+    def changes_since(self, revision: int) -> List[Dict]:
+        """Posts changed after the given revision, oldest change first"""
+        rows = self._conn().execute(
+            "SELECT * FROM scheduled_posts WHERE revision > ? ORDER BY revision", (revision,)
+        ).fetchall()
+        return [self._to_dict(row) for row in rows]
+
+    def claim(self, post_id: str, revision: int) -> Optional[Dict]:
+        """
+        Mark a pending post as running if it has not changed since the worker saw it
+
+        Returns:
+            The claimed post, or None if it was cancelled, rescheduled or already taken
+        """
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE scheduled_posts SET status = 'running', attempts = attempts + 1, "
+                "revision = ?, updated_at = ? WHERE id = ? AND revision = ? AND status = 'pending'",
+                (self._next_revision(conn), time.time(), post_id, revision)
+            )
+            if cursor.rowcount == 0:
+                return None
+        return self.get(post_id)
+
+    def complete(self, post_id: str, result: Dict):
+        """Record a published post"""
+        self._finish(post_id, 'posted', result=result)
+
+    def fail(self, post_id: str, error: str, retry_at: Optional[float] = None):
+        """Record a failed attempt, requeueing it at retry_at if given"""
+        if retry_at is None:
+            self._finish(post_id, 'failed', error=error)
+            return
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE scheduled_posts SET status = 'pending', schedule_time = ?, last_error = ?, "
+                "revision = ?, updated_at = ? WHERE id = ?",
+                (retry_at, error, self._next_revision(conn), time.time(), post_id)
+            )
+
+    def recover_interrupted(self) -> int:
+        """
+        Return posts left running by a crashed worker to the queue
+
+        Returns:
+            Number of posts requeued
+        """
+        with self._transaction() as conn:
+            rows = conn.execute("SELECT id FROM scheduled_posts WHERE status = 'running'").fetchall()
+            for row in rows:
+                conn.execute(
+                    "UPDATE scheduled_posts SET status = 'pending', last_error = 'Interrupted', "
+                    "revision = ?, updated_at = ? WHERE id = ?",
+                    (self._next_revision(conn), time.time(), row["id"])
+                )
+        return len(rows)
+
+    def _finish(self, post_id: str, status: str, result: Optional[Dict] = None, error: Optional[str] = None):
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE scheduled_posts SET status = ?, result = ?, last_error = ?, "
+                "revision = ?, updated_at = ? WHERE id = ?",
+                (status, json.dumps(result) if result is not None else None, error,
+                 self._next_revision(conn), time.time(), post_id)
+            )
+
+    def _update_pending(self, post_id: str, assignment: str, params: tuple = ()) -> bool:
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                f"UPDATE scheduled_posts SET {assignment}, revision = ?, updated_at = ? "
+                "WHERE id = ? AND status = 'pending'",
+                params + (self._next_revision(conn), time.time(), post_id)
+            )
+            return cursor.rowcount > 0
+
+    def _next_revision(self, conn) -> int:
+        # MAX over the unique revision index is a single B-tree lookup
+        return conn.execute("SELECT COALESCE(MAX(revision), 0) + 1 FROM scheduled_posts").fetchone()[0]
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _transaction(self):
+        return _Transaction(self._conn())
+
+    def _to_dict(self, row: sqlite3.Row) -> Dict:
+        post = dict(row)
+        post["media_urls"] = json.loads(post["media_urls"] or '[]')
+        post["result"] = json.loads(post["result"]) if post["result"] else None
+        post["schedule_time"] = datetime.fromtimestamp(post["schedule_time"]).isoformat()
+        return post
+
+
+class _Transaction:
+    """BEGIN IMMEDIATE ... COMMIT block so revision numbers are allocated under the write lock"""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+    def __enter__(self) -> sqlite3.Connection:
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        return False
+
+
+class SchedulerWorker:
+    def __init__(self, post_queue: PostQueue, linkedin, poll_interval: float = 5.0,
+                 max_attempts: int = 3, retry_delay: float = 300.0):
+        """
+        Publishes queued posts when they fall due
+
+        The worker keeps an in-memory min-heap of (due time, revision, id) and
+        sleeps until the earliest entry is due. Changes made by other
+        processes are picked up incrementally by revision; heap entries whose
+        revision no longer matches the database are skipped when popped.
+        When the account's post budget is spent, due posts stay queued until
+        the rate controller's next slot instead of being claimed and retried.
+
+        Args:
+            post_queue: Queue to consume
+            linkedin: LinkedInAutomation used to publish
+            poll_interval: Maximum seconds between checks for new or changed posts
+            max_attempts: Attempts before a post is marked failed
+            retry_delay: Base seconds before retrying a failed post
+        """
+        self.queue = post_queue
+        self.linkedin = linkedin
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self._heap = []
+        self._revision = 0
+        self._stop = threading.Event()
+        self._throttled_until = 0.0
+
+    def run_forever(self):
+        """Publish due posts until stop() is called"""
+        requeued = self.queue.recover_interrupted()
+        if requeued:
+            print(f"Requeued {requeued} interrupted scheduled posts")
+
+        print("Scheduler worker started")
+        while not self._stop.is_set():
+            self._sync()
+            self._run_due()
+
+            # Sleep until the next post is due, but wake up to pick up new posts
+            wait = self.poll_interval
+            if self._heap:
+                wait = max(0.0, min(wait, max(self._heap[0][0], self._throttled_until) - time.time()))
+            self._stop.wait(wait)
+
+    def stop(self):
+        self._stop.set()
+
+    def _sync(self):
+        """Push posts changed since the last sync onto the heap"""
+        for post in self.queue.changes_since(self._revision):
+            self._revision = max(self._revision, post["revision"])
+            if post["status"] == 'pending':
+                due = datetime.fromisoformat(post["schedule_time"]).timestamp()
+                heapq.heappush(self._heap, (due, post["revision"], post["id"]))
+
+    def _run_due(self):
+        """Publish every post whose due time has passed, in due-time order"""
+        while self._heap and self._heap[0][0] <= time.time() and not self._stop.is_set():
+            delay = self._post_delay()
+            if delay > 0:
+                self._throttled_until = time.time() + delay
+                return
+            _, revision, post_id = heapq.heappop(self._heap)
+
+            # Stale entries (cancelled, rescheduled, already run) fail the revision check
+            post = self.queue.claim(post_id, revision)
+            if post:
+                self._publish(post)
+
+    def _post_delay(self) -> float:
+        """Seconds until the account may post again"""
+        controller = getattr(self.linkedin, 'rate_controller', None)
+        return controller.wait_time(self.linkedin.username, "post") if controller else 0.0
+
+    def _publish(self, post: Dict):
+        print(f"Publishing scheduled post {post['id']}")
+        try:
+            result = self.linkedin.create_post(
+                text=post["text"],
+                media_urls=post["media_urls"] or None,
+                company_id=post["company_id"]
+            )
+        except Exception as e:
+            result = {"success": False, "error": str(e)}
+
+        activity_log = self.linkedin.activity_log
+        if result.get("success"):
+            self.queue.complete(post["id"], result)
+            activity_log.record("schedule", "Scheduled post published", post["text"][:100],
+                                account=self.linkedin.username, scheduled_post_id=post["id"])
+            return
+
+        error = result.get("error", "Unknown error")
+        # Challenges, stale selectors and rejected credentials won't fix themselves by waiting
+        if post["attempts"] < self.max_attempts and result.get("retryable", True):
+            retry_at = time.time() + self.retry_delay * (2 ** (post["attempts"] - 1))
+            if result.get("retry_after"):
+                retry_at = max(retry_at, time.time() + result["retry_after"])
+            print(f"Scheduled post {post['id']} failed, retrying at {datetime.fromtimestamp(retry_at)}: {error}")
+            self.queue.fail(post["id"], error, retry_at=retry_at)
+            activity_log.record("schedule", "Scheduled post will retry", error, account=self.linkedin.username,
+                                status="retrying", scheduled_post_id=post["id"],
+                                retry_at=datetime.fromtimestamp(retry_at).isoformat())
+        else:
+            print(f"Scheduled post {post['id']} failed permanently: {error}")
+            self.queue.fail(post["id"], error)
+            activity_log.record("schedule", "Scheduled post failed", error, account=self.linkedin.username,
+                                status="failed", scheduled_post_id=post["id"])
+
+
+def main():
+    from linkedin_manager import LinkedInAutomation
+    from session_store import SessionStore
+    from settings import settings
+
+    username, password = settings.require('LINKEDIN_USERNAME', 'LINKEDIN_PASSWORD')
+    linkedin = LinkedInAutomation(
+        linkedin_username=username,
+        linkedin_password=password,
+        # Its own port, so this worker's Chrome never collides with the web app's
+        debugging_port=settings.scheduler_debugging_port,
+        session_store=SessionStore.from_env()
+    )
+    if settings.company_id:
+        linkedin.set_company_id(settings.company_id)
+
+    worker = SchedulerWorker(
+        PostQueue.from_env(),
+        linkedin,
+        poll_interval=float(os.getenv('SCHEDULER_POLL_INTERVAL', '5'))
+    )
+    try:
+        worker.run_forever()
+    except KeyboardInterrupt:
+        print("Scheduler worker stopping")
+    finally:
+        linkedin.close()
+
+
+if __name__ == "__main__":
+    main()
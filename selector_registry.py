@@ -0,0 +1,235 @@
+import os
+import json
+import time
+import threading
+from typing import Optional, Dict, List, Iterable, Tuple
+
+import metrics
+
+# Bump when the built-in chains change so stats and override files can be matched to them
+REGISTRY_VERSION = "2026.10"
+
+# Ordered fallback chains: the first candidate is the current LinkedIn markup,
+# later ones are older or more generic forms tried when it stops matching.
+# Chains containing {placeholders} are templates filled in by locator(name, **params).
+DEFAULT_SELECTORS = {
+    "login_username": ("#username", "input[name='session_key']", "input[autocomplete='username']"),
+    "login_password": ("#password", "input[name='session_password']", "input[type='password']"),
+    "login_submit": ("button[type='submit']", "button[data-litms-control-urn='login-submit']"),
+    "logged_in_marker": ("#global-nav", "header[class*='global-nav']", "nav[aria-label='Primary Navigation']"),
+    "start_post_button": (
+        "button[class*='share-box-feed-entry__trigger']",
+        "button[aria-label*='Start a post']",
+        "div[class*='share-box'] button[class*='artdeco-button']",
+    ),
+    "post_editor": (
+        "div[data-placeholder='What do you want to talk about?']",
+        "div[role='dialog'] div.ql-editor[contenteditable='true']",
+        "div[role='dialog'] div[role='textbox'][contenteditable='true']",
+    ),
+    "actor_toggle": ("button[class*='share-actor-toggle']", "button[aria-label*='Posting as']"),
+    "company_option": ("div[data-company-id='{company_id}']", "li[data-entity-urn$=':{company_id}']"),
+    "add_media_button": ("button[aria-label*='Add media']", "button[aria-label*='Add a photo']"),
+    "media_drop_zone": ("div[class*='file-upload-input']", "div[class*='share-images__dropzone']"),
+    "media_file_input": ("input[type='file']",),
+    "media_preview": ("img[class*='share-mixed-media-image']", "div[class*='share-media-preview'] img"),
+    "post_button": (
+        "button[class*='share-actions__primary-action']",
+        "div[role='dialog'] button[aria-label='Post']",
+    ),
+    "post_toast": ("div[class*='artdeco-toast-item']", "div[role='alert'][class*='toast']"),
+}
+
+# Tries each candidate in order inside the page, so a whole chain costs one
+# WebDriver round-trip and a missing element never pays the implicit wait.
+# Returns the index of the first candidate that matched (-1 for none), the
+# element if it is also in the requested state, and each query's time in ms.
+PROBE_JS = """
+    var candidates = arguments[0], mode = arguments[1], times = [];
+    for (var i = 0; i < candidates.length; i++) {
+        var start = performance.now(), element = null, count = 0;
+        try {
+            if (mode === 'count') {
+                count = document.querySelectorAll(candidates[i]).length;
+            } else {
+                element = document.querySelector(candidates[i]);
+            }
+        } catch (e) {}
+        times.push(performance.now() - start);
+        if (mode === 'count') {
+            if (count) { return {index: i, element: null, count: count, times: times}; }
+            continue;
+        }
+        if (!element) { continue; }
+        if (mode === 'clickable') {
+            var rect = element.getBoundingClientRect();
+            if (element.disabled || element.getAttribute('aria-disabled') === 'true' || !rect.width || !rect.height) {
+                element = null;
+            }
+        } else if (mode === 'editable' && element.getAttribute('contenteditable') !== 'true') {
+            element = null;
+        }
+        return {index: i, element: element, count: 1, times: times};
+    }
+    return {index: -1, element: null, count: 0, times: times};
+"""
+
+MODES = ('present', 'clickable', 'editable', 'count')
+
+
+class Locator:
+    def __init__(self, name: Optional[str], candidates: Iterable[str], registry: Optional['SelectorRegistry'] = None):
+        """
+        A named fallback chain, ready to probe
+
+        Args:
+            name: Registry name used in stats, or None for an ad-hoc selector that isn't recorded
+            candidates: CSS selectors in the order they are tried
+            registry: SelectorRegistry stats are recorded to
+        """
+        self.name = name
+        self.candidates = list(candidates)
+        # Selector group matching any candidate, for scripts that only need "is something there"
+        self.group = ', '.join(self.candidates)
+        self.registry = registry
+
+    def probe(self, driver, mode: str = 'present') -> Dict:
+        """
+        Find the first matching candidate in one execute_script call
+
+        Args:
+            driver: WebDriver to query
+            mode: present, clickable (visible and enabled), editable (contenteditable) or count
+
+        Returns:
+            Dict with index (-1 if nothing matched), selector, element (None unless in the requested state) and count
+        """
+        start = time.perf_counter()
+        found = driver.execute_script(PROBE_JS, self.candidates, mode)
+        if self.registry is not None:
+            self.registry.record(self, found["index"], found.get("times") or [], time.perf_counter() - start)
+        found["selector"] = self.candidates[found["index"]] if found["index"] >= 0 else None
+        return found
+
+    def __repr__(self):
+        return f"Locator({self.name or self.candidates[0]!r})"
+
+
+class SelectorRegistry:
+    def __init__(self, selectors: Optional[Dict[str, Iterable[str]]] = None, version: str = REGISTRY_VERSION):
+        """
+        Versioned registry of the selector chains the Selenium flows use
+
+        Locators are built once per name (and per parameter set for templates)
+        and every probe records which candidate hit and how long it took, so
+        a primary selector LinkedIn has broken shows up as fallback hits or
+        misses instead of silent timeouts.
+
+        Args:
+            selectors: Chains by name, replacing the built-in chain of the same name
+            version: Version reported with stats
+        """
+        self.version = version
+        self.selectors = {name: tuple(chain) for name, chain in DEFAULT_SELECTORS.items()}
+        for name, chain in (selectors or {}).items():
+            self.selectors[name] = tuple(chain)
+        self._locators: Dict[Tuple, Locator] = {}
+        self._stats: Dict[str, Dict] = {}
+        self._warned = set()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> 'SelectorRegistry':
+        """
+        Built-in chains, overridden by the JSON file at SELECTOR_REGISTRY_PATH if set
+
+        The file holds {"version": "...", "selectors": {"post_button": ["...", ...]}},
+        so selectors can be fixed after a LinkedIn change without a release.
+        """
+        path = os.getenv('SELECTOR_REGISTRY_PATH')
+        if not path:
+            return cls()
+        with open(path) as f:
+            data = json.load(f)
+        return cls(data.get("selectors"), version=data.get("version", f"{REGISTRY_VERSION}+{os.path.basename(path)}"))
+
+    def locator(self, name: str, **params) -> Locator:
+        """
+        The precompiled Locator for a chain
+
+        Args:
+            name: Chain name
+            **params: Values for a template chain's placeholders, e.g. company_id
+
+        Raises:
+            KeyError: For an unknown name
+        """
+        key = (name,) + tuple(sorted(params.items()))
+        locator = self._locators.get(key)
+        if locator is None:
+            if name not in self.selectors:
+                raise KeyError(f"Unknown selector: {name}")
+            candidates = [candidate.format(**params) if params else candidate for candidate in self.selectors[name]]
+            with self._lock:
+                locator = self._locators.setdefault(key, Locator(name, candidates, self))
+        return locator
+
+    def record(self, locator: Locator, index: int, query_ms: List[float], elapsed: float):
+        """Count a probe's hit or miss and its latency"""
+        with self._lock:
+            stats = self._stats.get(locator.name)
+            if stats is None:
+                stats = self._stats[locator.name] = {
+                    "probes": 0, "misses": 0, "seconds": 0.0, "max_seconds": 0.0, "candidates": {}
+                }
+            stats["probes"] += 1
+            stats["seconds"] += elapsed
+            stats["max_seconds"] = max(stats["max_seconds"], elapsed)
+            if index < 0:
+                stats["misses"] += 1
+            for position, ms in enumerate(query_ms):
+                candidate = stats["candidates"].setdefault(locator.candidates[position], {"hits": 0, "query_ms": 0.0})
+                candidate["query_ms"] += ms
+                if position == index:
+                    candidate["hits"] += 1
+            warn = index > 0 and (locator.name, index) not in self._warned
+            if warn:
+                self._warned.add((locator.name, index))
+
+        metrics.observe("linkedin_selector_probe_seconds", elapsed, locator=locator.name)
+        metrics.increment("linkedin_selector_hits_total", locator=locator.name,
+                          candidate=str(index) if index >= 0 else "none")
+        if warn:
+            print(f"Selector {locator.name} fell back to {locator.candidates[index]!r}; "
+                  f"{locator.candidates[0]!r} may be stale")
+
+    def summary(self) -> Dict:
+        """
+        Per-chain probe counts, latency and hits by candidate
+
+        A candidate listed under "dead" has never matched although a later
+        candidate in its chain has.
+        """
+        with self._lock:
+            chains = {}
+            for name, stats in self._stats.items():
+                candidates = {
+                    selector: {"hits": candidate["hits"], "query_ms": round(candidate["query_ms"], 3)}
+                    for selector, candidate in stats["candidates"].items()
+                }
+                hits = [candidate["hits"] for candidate in candidates.values()]
+                chains[name] = {
+                    "probes": stats["probes"],
+                    "misses": stats["misses"],
+                    "mean_seconds": round(stats["seconds"] / stats["probes"], 4),
+                    "max_seconds": round(stats["max_seconds"], 4),
+                    "candidates": candidates,
+                    "dead": [selector for position, selector in enumerate(candidates)
+                             if hits[position] == 0 and any(hits[position + 1:])]
+                }
+        return {"version": self.version, "chains": chains}
+
+
+def as_locator(target) -> Locator:
+    """A Locator for target, wrapping a plain CSS string in an unrecorded one"""
+    return target if isinstance(target, Locator) else Locator(None, (target,))
@@ -0,0 +1,238 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from typing import Optional, Dict
+
+try:
+    from cryptography.fernet import Fernet, InvalidToken
+except ImportError:  # pragma: no cover - optional dependency
+    Fernet = None
+    InvalidToken = Exception
+
+from settings import settings
+
+# Length of a Fernet key (32 bytes, URL-safe base64); anything shorter is still being written
+KEY_LENGTH = 44
+
+# Pages LinkedIn redirects to when a restored session is not accepted
+LOGGED_OUT_MARKERS = ('/login', '/authwall', '/checkpoint', '/uas/')
+
+READ_LOCAL_STORAGE_JS = """
+    var items = {};
+    for (var i = 0; i < window.localStorage.length; i++) {
+        var key = window.localStorage.key(i);
+        items[key] = window.localStorage.getItem(key);
+    }
+    return items;
+"""
+
+WRITE_LOCAL_STORAGE_JS = """
+    var items = arguments[0];
+    for (var key in items) {
+        window.localStorage.setItem(key, items[key]);
+    }
+"""
+
+
+class SessionStore:
+    def __init__(self, directory: str, key: Optional[bytes] = None, max_age: float = 7 * 24 * 3600):
+        """
+        Encrypted on-disk store of authenticated LinkedIn browser sessions
+
+        Cookies and local storage are serialized per username and encrypted
+        with Fernet. When no key is given, one is generated on first use and
+        kept next to the sessions with owner-only permissions.
+
+        Args:
+            directory: Directory holding the encrypted session files
+            key: Fernet key; read from or written to directory/.session_key if omitted
+            max_age: Seconds after which a saved session is ignored
+        """
+        if Fernet is None:
+            raise ImportError("The 'cryptography' package is required for the session store. "
+                              "Install it with: pip install cryptography")
+
+        self.directory = directory
+        self.max_age = max_age
+        os.makedirs(directory, exist_ok=True)
+        self._fernet = Fernet(key or self._load_or_create_key())
+
+    @classmethod
+    def from_env(cls) -> Optional['SessionStore']:
+        """
+        Build a store from SESSION_STORE_DIR / SESSION_STORE_KEY
+
+        Returns:
+            SessionStore, or None if it is disabled or cannot be created
+        """
+        directory = os.getenv('SESSION_STORE_DIR', os.path.join(os.getcwd(), '.linkedin_sessions'))
+        if os.getenv('SESSION_STORE_DISABLED', '').lower() in ('1', 'true', 'yes'):
+            return None
+
+        key = os.getenv('SESSION_STORE_KEY')
+        try:
+            return cls(directory, key=key.encode() if key else None)
+        except Exception as e:
+            print(f"Session store disabled: {str(e)}")
+            return None
+
+    def save(self, driver, username: str) -> str:
+        """
+        Serialize the driver's cookies and local storage for a user
+
+        Args:
+            driver: Logged-in WebDriver on a linkedin.com page
+            username: Account the session belongs to
+
+        Returns:
+            Path of the written session file
+        """
+        payload = {
+            "username": username,
+            "saved_at": time.time(),
+            "cookies": driver.get_cookies(),
+            "local_storage": driver.execute_script(READ_LOCAL_STORAGE_JS) or {}
+        }
+        token = self._fernet.encrypt(json.dumps(payload).encode('utf-8'))
+
+        # Write atomically so a crash never leaves a truncated session behind
+        path = self._path(username)
+        temp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(temp_path, 'wb') as f:
+            f.write(token)
+        os.chmod(temp_path, 0o600)
+        os.replace(temp_path, path)
+        return path
+
+    def load(self, username: str) -> Optional[Dict]:
+        """
+        Read and decrypt a saved session
+
+        Args:
+            username: Account to look up
+
+        Returns:
+            Session payload, or None if missing, expired or unreadable
+        """
+        path = self._path(username)
+        if not os.path.exists(path):
+            return None
+
+        try:
+            with open(path, 'rb') as f:
+                payload = json.loads(self._fernet.decrypt(f.read()).decode('utf-8'))
+        except (InvalidToken, ValueError, OSError) as e:
+            print(f"Discarding unreadable session for {username}: {str(e)}")
+            self.delete(username)
+            return None
+
+        if payload.get("username") != username or time.time() - payload.get("saved_at", 0) > self.max_age:
+            self.delete(username)
+            return None
+        return payload
+
+    def restore(self, driver, username: str) -> bool:
+        """
+        Rehydrate a saved session into the driver and check that it is still valid
+
+        Args:
+            driver: Fresh WebDriver
+            username: Account to restore
+
+        Returns:
+            True if the driver is logged in after restoring
+        """
+        payload = self.load(username)
+        if not payload:
+            return False
+
+        # Cookies can only be set for the domain currently loaded
+        driver.get(f'{settings.linkedin_base_url}/robots.txt')
+        for cookie in payload.get("cookies", []):
+            cookie = dict(cookie)
+            if 'expiry' in cookie:
+                cookie['expiry'] = int(cookie['expiry'])
+            if cookie.get('sameSite') not in ('Strict', 'Lax', 'None'):
+                cookie.pop('sameSite', None)
+            try:
+                driver.add_cookie(cookie)
+            except Exception as e:
+                print(f"Skipping cookie {cookie.get('name')}: {str(e)}")
+
+        if payload.get("local_storage"):
+            driver.execute_script(WRITE_LOCAL_STORAGE_JS, payload["local_storage"])
+
+        # Single validation navigation: a dead session redirects to a login wall
+        driver.get(f'{settings.linkedin_base_url}/feed/')
+        current_url = driver.current_url
+        if any(marker in current_url for marker in LOGGED_OUT_MARKERS):
+            print(f"Saved session for {username} is no longer valid")
+            self.delete(username)
+            return False
+        return True
+
+    def delete(self, username: str):
+        """Remove a saved session"""
+        try:
+            os.remove(self._path(username))
+        except FileNotFoundError:
+            pass
+
+    def _path(self, username: str) -> str:
+        digest = hashlib.sha256(username.lower().encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, f'{digest}.session')
+
+    def _load_or_create_key(self, timeout: float = 5.0) -> bytes:
+        """
+        Read the shared key, creating it if this is the first process to need it
+
+        The key is written to a temp file and only then linked into place, so
+        no process ever sees a partly written key. A short key (e.g. one still
+        being written by an older version) is re-read until timeout rather
+        than handed to Fernet, which would make from_env disable the store.
+        """
+        key_path = os.path.join(self.directory, '.session_key')
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                with open(key_path, 'rb') as f:
+                    key = f.read().strip()
+            except FileNotFoundError:
+                key = self._create_key(key_path)
+                if key is None:
+                    # Another worker created the key first; read theirs
+                    continue
+            if len(key) >= KEY_LENGTH:
+                return key
+            if time.monotonic() > deadline:
+                raise ValueError(f"Session key in {key_path} is incomplete")
+            time.sleep(0.05)
+
+    def _create_key(self, key_path: str) -> Optional[bytes]:
+        """Write a new key to key_path, or None if another process got there first"""
+        key = Fernet.generate_key()
+        temp_path = f'{key_path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(key)
+                f.flush()
+                os.fsync(f.fileno())
+            try:
+                # Unlike os.replace, a hard link never overwrites a key another worker already uses
+                os.link(temp_path, key_path)
+            except FileExistsError:
+                return None
+            except OSError:
+                # No hard links on this filesystem; the rename is still atomic
+                if os.path.exists(key_path):
+                    return None
+                os.replace(temp_path, key_path)
+            return key
+        finally:
+            try:
+                os.remove(temp_path)
+            except FileNotFoundError:
+                pass
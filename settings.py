@@ -0,0 +1,96 @@
+import os
+import threading
+from typing import Optional
+
+DEFAULT_LINKEDIN_BASE_URL = "https://www.linkedin.com"
+DEFAULT_DEBUGGING_PORT = 9222
+# Below the web app's port blocks, so the scheduler worker's browser never meets them
+DEFAULT_SCHEDULER_DEBUGGING_PORT = DEFAULT_DEBUGGING_PORT - 1
+
+
+class SettingsError(ValueError):
+    """Raised when a setting a feature needs is not configured"""
+
+
+class Settings:
+    def __init__(self, env_file: Optional[str] = None):
+        """
+        Environment-backed configuration, read on first use rather than at import
+
+        The .env file is loaded the first time any setting is read, and
+        missing values only raise when a feature that needs them asks via
+        require(), so importing a module never fails for lack of credentials.
+
+        Args:
+            env_file: .env file to load; python-dotenv searches upwards from the caller if omitted
+        """
+        self.env_file = env_file
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def load(self):
+        """Load the .env file once; variables already in the environment win"""
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            try:
+                from dotenv import load_dotenv
+            except ImportError:  # pragma: no cover - optional dependency
+                load_dotenv = None
+            if load_dotenv:
+                load_dotenv(self.env_file)
+            self._loaded = True
+
+    def get(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        self.load()
+        return os.getenv(name, default)
+
+    def require(self, *names: str) -> tuple:
+        """
+        Values of settings that must be set
+
+        Raises:
+            SettingsError: Naming every missing variable
+        """
+        values = tuple(self.get(name) for name in names)
+        missing = [name for name, value in zip(names, values) if not value]
+        if missing:
+            raise SettingsError(f"Missing required environment variables: {', '.join(missing)}. "
+                                "Please set them in your .env file.")
+        return values
+
+    @property
+    def linkedin_username(self) -> Optional[str]:
+        return self.get('LINKEDIN_USERNAME')
+
+    @property
+    def linkedin_password(self) -> Optional[str]:
+        return self.get('LINKEDIN_PASSWORD')
+
+    @property
+    def company_id(self) -> Optional[str]:
+        return self.get('COMPANY_ID')
+
+    @property
+    def groq_api_key(self) -> Optional[str]:
+        return self.get('GROQ_API_KEY')
+
+    @property
+    def linkedin_base_url(self) -> str:
+        """LinkedIn site root; point at a local stand-in for benchmarking"""
+        return self.get('LINKEDIN_BASE_URL', DEFAULT_LINKEDIN_BASE_URL).rstrip('/')
+
+    @property
+    def debugging_port(self) -> int:
+        """Chrome remote debugging port of the web app's main automation; its pool uses the ports after it"""
+        return int(self.get('DEBUGGING_PORT', str(DEFAULT_DEBUGGING_PORT)))
+
+    @property
+    def scheduler_debugging_port(self) -> int:
+        """Chrome remote debugging port of the scheduler worker, which runs alongside the web app"""
+        return int(self.get('SCHEDULER_DEBUGGING_PORT', str(DEFAULT_SCHEDULER_DEBUGGING_PORT)))
+
+
+settings = Settings()
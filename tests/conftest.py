@@ -0,0 +1,23 @@
+import os
+import sys
+
+import pytest
+
+# Run from anywhere: the modules live flat in the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.groq_stub import GroqStub
+from benchmarks.mock_linkedin_api import MockLinkedInAPI
+
+
+@pytest.fixture
+def groq_stub():
+    with GroqStub(first_token_latency=0.0, tokens_per_second=100000.0, completion_tokens=20,
+                  retry_after=0.0) as stub:
+        yield stub
+
+
+@pytest.fixture
+def linkedin_api_stub():
+    with MockLinkedInAPI(access_token='test-token', upload_latency=0.0, publish_latency=0.0) as stub:
+        yield stub
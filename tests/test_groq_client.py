@@ -0,0 +1,112 @@
+import pytest
+
+from groq_client import GroqClient, GroqAPIError
+
+MESSAGES = [{"role": "user", "content": "Write a post"}]
+
+
+def make_client(stub, **overrides):
+    options = dict(api_url=stub.api_url, max_retries=3, backoff_base=0.01, backoff_cap=1.0,
+                   requests_per_minute=None)
+    options.update(overrides)
+    return GroqClient('test-key', **options)
+
+
+def test_chat_returns_content(groq_stub):
+    client = make_client(groq_stub)
+    try:
+        content = client.chat(MESSAGES, 'stub-model')
+    finally:
+        client.close()
+    assert len(content.split()) == 20
+    assert client.stats == {"requests": 1, "retries": 0, "failures": 0}
+
+
+def test_retries_rate_limits_and_server_errors(groq_stub):
+    groq_stub.fail_next(429, 503, 500)
+    client = make_client(groq_stub)
+    try:
+        assert client.chat(MESSAGES, 'stub-model')
+    finally:
+        client.close()
+    assert groq_stub.requests == 4
+    assert client.stats["retries"] == 3
+
+
+def test_gives_up_after_max_retries(groq_stub):
+    groq_stub.fail_next(503, 503, 503)
+    client = make_client(groq_stub, max_retries=2)
+    try:
+        with pytest.raises(GroqAPIError) as raised:
+            client.chat(MESSAGES, 'stub-model')
+    finally:
+        client.close()
+    assert raised.value.status_code == 503
+    assert groq_stub.requests == 3
+    assert client.stats["failures"] == 1
+
+
+def test_does_not_retry_client_errors(groq_stub):
+    groq_stub.fail_next(400)
+    client = make_client(groq_stub)
+    try:
+        with pytest.raises(GroqAPIError) as raised:
+            client.chat(MESSAGES, 'stub-model')
+    finally:
+        client.close()
+    assert raised.value.status_code == 400
+    assert groq_stub.requests == 1
+
+
+def test_surfaces_retry_after_beyond_backoff_cap(groq_stub):
+    groq_stub.retry_after = 120
+    groq_stub.fail_next(429)
+    client = make_client(groq_stub)
+    try:
+        with pytest.raises(GroqAPIError) as raised:
+            client.chat(MESSAGES, 'stub-model')
+    finally:
+        client.close()
+    assert raised.value.retry_after == 120
+    assert groq_stub.requests == 1
+
+
+def test_backoff_respects_retry_after():
+    client = GroqClient('test-key', backoff_base=0.01, backoff_cap=1.0, requests_per_minute=None)
+    try:
+        assert client._backoff(0, 0.5) >= 0.5
+        assert all(client._backoff(attempt, None) <= 1.0 for attempt in range(10))
+    finally:
+        client.close()
+
+
+def test_reuses_pooled_connection(groq_stub):
+    client = make_client(groq_stub)
+    try:
+        for _ in range(5):
+            client.chat(MESSAGES, 'stub-model')
+    finally:
+        client.close()
+    assert groq_stub.requests == 5
+    assert len(groq_stub.connections) == 1
+
+
+def test_stream_yields_every_token(groq_stub):
+    client = make_client(groq_stub)
+    try:
+        fragments = list(client.stream_chat(MESSAGES, 'stub-model'))
+    finally:
+        client.close()
+    assert len(fragments) == 20
+    assert len(''.join(fragments).split()) == 20
+
+
+def test_stream_retries_before_the_response_starts(groq_stub):
+    groq_stub.fail_next(429)
+    client = make_client(groq_stub)
+    try:
+        fragments = list(client.stream_chat(MESSAGES, 'stub-model'))
+    finally:
+        client.close()
+    assert len(fragments) == 20
+    assert client.stats["retries"] == 1
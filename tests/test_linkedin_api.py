@@ -0,0 +1,123 @@
+import socket
+
+import pytest
+
+from linkedin_api import LinkedInAPIClient, LinkedInAPIError
+from posting_backends import RestBackend
+
+AUTHOR = "urn:li:organization:1000"
+
+
+def make_client(stub, access_token='test-token', api_url=None):
+    return LinkedInAPIClient(access_token, api_url=api_url or stub.url, max_retries=0, timeout=5.0)
+
+
+def closed_port_url() -> str:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    return f"http://127.0.0.1:{port}"
+
+
+def test_create_post_returns_urn(linkedin_api_stub):
+    client = make_client(linkedin_api_stub)
+    try:
+        post_urn = client.create_post(AUTHOR, "Hello")
+    finally:
+        client.close()
+    assert post_urn.startswith("urn:li:share:")
+    assert [post["commentary"] for post in linkedin_api_stub.posts] == ["Hello"]
+
+
+def test_dropped_connection_is_an_unknown_outcome(linkedin_api_stub):
+    linkedin_api_stub.fail_publish('drop')
+    client = make_client(linkedin_api_stub)
+    try:
+        with pytest.raises(LinkedInAPIError) as raised:
+            client.create_post(AUTHOR, "Hello")
+    finally:
+        client.close()
+    assert raised.value.published is None
+
+
+def test_refused_connection_was_never_published(linkedin_api_stub):
+    client = make_client(linkedin_api_stub, api_url=closed_port_url())
+    try:
+        with pytest.raises(LinkedInAPIError) as raised:
+            client.create_post(AUTHOR, "Hello")
+    finally:
+        client.close()
+    assert raised.value.published is False
+
+
+@pytest.mark.parametrize("status", [401, 422])
+def test_rejected_publish_was_not_published(linkedin_api_stub, status):
+    linkedin_api_stub.fail_publish(status)
+    client = make_client(linkedin_api_stub)
+    try:
+        with pytest.raises(LinkedInAPIError) as raised:
+            client.create_post(AUTHOR, "Hello")
+    finally:
+        client.close()
+    assert raised.value.status_code == status
+    assert raised.value.published is False
+    assert linkedin_api_stub.posts == []
+
+
+def test_server_error_on_publish_is_an_unknown_outcome(linkedin_api_stub):
+    linkedin_api_stub.fail_publish(503)
+    client = make_client(linkedin_api_stub)
+    try:
+        with pytest.raises(LinkedInAPIError) as raised:
+            client.create_post(AUTHOR, "Hello")
+    finally:
+        client.close()
+    assert raised.value.published is None
+
+
+def test_rest_backend_posts(linkedin_api_stub):
+    backend = RestBackend(make_client(linkedin_api_stub), media_fetcher=None)
+    steps = []
+    try:
+        result = backend.create_post("Hello", company_id="1000", progress=steps.append)
+    finally:
+        backend.close()
+    assert result["success"] and result["confirmed"]
+    assert result["post_urn"] == linkedin_api_stub.posts[0]["id"]
+    assert linkedin_api_stub.posts[0]["author"] == AUTHOR
+    assert steps == ["publish"]
+
+
+def test_rest_backend_reports_dropped_connection_as_unknown(linkedin_api_stub):
+    linkedin_api_stub.fail_publish('drop')
+    backend = RestBackend(make_client(linkedin_api_stub), media_fetcher=None)
+    try:
+        result = backend.create_post("Hello", company_id="1000")
+    finally:
+        backend.close()
+    assert result["success"] is False
+    assert result["published"] is None
+
+
+def test_rest_backend_rejects_invalid_token(linkedin_api_stub):
+    backend = RestBackend(make_client(linkedin_api_stub, access_token='wrong-token'), media_fetcher=None)
+    try:
+        result = backend.create_post("Hello", company_id="1000")
+    finally:
+        backend.close()
+    assert result["success"] is False
+    assert result["published"] is False
+    assert result["status_code"] == 401
+    assert linkedin_api_stub.posts == []
+
+
+def test_rest_backend_reports_unprocessable_post(linkedin_api_stub):
+    linkedin_api_stub.fail_publish(422)
+    backend = RestBackend(make_client(linkedin_api_stub), media_fetcher=None)
+    try:
+        result = backend.create_post("Hello", company_id="1000")
+    finally:
+        backend.close()
+    assert result["success"] is False
+    assert result["published"] is False
+    assert result["status_code"] == 422
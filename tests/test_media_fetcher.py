@@ -0,0 +1,103 @@
+import hashlib
+import sqlite3
+
+import pytest
+
+from benchmarks.stub_server import QuietHandler, StubServer
+from media_fetcher import MediaFetcher
+
+
+class AssetHandler(QuietHandler):
+    def do_GET(self):
+        stub = self.stub
+        stub.requests += 1
+        etag = '"' + hashlib.sha256(stub.content).hexdigest()[:16] + '"'
+        if self.headers.get('If-None-Match') == etag:
+            stub.not_modified += 1
+            self.send_body(304, b'', 'image/png', {"ETag": etag})
+            return
+        self.send_body(200, stub.content, 'image/png', {"ETag": etag})
+
+
+class AssetServer(StubServer):
+    """Serves one replaceable asset at every path, with an ETag of its content"""
+
+    handler_class = AssetHandler
+
+    def __init__(self):
+        super().__init__()
+        self.content = b'first version'
+        self.requests = 0
+        self.not_modified = 0
+
+
+@pytest.fixture
+def asset_server():
+    with AssetServer() as server:
+        yield server
+
+
+def read(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def test_fresh_url_is_served_without_a_request(asset_server, tmp_path):
+    fetcher = MediaFetcher(cache_dir=str(tmp_path), revalidate_after=3600)
+    try:
+        first = fetcher.fetch(f"{asset_server.url}/chart.png")
+        second = fetcher.fetch(f"{asset_server.url}/chart.png")
+    finally:
+        fetcher.close()
+    assert first == second
+    assert asset_server.requests == 1
+    assert fetcher.stats["hits"] == 1
+
+
+def test_stale_url_is_revalidated(asset_server, tmp_path):
+    fetcher = MediaFetcher(cache_dir=str(tmp_path), revalidate_after=0)
+    url = f"{asset_server.url}/chart.png"
+    try:
+        first = fetcher.fetch(url)
+        unchanged = fetcher.fetch(url)
+        asset_server.content = b'second version'
+        changed = fetcher.fetch(url)
+    finally:
+        fetcher.close()
+    assert unchanged == first
+    assert asset_server.not_modified == 1
+    assert fetcher.stats["revalidated"] == 1
+    assert read(changed) == b'second version'
+    assert fetcher.stats["downloads"] == 2
+
+
+def test_same_content_under_two_urls_is_stored_once(asset_server, tmp_path):
+    fetcher = MediaFetcher(cache_dir=str(tmp_path))
+    try:
+        paths = fetcher.fetch_all([f"{asset_server.url}/a.png", f"{asset_server.url}/b.png"])
+    finally:
+        fetcher.close()
+    assert paths[0] == paths[1]
+
+
+def test_stale_copy_is_used_when_the_origin_is_down(tmp_path):
+    server = AssetServer().start()
+    url = f"{server.url}/chart.png"
+    fetcher = MediaFetcher(cache_dir=str(tmp_path), revalidate_after=0, connect_timeout=1.0)
+    try:
+        first = fetcher.fetch(url)
+        server.stop()
+        assert fetcher.fetch(url) == first
+    finally:
+        fetcher.close()
+
+
+def test_adds_validator_columns_to_an_older_cache(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / 'index.db'))
+    conn.execute("CREATE TABLE media_urls (url TEXT PRIMARY KEY, digest TEXT NOT NULL)")
+    conn.close()
+    MediaFetcher(cache_dir=str(tmp_path)).close()
+    conn = sqlite3.connect(str(tmp_path / 'index.db'))
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(media_urls)")}
+    conn.close()
+    assert {"etag", "last_modified", "fetched_at"} <= columns
@@ -0,0 +1,45 @@
+import time
+
+from publish_ledger import PublishLedger
+
+
+def make_ledger(tmp_path, **options):
+    return PublishLedger(str(tmp_path / 'ledger.db'), **options)
+
+
+def test_submitted_entry_blocks_past_the_dedupe_window(tmp_path):
+    ledger = make_ledger(tmp_path, dedupe_window=0.05)
+    claimed, entry = ledger.begin("account", "member", "digest")
+    ledger.submitted(entry["key"], "rest")
+    ledger.unresolved(entry["key"], "connection dropped")
+    time.sleep(0.1)
+    claimed, blocking = ledger.begin("account", "member", "digest")
+    assert not claimed
+    assert blocking["state"] == "submitted"
+
+
+def test_forgotten_submitted_entry_can_be_sent_again(tmp_path):
+    ledger = make_ledger(tmp_path)
+    _, entry = ledger.begin("account", "member", "digest")
+    ledger.submitted(entry["key"], "rest")
+    assert ledger.forget(entry["key"])
+    claimed, _ = ledger.begin("account", "member", "digest")
+    assert claimed
+
+
+def test_confirmed_entry_blocks_only_within_the_dedupe_window(tmp_path):
+    ledger = make_ledger(tmp_path, dedupe_window=0.05)
+    _, entry = ledger.begin("account", "member", "digest")
+    ledger.confirmed(entry["key"], "rest", "urn:li:share:1")
+    assert not ledger.begin("account", "member", "digest")[0]
+    time.sleep(0.1)
+    assert ledger.begin("account", "member", "digest")[0]
+
+
+def test_failed_entry_can_be_retried(tmp_path):
+    ledger = make_ledger(tmp_path)
+    _, entry = ledger.begin("account", "member", "digest")
+    ledger.failed(entry["key"], "refused")
+    claimed, retry = ledger.begin("account", "member", "digest")
+    assert claimed
+    assert retry["attempts"] == 2
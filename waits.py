@@ -0,0 +1,253 @@
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional
+
+import metrics
+from selector_registry import as_locator
+
+# Default per-step timeout budget in seconds
+DEFAULT_STEP_BUDGETS = {
+    "navigation": 15.0,
+    "composer_open": 10.0,
+    "company_switch": 5.0,
+    "text_injection": 5.0,
+    "media_upload": 30.0,
+    "post_confirmation": 15.0
+}
+
+# Counts in-flight fetch/XHR requests so waits can key off network activity.
+# Installed with Page.addScriptToEvaluateOnNewDocument so it runs before page scripts.
+NETWORK_TRACKER_JS = """
+(function() {
+    if (window.__liPendingRequests !== undefined) { return; }
+    window.__liPendingRequests = 0;
+    var done = function() { window.__liPendingRequests = Math.max(0, window.__liPendingRequests - 1); };
+    var originalFetch = window.fetch;
+    if (originalFetch) {
+        window.fetch = function() {
+            window.__liPendingRequests++;
+            return originalFetch.apply(this, arguments).finally(done);
+        };
+    }
+    var originalSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function() {
+        window.__liPendingRequests++;
+        this.addEventListener('loadend', done);
+        return originalSend.apply(this, arguments);
+    };
+})();
+"""
+
+PENDING_REQUESTS_JS = "return window.__liPendingRequests === undefined ? 0 : window.__liPendingRequests;"
+
+
+def install_network_tracker(driver) -> bool:
+    """
+    Register the in-flight request counter on every new document
+
+    Args:
+        driver: Chrome WebDriver
+
+    Returns:
+        True if the tracker was installed
+    """
+    try:
+        driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {"source": NETWORK_TRACKER_JS})
+        return True
+    except Exception as e:
+        print(f"Network tracker unavailable, falling back to DOM-only waits: {str(e)}")
+        return False
+
+
+def network_idle(driver) -> bool:
+    """True when no tracked fetch/XHR request is in flight"""
+    return driver.execute_script(PENDING_REQUESTS_JS) == 0
+
+
+# Conditions take a Locator from the selector registry or a plain CSS selector.
+# Queries go through execute_script so absent elements return immediately
+# instead of paying the driver's implicit wait on every poll.
+
+def element_present(target) -> Callable:
+    """Condition returning the first element matching target, or None"""
+    locator = as_locator(target)
+    def condition(driver):
+        return locator.probe(driver)["element"]
+    return condition
+
+
+def element_absent(target) -> Callable:
+    """Condition that holds once nothing matches target"""
+    locator = as_locator(target)
+    def condition(driver):
+        return locator.probe(driver)["index"] < 0
+    return condition
+
+
+def element_clickable(target) -> Callable:
+    """Condition returning the first visible, enabled element matching target"""
+    locator = as_locator(target)
+    def condition(driver):
+        return locator.probe(driver, 'clickable')["element"]
+    return condition
+
+
+def composer_ready(editor) -> Callable:
+    """Condition returning the post editor once it is rendered and editable"""
+    locator = as_locator(editor)
+    def condition(driver):
+        return locator.probe(driver, 'editable')["element"]
+    return condition
+
+
+def uploads_finished(preview, expected_count: int) -> Callable:
+    """Condition that holds once expected_count previews are shown and the network is quiet"""
+    locator = as_locator(preview)
+    def condition(driver):
+        if locator.probe(driver, 'count')["count"] < expected_count:
+            return False
+        return network_idle(driver)
+    return condition
+
+
+def post_confirmed(editor, toast) -> Callable:
+    """Condition that holds once the confirmation toast appears or the composer closes"""
+    editor_locator, toast_locator = as_locator(editor), as_locator(toast)
+    def condition(driver):
+        found = toast_locator.probe(driver)["element"]
+        if found is not None:
+            return found
+        return editor_locator.probe(driver)["index"] < 0 and network_idle(driver)
+    return condition
+
+
+POST_URN_JS = """
+    var toasts = document.querySelectorAll(arguments[0]);
+    for (var t = 0; t < toasts.length; t++) {
+        var links = toasts[t].querySelectorAll('a[href]');
+        for (var i = 0; i < links.length; i++) {
+            var match = links[i].getAttribute('href').match(/urn:li:(activity|share|ugcPost):[0-9]+/);
+            if (match) { return match[0]; }
+        }
+    }
+    return null;
+"""
+
+
+def wait_for_post_urn(driver, toast, timeout: float = 3.0, poll_frequency: float = 0.1) -> Optional[str]:
+    """
+    URN of a new post, read from the "View post" link in the confirmation toast
+
+    Args:
+        driver: WebDriver that just published
+        toast: Confirmation toast Locator or selector
+        timeout: Seconds to wait for the link to appear
+
+    Returns:
+        The post URN, or None if no link showed up in time
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            urn = driver.execute_script(POST_URN_JS, as_locator(toast).group)
+        except Exception:
+            return None
+        if urn or time.monotonic() >= deadline:
+            return urn
+        time.sleep(poll_frequency)
+
+
+class StepTimer:
+    def __init__(self, driver, budgets: Optional[Dict[str, float]] = None, poll_frequency: float = 0.1,
+                 on_step: Optional[Callable[[str], None]] = None):
+        """
+        Waits on page conditions under a per-step timeout budget and records step latency
+
+        A step's budget is a deadline counted from the first time the step is
+        entered, shared by every wait in it, so a step with several waits or a
+        retry path still can't overrun its budget.
+
+        Args:
+            driver: WebDriver the waits run against
+            budgets: Per-step timeouts in seconds, merged over DEFAULT_STEP_BUDGETS
+            poll_frequency: Seconds between condition checks
+            on_step: Optional callback invoked with the step name as each step starts
+        """
+        self.driver = driver
+        self.on_step = on_step
+        self.budgets = dict(DEFAULT_STEP_BUDGETS)
+        if budgets:
+            self.budgets.update(budgets)
+        self.poll_frequency = poll_frequency
+        self.timings: Dict[str, float] = {}
+        self.current_step = None
+        self.failed_step = None
+        self._deadlines: Dict[str, float] = {}
+        self._last_error = None
+        self._started = time.perf_counter()
+
+    def wait(self, step: str, condition: Callable, message: str = ''):
+        """
+        Wait for a condition within what is left of the step's budget
+
+        Args:
+            step: Step name used for the budget and timing
+            condition: Callable taking the driver and returning a truthy value when ready
+            message: Text included in the timeout error
+
+        Returns:
+            The condition's truthy result
+        """
+        # Imported here so importing this module doesn't load Selenium
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.common.exceptions import TimeoutException
+
+        timeout = self.budgets.get(step, 10.0)
+        with self.measure(step):
+            # Past the deadline the condition is still checked once
+            remaining = max(0.0, self._deadlines[step] - time.monotonic())
+            try:
+                return WebDriverWait(self.driver, remaining, poll_frequency=self.poll_frequency).until(condition)
+            except TimeoutException:
+                raise TimeoutException(
+                    f"Step '{step}' exceeded its {timeout:.1f}s budget" + (f": {message}" if message else "")
+                )
+
+    @contextmanager
+    def measure(self, step: str):
+        """Add the wall time of the enclosed block to the step's timing and the step latency histogram"""
+        if self.current_step == step:
+            # Already timing this step; don't count the nested block twice
+            yield
+            return
+
+        previous_step = self.current_step
+        self.current_step = step
+        self._deadlines.setdefault(step, time.monotonic() + self.budgets.get(step, 10.0))
+        if self.on_step:
+            self.on_step(step)
+        start = time.perf_counter()
+        outcome = 'ok'
+        try:
+            yield
+        except Exception as e:
+            outcome = 'error'
+            # The innermost step an error passes through is the one that failed
+            if e is not self._last_error:
+                self._last_error = e
+                self.failed_step = step
+            raise
+        finally:
+            duration = time.perf_counter() - start
+            self.timings[step] = self.timings.get(step, 0.0) + duration
+            self.current_step = previous_step
+            metrics.observe("linkedin_step_duration_seconds", duration, step=step, outcome=outcome)
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since the timer was created"""
+        return time.perf_counter() - self._started
+
+    def report(self) -> Dict[str, float]:
+        """Step timings in seconds, rounded for reporting"""
+        return {step: round(seconds, 3) for step, seconds in self.timings.items()}